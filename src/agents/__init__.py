@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
 from dataclasses import dataclass, field
-from typing import Any, Dict, Protocol
+from typing import Any, Protocol, TypeVar
+
+from app.tracing import tracer
 
 try:  # pragma: no cover - exercised only when dependency available
     from google.agent import Agent as GoogleAgent  # type: ignore
@@ -9,6 +14,9 @@ except ImportError:  # pragma: no cover - fallback for local/dev usage
     GoogleAgent = None  # type: ignore
 
 
+T = TypeVar("T")
+
+
 class Tool(Protocol):
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         ...
@@ -18,7 +26,7 @@ class Tool(Protocol):
 class AgentMemory:
     """Minimal state container used when the Google Agent SDK is not installed."""
 
-    state: Dict[str, Any] = field(default_factory=dict)
+    state: dict[str, Any] = field(default_factory=dict)
 
     def update(self, **kwargs: Any) -> None:
         self.state.update(kwargs)
@@ -27,6 +35,68 @@ class AgentMemory:
         return self.state.get(key, default)
 
 
+class ResultCache:
+    """Bounded LRU memo for agent results with single-flight computation.
+
+    Concurrent callers asking for a key that is already being computed wait for
+    that computation instead of repeating it.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._inflight: dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            pending.wait()
+
+        try:
+            value = compute()
+        except BaseException:
+            with self._lock:
+                self._inflight.pop(key).set()
+            raise
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._inflight.pop(key).set()
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": float(self.hits),
+            "misses": float(self.misses),
+            "evictions": float(self.evictions),
+            "size": float(len(self._entries)),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
 class BaseAgent:
     """Wrapper that integrates with the Google Agent Development Kit when available."""
 
@@ -40,10 +110,11 @@ class BaseAgent:
             self._delegate = None
 
     def run(self, *args: Any, **kwargs: Any) -> Any:
-        if self._delegate is not None:  # pragma: no cover
-            result = self._delegate.run(*args, **kwargs)
-        else:
-            result = self.tool(*args, **kwargs)
+        with tracer.span(self.name):
+            if self._delegate is not None:  # pragma: no cover
+                result = self._delegate.run(*args, **kwargs)
+            else:
+                result = self.tool(*args, **kwargs)
         self.memory.update(last_result=result)
         return result
 
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
+from datetime import datetime
 
-from agents import AgentMemory, BaseAgent
-from app.schemas import FactualFeatures
+from agents import AgentMemory, BaseAgent, ResultCache
+from app.records import BarRecord, FeaturesRecord
+from app.tracing import tracer
 from services.feature_store import FeatureStore
 from services.market_data import MarketDataProvider
+from services.resampler import StreamingResampler
 
 
 @dataclass
@@ -13,17 +17,80 @@ class FactualAgent(BaseAgent):
     provider: MarketDataProvider
     feature_store: FeatureStore
     lookback: int = 120
+    features: tuple[str, ...] | None = None
+    resampler: StreamingResampler | None = None
+    timeframe_features: tuple[str, ...] | None = None
 
-    def __init__(self, provider: MarketDataProvider, feature_store: FeatureStore, lookback: int = 120):
+    def __init__(
+        self,
+        provider: MarketDataProvider,
+        feature_store: FeatureStore,
+        lookback: int = 120,
+        cache_size: int = 1024,
+        features: Sequence[str] | None = None,
+        resampler: StreamingResampler | None = None,
+        timeframe_features: Sequence[str] | None = None,
+    ):
         self.provider = provider
         self.feature_store = feature_store
         self.lookback = lookback
+        self.features = tuple(features) if features is not None else None
+        self.resampler = resampler
+        self.timeframe_features = (
+            tuple(timeframe_features) if timeframe_features is not None else None
+        )
+        self.cache = ResultCache(maxsize=cache_size)
         super().__init__(name="factual-agent", tool=self._tool, memory=AgentMemory())
 
-    def _tool(self, symbol: str) -> FactualFeatures:
-        bars = self.provider.get_bars(symbol=symbol, lookback=self.lookback)
-        features = self.feature_store.build_features(symbol=symbol, bars=bars)
-        return features
+    def _tool(self, symbol: str) -> FeaturesRecord:
+        if self.resampler is None and hasattr(self.provider, "get_columns"):
+            return self._column_tool(symbol)
+        with tracer.span("market_data.get_bars"):
+            bars = self.provider.get_bars(symbol=symbol, lookback=self.lookback)
+        if not bars:
+            return self._build_features(symbol, bars)
+        if self.resampler is not None:
+            self.resampler.extend(bars)
+        # Features only change when a new bar arrives; repeated calls within a bar share one result.
+        key = self._cache_key(symbol, bars[-1].timestamp)
+        return self.cache.get_or_compute(key, lambda: self._build_features(symbol, bars))
 
-    def run(self, symbol: str) -> FactualFeatures:
+    def _column_tool(self, symbol: str) -> FeaturesRecord:
+        """Features from a column-native provider (e.g. shared-memory views), no BarRecords."""
+        with tracer.span("market_data.get_columns"):
+            timestamp, columns = self.provider.get_columns(symbol=symbol, lookback=self.lookback)
+
+        def build() -> FeaturesRecord:
+            with tracer.span("feature_store.build_features"):
+                return self.feature_store.build_features_from_columns(
+                    symbol, timestamp, columns, features=self.features
+                )
+
+        if timestamp is None:
+            return build()
+        return self.cache.get_or_compute(self._cache_key(symbol, timestamp), build)
+
+    def _cache_key(self, symbol: str, timestamp: datetime) -> tuple:
+        # A revised bar keeps its timestamp, so providers that revise bars also count revisions.
+        revision = self.provider.revision(symbol) if hasattr(self.provider, "revision") else 0
+        return (symbol, timestamp, revision, self.lookback, self.features)
+
+    def _build_features(self, symbol: str, bars: list[BarRecord]) -> FeaturesRecord:
+        with tracer.span("feature_store.build_features"):
+            result = self.feature_store.build_features(
+                symbol=symbol, bars=bars, features=self.features
+            )
+        if self.resampler is not None:
+            with tracer.span("feature_store.build_timeframe_features"):
+                result.features.update(
+                    self.feature_store.build_timeframe_features(
+                        symbol,
+                        self.resampler,
+                        self.resampler.timeframes,
+                        features=self.timeframe_features,
+                    )
+                )
+        return result
+
+    def run(self, symbol: str) -> FeaturesRecord:
         return super().run(symbol=symbol)
@@ -1,19 +1,88 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import Dict
+from datetime import datetime
+
+import numpy as np
 
 from agents import AgentMemory, BaseAgent
-from app.schemas import FactualFeatures, JudgeDecision, SubjectiveSignals
+from app.records import ACTION_CODES, ACTIONS, DecisionRecord, FeaturesRecord, SignalsRecord
+
+FACTUAL_COLUMNS = ("rsi_14", "mom_20d", "rolling_vol_20d", "volume_zscore_20d")
+FACTUAL_DEFAULTS = (50.0, 0.0, 0.02, 0.0)
+SUBJECTIVE_COLUMNS = ("news_sentiment", "social_velocity_z", "headline_sentiment", "search_trend_z")
+SUBJECTIVE_DEFAULTS = (0.0, 0.0, 0.0, 0.0)
+
+_HOLD, _BUY, _SELL = ACTION_CODES["HOLD"], ACTION_CODES["BUY"], ACTION_CODES["SELL"]
 
 
 def clamp(value: float, lower: float, upper: float) -> float:
     return max(lower, min(upper, value))
 
 
+def clamp_array(values: np.ndarray, lower: float, upper: float) -> np.ndarray:
+    """Element-wise ``clamp`` with the same semantics, including for NaN inputs."""
+    bounded = np.where(values < upper, values, upper)
+    return np.where(bounded > lower, bounded, lower)
+
+
+@dataclass
+class BatchDecision:
+    """Columnar judge output; ``action`` holds codes into ``app.records.ACTIONS``."""
+
+    factual_score: np.ndarray
+    subjective_score: np.ndarray
+    intent: np.ndarray
+    action: np.ndarray
+    size: np.ndarray
+    confidence: np.ndarray
+    rationale: list[list[str]] | None = None
+
+    def __len__(self) -> int:
+        return self.intent.size
+
+    @property
+    def actions(self) -> list[str]:
+        return [ACTIONS[code] for code in self.action.ravel().tolist()]
+
+    def to_records(
+        self, timestamps: Sequence[datetime], symbols: Sequence[str]
+    ) -> list[DecisionRecord]:
+        rationale = self.rationale or _rationale(
+            self.factual_score, self.subjective_score, self.intent
+        )
+        return [
+            DecisionRecord(ts, symbol, action, size, confidence, list(reasons), [])
+            for ts, symbol, action, size, confidence, reasons in zip(
+                timestamps,
+                symbols,
+                self.actions,
+                self.size.ravel().tolist(),
+                self.confidence.ravel().tolist(),
+                rationale,
+                strict=True,
+            )
+        ]
+
+
+def _rationale(
+    factual_score: np.ndarray, subjective_score: np.ndarray, intent: np.ndarray
+) -> list[list[str]]:
+    return [
+        [f"factual_score={fs:.2f}", f"subjective_score={ss:.2f}", f"intent={it:.2f}"]
+        for fs, ss, it in zip(
+            factual_score.ravel().tolist(),
+            subjective_score.ravel().tolist(),
+            intent.ravel().tolist(),
+            strict=True,
+        )
+    ]
+
+
 @dataclass
 class JudgeAgent(BaseAgent):
-    weights: Dict[str, float] = field(default_factory=lambda: {"factual": 0.6, "subjective": 0.4})
+    weights: dict[str, float] = field(default_factory=lambda: {"factual": 0.6, "subjective": 0.4})
     bias: float = 0.0
     tau_buy: float = 0.3
     tau_sell: float = -0.3
@@ -24,10 +93,11 @@ class JudgeAgent(BaseAgent):
 
     def __init__(self, **kwargs):
         super().__init__(name="judge-agent", tool=self._tool, memory=AgentMemory())
+        self.weights = {"factual": 0.6, "subjective": 0.4}
         for key, value in kwargs.items():
             setattr(self, key, value)
 
-    def score_factual(self, factual: FactualFeatures) -> float:
+    def score_factual(self, factual: FeaturesRecord) -> float:
         feats = factual.features
         rsi = feats.get("rsi_14", 50.0)
         momentum = feats.get("mom_20d", 0.0)
@@ -37,21 +107,37 @@ class JudgeAgent(BaseAgent):
         momentum_component = clamp(momentum * 5, -1.0, 1.0)
         vol_component = clamp((0.02 - vol) / 0.02, -1.0, 1.0)
         volume_component = clamp(volume_z / 3.0, -1.0, 1.0)
-        return clamp(0.4 * rsi_component + 0.4 * momentum_component + 0.2 * volume_component + 0.1 * vol_component, -1.0, 1.0)
+        return clamp(
+            0.4 * rsi_component
+            + 0.4 * momentum_component
+            + 0.2 * volume_component
+            + 0.1 * vol_component,
+            -1.0,
+            1.0,
+        )
 
-    def score_subjective(self, subjective: SubjectiveSignals) -> float:
+    def score_subjective(self, subjective: SignalsRecord) -> float:
         sigs = subjective.signals
         sentiment = sigs.get("news_sentiment", 0.0)
         social = sigs.get("social_velocity_z", 0.0)
         headline = sigs.get("headline_sentiment", 0.0)
         search = sigs.get("search_trend_z", 0.0)
-        combined = 0.5 * sentiment + 0.2 * headline + 0.2 * clamp(social / 3.0, -1.0, 1.0) + 0.1 * clamp(search / 3.0, -1.0, 1.0)
+        combined = (
+            0.5 * sentiment
+            + 0.2 * headline
+            + 0.2 * clamp(social / 3.0, -1.0, 1.0)
+            + 0.1 * clamp(search / 3.0, -1.0, 1.0)
+        )
         return clamp(combined, -1.0, 1.0)
 
-    def _tool(self, factual: FactualFeatures, subjective: SubjectiveSignals) -> JudgeDecision:
+    def _tool(self, factual: FeaturesRecord, subjective: SignalsRecord) -> DecisionRecord:
         factual_score = self.score_factual(factual)
         subjective_score = self.score_subjective(subjective)
-        intent = self.weights["factual"] * factual_score + self.weights["subjective"] * subjective_score + self.bias
+        intent = (
+            self.weights["factual"] * factual_score
+            + self.weights["subjective"] * subjective_score
+            + self.bias
+        )
         action = "HOLD"
         if intent > self.tau_buy:
             action = "BUY"
@@ -60,7 +146,7 @@ class JudgeAgent(BaseAgent):
         realized_vol = max(factual.features.get("rolling_vol_20d", self.vol_target), 1e-6)
         size = clamp(self.k * intent / realized_vol, self.min_size, self.max_size)
         confidence = clamp(abs(intent), 0.0, 1.0)
-        return JudgeDecision(
+        return DecisionRecord(
             timestamp=factual.timestamp,
             symbol=factual.symbol,
             action=action,
@@ -74,5 +160,98 @@ class JudgeAgent(BaseAgent):
             guardrails_applied=[],
         )
 
-    def run(self, factual: FactualFeatures, subjective: SubjectiveSignals) -> JudgeDecision:
+    def stack_inputs(
+        self, factuals: Sequence[FeaturesRecord], subjectives: Sequence[SignalsRecord]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build ``decide_batch`` inputs from records, applying the scalar path's defaults."""
+        features = np.array(
+            [
+                [
+                    f.features.get(name, default)
+                    for name, default in zip(FACTUAL_COLUMNS, FACTUAL_DEFAULTS, strict=True)
+                ]
+                for f in factuals
+            ],
+            dtype=float,
+        ).reshape(len(factuals), len(FACTUAL_COLUMNS))
+        signals = np.array(
+            [
+                [
+                    s.signals.get(name, default)
+                    for name, default in zip(SUBJECTIVE_COLUMNS, SUBJECTIVE_DEFAULTS, strict=True)
+                ]
+                for s in subjectives
+            ],
+            dtype=float,
+        ).reshape(len(subjectives), len(SUBJECTIVE_COLUMNS))
+        sizing_vol = np.array(
+            [f.features.get("rolling_vol_20d", self.vol_target) for f in factuals], dtype=float
+        )
+        return features, signals, sizing_vol
+
+    def decide_batch(
+        self,
+        features: np.ndarray,
+        signals: np.ndarray,
+        sizing_vol: np.ndarray | None = None,
+        with_rationale: bool = False,
+    ) -> BatchDecision:
+        """Score many symbols or bars at once; matches ``run`` bit-for-bit.
+
+        ``features[..., i]`` follows ``FACTUAL_COLUMNS`` and ``signals[..., i]``
+        follows ``SUBJECTIVE_COLUMNS``; any leading shape is allowed. ``sizing_vol``
+        defaults to the ``rolling_vol_20d`` column.
+        """
+        features = np.asarray(features, dtype=float)
+        signals = np.asarray(signals, dtype=float)
+        rsi, momentum, vol, volume_z = (features[..., idx] for idx in range(len(FACTUAL_COLUMNS)))
+        rsi_component = (50.0 - rsi) / 50.0
+        momentum_component = clamp_array(momentum * 5, -1.0, 1.0)
+        vol_component = clamp_array((0.02 - vol) / 0.02, -1.0, 1.0)
+        volume_component = clamp_array(volume_z / 3.0, -1.0, 1.0)
+        factual_score = clamp_array(
+            0.4 * rsi_component
+            + 0.4 * momentum_component
+            + 0.2 * volume_component
+            + 0.1 * vol_component,
+            -1.0,
+            1.0,
+        )
+
+        sentiment, social, headline, search = (
+            signals[..., idx] for idx in range(len(SUBJECTIVE_COLUMNS))
+        )
+        combined = (
+            0.5 * sentiment
+            + 0.2 * headline
+            + 0.2 * clamp_array(social / 3.0, -1.0, 1.0)
+            + 0.1 * clamp_array(search / 3.0, -1.0, 1.0)
+        )
+        subjective_score = clamp_array(combined, -1.0, 1.0)
+
+        intent = (
+            self.weights["factual"] * factual_score
+            + self.weights["subjective"] * subjective_score
+            + self.bias
+        )
+        action = np.where(
+            intent > self.tau_buy, _BUY, np.where(intent < self.tau_sell, _SELL, _HOLD)
+        ).astype(np.int8)
+        sizing_vol = vol if sizing_vol is None else np.asarray(sizing_vol, dtype=float)
+        realized_vol = np.where(1e-6 > sizing_vol, 1e-6, sizing_vol)
+        size = np.abs(clamp_array(self.k * intent / realized_vol, self.min_size, self.max_size))
+        confidence = clamp_array(np.abs(intent), 0.0, 1.0)
+        return BatchDecision(
+            factual_score=factual_score,
+            subjective_score=subjective_score,
+            intent=intent,
+            action=action,
+            size=size,
+            confidence=confidence,
+            rationale=(
+                _rationale(factual_score, subjective_score, intent) if with_rationale else None
+            ),
+        )
+
+    def run(self, factual: FeaturesRecord, subjective: SignalsRecord) -> DecisionRecord:
         return super().run(factual=factual, subjective=subjective)
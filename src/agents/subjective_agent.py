@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from agents import AgentMemory, BaseAgent
-from app.schemas import SubjectiveSignals
+from app.records import SignalsRecord
+from app.tracing import tracer
 from services.news_data import NewsProvider
 from services.sentiment import SentimentModel
 
@@ -18,13 +19,15 @@ class SubjectiveAgent(BaseAgent):
         self.sentiment_model = sentiment_model
         super().__init__(name="subjective-agent", tool=self._tool, memory=AgentMemory())
 
-    def _tool(self, symbol: str) -> SubjectiveSignals:
-        signals = self.provider.fetch_signals(symbol)
+    def _tool(self, symbol: str) -> SignalsRecord:
+        with tracer.span("news.fetch_signals"):
+            signals = self.provider.fetch_signals(symbol)
         enriched = dict(signals.signals)
         if signals.notes:
-            enriched["headline_sentiment"] = self.sentiment_model.score(" ".join(signals.notes))
+            with tracer.span("sentiment.score"):
+                enriched["headline_sentiment"] = self.sentiment_model.score(" ".join(signals.notes))
         signals.signals = enriched
         return signals
 
-    def run(self, symbol: str) -> SubjectiveSignals:
+    def run(self, symbol: str) -> SignalsRecord:
         return super().run(symbol=symbol)
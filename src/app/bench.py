@@ -0,0 +1,346 @@
+"""Micro and throughput benchmarks with baseline regression gates."""
+
+from __future__ import annotations
+
+import json
+import logging
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import structlog
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = Path("bench/baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+
+@dataclass
+class BenchResult:
+    name: str
+    metric: str
+    value: float
+    higher_is_better: bool
+    iterations: int
+    p50_us: float
+    p99_us: float
+
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    value: float
+    tolerance: float
+
+    @property
+    def change(self) -> float:
+        return self.value / self.baseline - 1.0 if self.baseline else 0.0
+
+
+def measure(name: str, func: Callable[[], object], iterations: int, warmup: int = 3) -> BenchResult:
+    """Time ``func`` per call and report the median latency in microseconds."""
+    for _ in range(warmup):
+        func()
+    samples = np.empty(iterations)
+    for idx in range(iterations):
+        start = time.perf_counter_ns()
+        func()
+        samples[idx] = time.perf_counter_ns() - start
+    samples /= 1e3
+    p50 = float(np.percentile(samples, 50))
+    return BenchResult(
+        name=name,
+        metric="p50_us",
+        value=p50,
+        higher_is_better=False,
+        iterations=iterations,
+        p50_us=p50,
+        p99_us=float(np.percentile(samples, 99)),
+    )
+
+
+def _sample_bars(symbol: str = "AAPL", count: int = 120):
+    from services.market_data import MockMarketDataProvider
+
+    return MockMarketDataProvider().get_bars(symbol=symbol, lookback=count)
+
+
+def bench_step(iterations: int) -> BenchResult:
+    from app.runner import build_orchestrator
+    from app.telemetry import TelemetryStore
+
+    orchestrator = build_orchestrator()
+    # Advance the mock clock a bar per step so features are rebuilt rather than served from cache.
+    provider = orchestrator.factual_agent.provider
+    provider.as_of = datetime(2024, 1, 2, 14, 30, tzinfo=UTC)
+
+    def step() -> None:
+        provider.as_of += timedelta(minutes=1)
+        orchestrator.step(symbol="AAPL")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator.telemetry = TelemetryStore(f"sqlite:///{tmp}/bench.db")
+        return measure("step", step, iterations)
+
+
+def bench_build_features(iterations: int) -> BenchResult:
+    from services.feature_store import FeatureStore
+
+    store = FeatureStore()
+    bars = _sample_bars()
+    return measure(
+        "build_features", lambda: store.build_features(symbol="AAPL", bars=bars), iterations
+    )
+
+
+def bench_sentiment(iterations: int) -> BenchResult:
+    from services.sentiment import RuleBasedSentiment
+
+    model = RuleBasedSentiment()
+    text = (
+        "Mock headline sentiment 0.42 for AAPL as revenue growth beats estimates despite downgrade"
+    )
+    return measure("sentiment", lambda: model.score(text), iterations)
+
+
+def bench_telemetry(iterations: int) -> BenchResult:
+    from app.records import DecisionRecord, FillRecord
+    from app.telemetry import TelemetryStore
+
+    ts = datetime(2024, 1, 2, 15, tzinfo=UTC)
+    decision = DecisionRecord(ts, "AAPL", "BUY", 0.5, 0.4, ["intent=0.40"], [])
+    fill = FillRecord(ts, "AAPL", "BUY", 100.05, 0.5, 5.0, 50.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TelemetryStore(database_url=f"sqlite:///{tmp}/bench.db")
+
+        def write() -> None:
+            store.record_decision(decision)
+            store.record_fill(fill, pnl_delta=1.0)
+
+        return measure("telemetry_write", write, iterations)
+
+
+def bench_backtest(iterations: int) -> BenchResult:
+    from app.runner import build_orchestrator
+    from app.telemetry import TelemetryStore
+    from pipelines.backtest import run_backtest
+
+    orchestrator = build_orchestrator()
+    start = datetime(2024, 1, 2, 14, 30, tzinfo=UTC)
+    end = start + timedelta(minutes=iterations - 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator.telemetry = TelemetryStore(f"sqlite:///{tmp}/bench.db")
+        began = time.perf_counter()
+        result = run_backtest(orchestrator, symbol="AAPL", start=start, end=end, step_seconds=60)
+        elapsed = time.perf_counter() - began
+    per_bar_us = elapsed / len(result) * 1e6
+    return BenchResult(
+        name="backtest",
+        metric="bars_per_sec",
+        value=len(result) / elapsed,
+        higher_is_better=True,
+        iterations=len(result),
+        p50_us=per_bar_us,
+        p99_us=per_bar_us,
+    )
+
+
+def bench_decide(iterations: int) -> BenchResult:
+    from fastapi.testclient import TestClient
+
+    from app.config import settings
+    from app.state import SharedStateStore
+    from app.telemetry import TelemetryStore, telemetry
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_url = f"sqlite:///{tmp}/api_state.db"
+        saved = settings.state_url, telemetry.database_url
+        # app.main opens its state store from STATE_URL on first import.
+        settings.state_url = state_url
+        telemetry.database_url = TelemetryStore(f"sqlite:///{tmp}/bench.db").database_url
+        try:
+            from app import main
+
+            main.state = SharedStateStore(database_url=state_url)
+            client = TestClient(main.app)
+            result = measure(
+                "decide", lambda: client.post("/decide", params={"symbol": "AAPL"}), iterations
+            )
+            main.orchestrator.events.flush()
+        finally:
+            settings.state_url, telemetry.database_url = saved
+        return result
+
+
+def bench_synthetic(iterations: int) -> BenchResult:
+    from services.synthetic import SyntheticMarket
+
+    market = SyntheticMarket([f"SYM{idx:04d}" for idx in range(500)])
+    market.advance(10)
+    began = time.perf_counter()
+    block = market.advance(iterations)
+    elapsed = time.perf_counter() - began
+    per_bar_us = elapsed / len(block) * 1e6
+    return BenchResult(
+        name="synthetic",
+        metric="bars_per_sec",
+        value=len(block) / elapsed,
+        higher_is_better=True,
+        iterations=len(block),
+        p50_us=per_bar_us,
+        p99_us=per_bar_us,
+    )
+
+
+def bench_ingest(iterations: int) -> BenchResult:
+    from services.ingestion import BarBuilder, StreamingMarketDataProvider, TickIngestor
+
+    rng = np.random.default_rng(7)
+    symbols = ("AAPL", "MSFT", "NVDA", "TSLA")
+    count = iterations * 1_000
+    # ~50 ticks/s per symbol with a little out-of-order jitter.
+    ts = (
+        1_704_205_800_000_000_000
+        + np.arange(count) * 5_000_000
+        + rng.integers(0, 50_000_000, count)
+    )
+    prices = 100 + np.cumsum(rng.normal(0, 0.01, count))
+    lines = [
+        f"T,{t},{symbols[i % 4]},{p:.4f},{1 + i % 7}\n"
+        for i, (t, p) in enumerate(zip(ts.tolist(), prices.tolist(), strict=True))
+    ]
+    ingestor = TickIngestor(BarBuilder(StreamingMarketDataProvider()))
+    began = time.perf_counter()
+    ingestor.consume_lines(lines)
+    ingestor.builder.flush()
+    elapsed = time.perf_counter() - began
+    per_tick_us = elapsed / count * 1e6
+    return BenchResult(
+        name="ingest",
+        metric="ticks_per_sec",
+        value=count / elapsed,
+        higher_is_better=True,
+        iterations=count,
+        p50_us=per_tick_us,
+        p99_us=per_tick_us,
+    )
+
+
+def bench_portfolio_risk(iterations: int) -> BenchResult:
+    from services.portfolio_risk import PortfolioRisk
+
+    rng = np.random.default_rng(11)
+    symbols = [f"SYM{idx:04d}" for idx in range(1_000)]
+    risk = PortfolioRisk(
+        symbols, sectors={symbol: f"S{idx % 11}" for idx, symbol in enumerate(symbols)}
+    )
+    prices = rng.uniform(20, 200, len(symbols))
+    for _ in range(20):
+        prices = prices * (1 + rng.normal(0, 0.002, len(symbols)))
+        risk.update_prices(prices)
+    for symbol in symbols:
+        risk.apply_fill(symbol, float(rng.normal(0, 20)))
+    sizes = rng.normal(0, 50, len(symbols)).tolist()
+    # One sample per pass over the universe; percentiles are of the per-check time in each pass.
+    samples = np.empty(iterations)
+    for idx in range(iterations):
+        start = time.perf_counter_ns()
+        for symbol, size in zip(symbols, sizes, strict=True):
+            risk.check(symbol, size)
+        samples[idx] = time.perf_counter_ns() - start
+    samples /= 1e3 * len(symbols)
+    checks = iterations * len(symbols)
+    return BenchResult(
+        name="portfolio_risk",
+        metric="checks_per_sec",
+        value=1e6 / float(samples.mean()),
+        higher_is_better=True,
+        iterations=checks,
+        p50_us=float(np.percentile(samples, 50)),
+        p99_us=float(np.percentile(samples, 99)),
+    )
+
+
+CASES: dict[str, tuple[Callable[[int], BenchResult], int]] = {
+    "step": (bench_step, 200),
+    "build_features": (bench_build_features, 500),
+    "sentiment": (bench_sentiment, 20_000),
+    "telemetry_write": (bench_telemetry, 200),
+    "backtest": (bench_backtest, 500),
+    "decide": (bench_decide, 200),
+    "ingest": (bench_ingest, 500),
+    "synthetic": (bench_synthetic, 2_000),
+    "portfolio_risk": (bench_portfolio_risk, 50),
+}
+
+
+def run_suite(names: Iterable[str] | None = None, scale: float = 1.0) -> list[BenchResult]:
+    selected = list(names) if names else list(CASES)
+    unknown = sorted(set(selected) - set(CASES))
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}")
+    results = []
+    with _quiet_logs():
+        for name in selected:
+            func, iterations = CASES[name]
+            results.append(func(max(int(iterations * scale), 10)))
+    return results
+
+
+@contextmanager
+def _quiet_logs() -> Iterator[None]:
+    """Drop info-level logs while benchmarking, restoring the previous structlog config afterwards.
+
+    Decision/fill logs would otherwise dominate the timings and the JSON output.
+    """
+    previous = structlog.get_config()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    try:
+        yield
+    finally:
+        structlog.configure(**previous)
+
+
+def results_to_json(results: list[BenchResult]) -> dict:
+    return {
+        "version": BASELINE_VERSION,
+        "created": datetime.now(tz=UTC).isoformat(),
+        "results": {result.name: asdict(result) for result in results},
+    }
+
+
+def load_baseline(path: Path) -> dict:
+    payload = json.loads(path.read_text())
+    if payload.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version {payload.get('version')!r} in {path}")
+    return payload
+
+
+def compare(
+    results: list[BenchResult], baseline: dict, tolerance: float = DEFAULT_TOLERANCE
+) -> list[Regression]:
+    """Return the results that are worse than baseline by more than the tolerance.
+
+    A baseline entry may carry its own ``tolerance`` to widen the gate for noisy cases.
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get("results", {}).get(result.name)
+        if reference is None or reference.get("metric") != result.metric:
+            continue
+        allowed = reference.get("tolerance", tolerance)
+        base = reference["value"]
+        if result.higher_is_better:
+            regressed = result.value < base * (1 - allowed)
+        else:
+            regressed = result.value > base * (1 + allowed)
+        if regressed:
+            regressions.append(Regression(result.name, result.metric, base, result.value, allowed))
+    return regressions
@@ -0,0 +1,150 @@
+"""Versioned warm-state checkpoints for fast restarts.
+
+A checkpoint is one compressed ``.npz``. Every component contributes a flat
+``dict[str, np.ndarray]`` via ``export_state`` (stored as ``<component>.<key>``)
+and gets it back through ``restore_state``; a JSON header records the format
+version, creation time and component list. Files are written to a temporary
+sibling and renamed into place, so a crash mid-write never leaves a torn file.
+Arrays are loaded without pickle.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable, Mapping, Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+from app.records import BarRecord
+from app.utils.time_windows import from_epoch_ns, to_epoch_ns
+
+CHECKPOINT_VERSION = 1
+_HEADER = "__header__"
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class Checkpointable(Protocol):
+    def export_state(self) -> dict[str, np.ndarray]: ...
+
+    def restore_state(self, state: Mapping[str, np.ndarray]) -> None: ...
+
+
+def bars_to_arrays(bars: Sequence[BarRecord], prefix: str = "") -> dict[str, np.ndarray]:
+    """Columnar encoding of ``bars`` (symbols are left to the caller)."""
+    count = len(bars)
+    timestamps = np.fromiter((to_epoch_ns(bar.timestamp) for bar in bars), np.int64, count)
+    arrays = {f"{prefix}timestamp": timestamps}
+    for name in BAR_FIELDS:
+        arrays[f"{prefix}{name}"] = np.fromiter((getattr(bar, name) for bar in bars), float, count)
+    return arrays
+
+
+def arrays_to_bars(
+    state: Mapping[str, np.ndarray], symbols: Sequence[str], prefix: str = ""
+) -> list[BarRecord]:
+    """Inverse of ``bars_to_arrays``; ``symbols`` gives each row's symbol."""
+    columns = [state[f"{prefix}{name}"].tolist() for name in ("timestamp",) + BAR_FIELDS]
+    return [
+        BarRecord(from_epoch_ns(ts), symbol, open_, high, low, close, volume)
+        for symbol, ts, open_, high, low, close, volume in zip(symbols, *columns, strict=True)
+    ]
+
+
+def write_checkpoint(path: Path, components: Mapping[str, Checkpointable], **meta: object) -> Path:
+    """Atomically write every component's state to ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays: dict[str, np.ndarray] = {}
+    for name, component in components.items():
+        arrays.update({f"{name}.{key}": value for key, value in component.export_state().items()})
+    header = {
+        "version": CHECKPOINT_VERSION,
+        "created": datetime.now(tz=UTC).isoformat(),
+        "components": sorted(components),
+        **meta,
+    }
+    arrays[_HEADER] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.savez_compressed(handle, **arrays)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def read_checkpoint(path: Path) -> tuple[dict, dict[str, dict[str, np.ndarray]]]:
+    """Header plus per-component state; raises ``ValueError`` on a foreign or stale file."""
+    with np.load(path, allow_pickle=False) as archive:
+        if _HEADER not in archive.files:
+            raise ValueError(f"{path} is not a Market-Mind checkpoint")
+        header = json.loads(archive[_HEADER].tobytes())
+        if header.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"Unsupported checkpoint version {header.get('version')} "
+                f"(expected {CHECKPOINT_VERSION})"
+            )
+        state: dict[str, dict[str, np.ndarray]] = {}
+        for key in archive.files:
+            if key == _HEADER:
+                continue
+            component, _, field = key.partition(".")
+            state.setdefault(component, {})[field] = archive[key]
+    return header, state
+
+
+def restore_checkpoint(path: Path, components: Mapping[str, Checkpointable]) -> dict | None:
+    """Restore whichever ``components`` the checkpoint holds; ``None`` if there is no file yet."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    header, state = read_checkpoint(path)
+    for name, component in components.items():
+        if name in state:
+            component.restore_state(state[name])
+    return header
+
+
+class Checkpointer:
+    """Writes a checkpoint at most every ``interval_seconds`` when polled.
+
+    ``before_write`` runs first, e.g. to let asynchronous writers catch up.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        components: Mapping[str, Checkpointable],
+        interval_seconds: float = 300.0,
+        before_write: Callable[[], object] | None = None,
+    ):
+        self.path = Path(path)
+        self.components = components
+        self.interval_seconds = interval_seconds
+        self.before_write = before_write
+        self._last = time.monotonic()
+
+    def restore(self) -> dict | None:
+        return restore_checkpoint(self.path, self.components)
+
+    def maybe_write(self) -> bool:
+        if time.monotonic() - self._last < self.interval_seconds:
+            return False
+        self.write()
+        return True
+
+    def write(self) -> Path:
+        self._last = time.monotonic()
+        if self.before_write is not None:
+            self.before_write()
+        return write_checkpoint(self.path, self.components)
@@ -1,5 +1,4 @@
 from functools import lru_cache
-from typing import List
 
 from pydantic import Field, ValidationError, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -8,9 +7,11 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     """Runtime configuration loaded from environment variables."""
 
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False)
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", case_sensitive=False
+    )
 
-    symbols: List[str] = Field(default_factory=lambda: ["AAPL"], alias="SYMBOLS")
+    symbols: list[str] = Field(default_factory=lambda: ["AAPL"], alias="SYMBOLS")
     interval_seconds: int = Field(60, alias="INTERVAL_SECONDS")
     timezone_et: str = Field("America/New_York", alias="TIMEZONE_ET")
     news_api_key: str = Field("", alias="NEWS_API_KEY")
@@ -18,13 +19,33 @@ class Settings(BaseSettings):
     max_position: int = Field(1000, alias="MAX_POSITION")
     max_daily_loss: float = Field(2500.0, alias="MAX_DAILY_LOSS")
     slippage_bps: float = Field(5.0, alias="SLIPPAGE_BPS")
+    portfolio_risk_enabled: bool = Field(False, alias="PORTFOLIO_RISK_ENABLED")
+    symbol_sectors: dict[str, str] = Field(default_factory=dict, alias="SYMBOL_SECTORS")
+    portfolio_capital: float = Field(1_000_000.0, alias="PORTFOLIO_CAPITAL")
+    max_gross_leverage: float = Field(2.0, alias="MAX_GROSS_LEVERAGE")
+    max_net_leverage: float = Field(1.0, alias="MAX_NET_LEVERAGE")
+    max_sector_weight: float = Field(0.3, alias="MAX_SECTOR_WEIGHT")
+    max_symbol_weight: float = Field(0.1, alias="MAX_SYMBOL_WEIGHT")
+    max_portfolio_vol: float = Field(0.2, alias="MAX_PORTFOLIO_VOL")
+    risk_ewma_decay: float = Field(0.94, alias="RISK_EWMA_DECAY")
     database_url: str = Field("sqlite:///./data/paper_trades.db", alias="DATABASE_URL")
+    state_url: str = Field("sqlite:///./data/api_state.db", alias="STATE_URL")
+    telemetry_raw_retention_seconds: int = Field(3600, alias="TELEMETRY_RAW_RETENTION_SECONDS")
+    telemetry_minute_retention_hours: int = Field(48, alias="TELEMETRY_MINUTE_RETENTION_HOURS")
+    telemetry_hour_retention_days: int = Field(90, alias="TELEMETRY_HOUR_RETENTION_DAYS")
+    telemetry_day_retention_days: int = Field(1825, alias="TELEMETRY_DAY_RETENTION_DAYS")
+    fill_retention_days: int = Field(30, alias="FILL_RETENTION_DAYS")
+    event_queue_size: int = Field(10_000, alias="EVENT_QUEUE_SIZE")
+    checkpoint_path: str = Field("", alias="CHECKPOINT_PATH")
+    checkpoint_interval_seconds: float = Field(300.0, alias="CHECKPOINT_INTERVAL_SECONDS")
     log_level: str = Field("INFO", alias="LOG_LEVEL")
     environment: str = Field("local", alias="ENVIRONMENT")
+    trace_enabled: bool = Field(False, alias="TRACE_ENABLED")
+    trace_buffer_size: int = Field(256, alias="TRACE_BUFFER_SIZE")
 
     @field_validator("symbols", mode="before")
     @classmethod
-    def _parse_symbols(cls, value: List[str] | str) -> List[str]:
+    def _parse_symbols(cls, value: list[str] | str) -> list[str]:
         if isinstance(value, str):
             return [item.strip().upper() for item in value.split(",") if item.strip()]
         return value
@@ -0,0 +1,242 @@
+"""In-process publish/subscribe bus for decision-path side effects.
+
+The orchestrator publishes a ``DecisionEvent`` per step, a ``FillEvent`` per
+execution and a ``StepEvent`` once the step has finished; telemetry, persistence
+and API caches consume them on their own worker threads. Publishing only appends
+to each subscriber's bounded queue, so decision-to-fill latency does not grow
+with the number (or cost) of observers.
+Each subscriber sees its events in publish order. A full queue applies the
+subscriber's overflow policy: ``block`` (back-pressure the publisher),
+``drop_oldest`` (keep the freshest events, e.g. for caches) or ``drop_newest``.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Protocol
+
+import structlog
+
+from app.config import settings
+from app.records import DecisionRecord, FillRecord
+
+LOG = structlog.get_logger("market_mind")
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+@dataclass(frozen=True, slots=True)
+class DecisionEvent:
+    decision: DecisionRecord
+
+
+@dataclass(frozen=True, slots=True)
+class FillEvent:
+    fill: FillRecord
+    pnl_delta: float
+
+
+@dataclass(frozen=True, slots=True)
+class StepEvent:
+    """Published last in a step, after the step's ``DecisionEvent`` and any ``FillEvent``."""
+
+    decision: DecisionRecord
+    fill: FillRecord | None
+
+
+Event = DecisionEvent | FillEvent | StepEvent
+Handler = Callable[[Event], None]
+
+
+class DecisionSink(Protocol):
+    def record_decision(self, decision: DecisionRecord) -> None: ...
+
+    def record_fill(self, fill: FillRecord, pnl_delta: float) -> None: ...
+
+
+def sink_handler(sink: DecisionSink) -> Handler:
+    """Adapt a ``TelemetryStore``-like sink into a bus handler."""
+
+    def handle(event: Event) -> None:
+        if isinstance(event, FillEvent):
+            sink.record_fill(event.fill, pnl_delta=event.pnl_delta)
+        elif isinstance(event, DecisionEvent):
+            sink.record_decision(event.decision)
+
+    return handle
+
+
+class Subscription:
+    """One subscriber's bounded queue and the worker thread that drains it in batches."""
+
+    def __init__(self, name: str, handler: Handler, maxsize: int, overflow: str) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.high_water = 0
+        # Entries are (sequence number, event); ``_busy_from`` is the first sequence
+        # number of the batch being handled, if any.
+        self._queue: deque[tuple[int, Event]] = deque()
+        self._offered = 0
+        self._busy_from: int | None = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=f"event-bus-{name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def offer(self, event: Event) -> bool:
+        """Enqueue ``event``; returns ``False`` if it was dropped."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Subscription {self.name!r} is closed")
+            if len(self._queue) >= self.maxsize:
+                if self.overflow == "drop_newest":
+                    self.dropped += 1
+                    return False
+                if self.overflow == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    self._cond.wait_for(lambda: len(self._queue) < self.maxsize or self._closed)
+                    if self._closed:
+                        raise RuntimeError(f"Subscription {self.name!r} closed while publishing")
+            self._queue.append((self._offered, event))
+            self._offered += 1
+            if len(self._queue) > self.high_water:
+                self.high_water = len(self._queue)
+            self._cond.notify_all()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                batch = list(self._queue)
+                self._queue.clear()
+                self._busy_from = batch[0][0]
+                self._cond.notify_all()
+            try:
+                for _, event in batch:
+                    try:
+                        self.handler(event)
+                        self.delivered += 1
+                    except Exception as exc:
+                        # A failing observer must not stop the others.
+                        self.errors += 1
+                        LOG.error(
+                            "event_handler_failed",
+                            subscriber=self.name,
+                            event_type=type(event).__name__,
+                            error=repr(exc),
+                        )
+            finally:
+                with self._cond:
+                    self._busy_from = None
+                    self._cond.notify_all()
+
+    def _done(self) -> int:
+        """Number of leading events already handled or dropped (call with the lock held)."""
+        if self._busy_from is not None:
+            return self._busy_from
+        return self._queue[0][0] if self._queue else self._offered
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every event offered so far has been handled (or dropped).
+
+        Events offered after the call are not waited for, so a busy publisher
+        cannot starve the caller.
+        """
+        with self._cond:
+            target = self._offered
+            return self._cond.wait_for(lambda: self._done() >= target, timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stop accepting events, drain what is queued and join the worker."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "depth": float(len(self._queue)),
+            "high_water": float(self.high_water),
+            "delivered": float(self.delivered),
+            "dropped": float(self.dropped),
+            "errors": float(self.errors),
+        }
+
+
+class EventBus:
+    """Routes events by type to subscribers; ``publish`` never runs handler code."""
+
+    def __init__(self) -> None:
+        self._subscriptions: dict[str, Subscription] = {}
+        self._routes: dict[type, tuple[Subscription, ...]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self,
+        name: str,
+        handler: Handler,
+        events: Iterable[type] = (DecisionEvent, FillEvent),
+        maxsize: int = settings.event_queue_size,
+        overflow: str = "block",
+    ) -> Subscription:
+        subscription = Subscription(name, handler, maxsize, overflow)
+        with self._lock:
+            if name in self._subscriptions:
+                subscription.close()
+                raise ValueError(f"Subscriber {name!r} already registered")
+            self._subscriptions[name] = subscription
+            routes = dict(self._routes)
+            for event_type in events:
+                routes[event_type] = routes.get(event_type, ()) + (subscription,)
+            # Swapped in whole so publish() can read it without taking the lock.
+            self._routes = routes
+        return subscription
+
+    def subscription(self, name: str) -> Subscription:
+        return self._subscriptions[name]
+
+    def publish(self, event: Event) -> None:
+        for subscription in self._routes.get(type(event), ()):
+            subscription.offer(event)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait for every subscriber to catch up with everything published so far."""
+        return all(
+            subscription.flush(timeout) for subscription in list(self._subscriptions.values())
+        )
+
+    def close(self, timeout: float | None = None) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.values())
+            self._subscriptions.clear()
+            self._routes = {}
+        for subscription in subscriptions:
+            subscription.close(timeout)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            f"events_{name}_{key}": value
+            for name, subscription in list(self._subscriptions.items())
+            for key, value in subscription.stats().items()
+        }
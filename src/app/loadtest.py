@@ -0,0 +1,276 @@
+"""Open-loop HTTP load generator for the FastAPI service.
+
+Requests are issued on a fixed schedule (``rate`` per second) regardless of how
+fast responses come back, and latency is measured from each request's scheduled
+start, so queueing inside the client or server is counted rather than hidden.
+Results convert to ``BenchResult`` entries so runs can be gated against a
+baseline with ``app.bench.compare``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from app.bench import BenchResult
+
+ENDPOINTS: dict[str, tuple[str, str]] = {
+    "decide": ("POST", "/decide"),
+    "latest": ("GET", "/latest"),
+    "metrics": ("GET", "/metrics"),
+    "telem": ("GET", "/telem"),
+    "health": ("GET", "/health"),
+}
+DEFAULT_MIX = {"decide": 0.2, "latest": 0.5, "metrics": 0.3}
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse ``"decide=0.2,latest=0.5,metrics=0.3"`` into normalised weights."""
+    mix: dict[str, float] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name!r}; expected one of {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1.0)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Request mix needs at least one positive weight")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+@dataclass
+class EndpointStats:
+    name: str
+    requests: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+@dataclass
+class LoadResult:
+    target_rate: float
+    duration: float
+    requests: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+    endpoints: dict[str, EndpointStats] = field(default_factory=dict)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+def _percentiles(latencies: Sequence[float]) -> tuple[float, float, float]:
+    if not latencies:
+        return 0.0, 0.0, 0.0
+    p50, p99, p999 = np.percentile(np.asarray(latencies) * 1e3, [50, 99, 99.9])
+    return float(p50), float(p99), float(p999)
+
+
+async def run_load(
+    base_url: str,
+    rate: float,
+    duration: float,
+    mix: Mapping[str, float] = DEFAULT_MIX,
+    symbols: Sequence[str] = ("AAPL",),
+    seed: int = 0,
+    timeout: float = 10.0,
+    max_connections: int = 256,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> LoadResult:
+    """Fire ``rate * duration`` requests on a fixed schedule and summarise them per endpoint.
+
+    ``transport`` replaces the network, e.g. ``httpx.ASGITransport(app=app)`` to
+    drive the app in-process.
+    """
+    rng = random.Random(seed)
+    names = list(mix)
+    total = max(int(rate * duration), 1)
+    plan = [
+        (
+            idx / rate,
+            rng.choices(names, weights=[mix[name] for name in names])[0],
+            rng.choice(symbols),
+        )
+        for idx in range(total)
+    ]
+    samples: dict[str, list[float]] = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    limits = httpx.Limits(
+        max_connections=max_connections, max_keepalive_connections=max_connections
+    )
+
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=timeout, limits=limits, transport=transport
+    ) as client:
+        for symbol in symbols:  # /latest returns 404 until a decision exists
+            await client.post("/decide", params={"symbol": symbol})
+        loop = asyncio.get_running_loop()
+        began = loop.time()
+
+        async def fire(scheduled: float, name: str, symbol: str) -> None:
+            method, path = ENDPOINTS[name]
+            try:
+                response = await client.request(method, path, params={"symbol": symbol})
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            samples[name].append(loop.time() - scheduled)
+            errors[name] += failed
+
+        tasks = []
+        for offset, name, symbol in plan:
+            scheduled = began + offset
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(fire(scheduled, name, symbol)))
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - began
+
+    endpoints = {}
+    for name in names:
+        p50, p99, p999 = _percentiles(samples[name])
+        endpoints[name] = EndpointStats(
+            name, len(samples[name]), errors[name], len(samples[name]) / elapsed, p50, p99, p999
+        )
+    p50, p99, p999 = _percentiles([latency for values in samples.values() for latency in values])
+    return LoadResult(
+        rate, elapsed, total, sum(errors.values()), total / elapsed, p50, p99, p999, endpoints
+    )
+
+
+def find_knee(
+    results: Sequence[LoadResult], max_error_rate: float = 0.01, latency_factor: float = 3.0
+) -> float:
+    """Highest offered rate that was sustained without errors or a p99 blow-up.
+
+    A step counts as sustained when it achieved 95% of its target throughput, kept
+    the error rate within ``max_error_rate`` and held p99 within ``latency_factor``
+    times the p99 of the lightest step.
+    """
+    ordered = sorted(results, key=lambda result: result.target_rate)
+    if not ordered:
+        return 0.0
+    reference = max(ordered[0].p99_ms, 1e-3)
+    knee = 0.0
+    for result in ordered:
+        if (
+            result.throughput < 0.95 * result.target_rate
+            or result.error_rate > max_error_rate
+            or result.p99_ms > latency_factor * reference
+        ):
+            break
+        knee = result.target_rate
+    return knee
+
+
+def to_bench_results(result: LoadResult, knee: float | None = None) -> list[BenchResult]:
+    """Gateable entries: per-endpoint p99, overall throughput and error rate, and the knee."""
+
+    def entry(
+        name: str, metric: str, value: float, higher: bool, source: LoadResult | EndpointStats
+    ) -> BenchResult:
+        p50_us, p99_us = source.p50_ms * 1e3, source.p99_ms * 1e3
+        return BenchResult(name, metric, value, higher, source.requests, p50_us, p99_us)
+
+    entries = [
+        entry(f"load_{stats.name}", "p99_us", stats.p99_ms * 1e3, False, stats)
+        for stats in result.endpoints.values()
+    ]
+    entries.append(entry("load_throughput", "requests_per_sec", result.throughput, True, result))
+    entries.append(entry("load_error_rate", "error_rate", result.error_rate, False, result))
+    if knee is not None:
+        entries.append(entry("load_knee", "requests_per_sec", knee, True, result))
+    return entries
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """Runs ``app.main`` under uvicorn in a subprocess with throwaway state databases."""
+
+    def __init__(
+        self, workers: int = 1, port: int | None = None, startup_timeout: float = 30.0
+    ) -> None:
+        self.workers = workers
+        self.port = port or _free_port()
+        self.startup_timeout = startup_timeout
+        self._tmp: tempfile.TemporaryDirectory | None = None
+        self._process: subprocess.Popen | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> LocalServer:
+        self._tmp = tempfile.TemporaryDirectory(prefix="market-mind-load-")
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(
+                filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")])
+            ),
+            "DATABASE_URL": f"sqlite:///{self._tmp.name}/paper_trades.db",
+            "STATE_URL": f"sqlite:///{self._tmp.name}/api_state.db",
+            "LOG_LEVEL": "WARNING",
+        }
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1"]
+        command += ["--port", str(self.port), "--workers", str(self.workers)]
+        command += ["--log-level", "warning", "--no-access-log"]
+        self._process = subprocess.Popen(
+            command, env=env, cwd=self._tmp.name, stdout=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {self._process.returncode}")
+            try:
+                if httpx.get(f"{self.url}/health", timeout=1.0).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        self.__exit__()
+        raise RuntimeError(f"uvicorn did not become healthy within {self.startup_timeout:.0f}s")
+
+    def __exit__(self, *exc: object) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:  # pragma: no cover - defensive
+                self._process.kill()
+            self._process = None
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
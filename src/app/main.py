@@ -1,16 +1,38 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException, Query
+from datetime import UTC, datetime, timedelta
+
+from fastapi import FastAPI, HTTPException, Query, Response
 
 from app.config import settings
+from app.events import StepEvent
 from app.runner import build_orchestrator
 from app.schemas import JudgeDecision, TelemetrySnapshot
-from app.telemetry import telemetry
+from app.state import SharedStateStore
+from app.tracing import tracer
 
 app = FastAPI(title="Numeriq Market-Mind Agent", version="0.1.0")
 
-orchestrator = build_orchestrator()
-latest_decisions: dict[str, JudgeDecision] = {}
+orchestrator = build_orchestrator(event_bus=True)
+telemetry = orchestrator.telemetry
+state = SharedStateStore(database_url=settings.state_url)
+
+
+def _publish_state(event: StepEvent) -> None:
+    # The step's decision and fill were published to the telemetry subscriber before this
+    # event, so once it has caught up the snapshot includes the fill's PnL.
+    orchestrator.events.subscription("telemetry").flush()
+    decision = event.decision.to_model()
+    # Later steps may already be recorded, so pair the snapshot with this step's decision.
+    snapshot = telemetry.latest_snapshot(symbol=decision.symbol)
+    snapshot = snapshot.model_copy(update={"decision": decision})
+    state.publish(decision, snapshot=snapshot, metrics=_local_metrics())
+
+
+# The shared state store is an API cache: only the freshest steps matter if it falls behind.
+api_state = orchestrator.events.subscribe(
+    "api-state", _publish_state, events=(StepEvent,), overflow="drop_oldest"
+)
 
 
 @app.get("/health")
@@ -20,23 +42,74 @@ def health() -> dict[str, str]:
 
 @app.get("/latest")
 def latest(symbol: str = Query(default="AAPL")) -> JudgeDecision:
-    if symbol not in latest_decisions:
+    payload = state.latest_decision_json(symbol)
+    if payload is None:
         raise HTTPException(status_code=404, detail="No decision yet")
-    return latest_decisions[symbol]
+    return Response(content=payload, media_type="application/json")
 
 
 @app.get("/telem")
 def telem(symbol: str = Query(default="AAPL")) -> TelemetrySnapshot:
-    return telemetry.latest_snapshot(symbol=symbol)
+    payload = state.snapshot_json(symbol)
+    if payload is None:
+        return telemetry.latest_snapshot(symbol=symbol)
+    return Response(content=payload, media_type="application/json")
 
 
 @app.get("/metrics")
 def metrics() -> dict[str, float]:
-    return telemetry.export_metrics()
+    return state.metrics() or _local_metrics()
+
+
+def _local_metrics() -> dict[str, float]:
+    cache_stats = orchestrator.factual_agent.cache.stats()
+    return {
+        **telemetry.export_metrics(),
+        **{f"factual_cache_{name}": value for name, value in cache_stats.items()},
+        **orchestrator.events.stats(),
+    }
+
+
+@app.get("/telemetry/pnl")
+def pnl_series(
+    start: datetime | None = Query(
+        default=None, description="Range start; defaults to one hour before end."
+    ),
+    end: datetime | None = Query(default=None, description="Range end; defaults to now."),
+    resolution: float | None = Query(default=None, gt=0, description="Seconds per point."),
+    max_points: int = Query(default=1_000, ge=1),
+) -> dict:
+    end = end or datetime.now(tz=UTC)
+    start = start or end - timedelta(hours=1)
+    start, end = (ts if ts.tzinfo else ts.replace(tzinfo=UTC) for ts in (start, end))
+    if start > end:
+        raise HTTPException(status_code=422, detail="start must not be after end")
+    result = telemetry.series.query(
+        start, end, resolution_seconds=resolution, max_points=max_points
+    )
+    return {
+        "tier": result.tier,
+        "resolution_seconds": result.resolution_seconds,
+        "points": result.points,
+    }
+
+
+@app.get("/debug/trace")
+def debug_trace(limit: int = Query(default=20, ge=1)) -> dict:
+    return {"enabled": tracer.enabled, "traces": tracer.recent(limit=limit)}
+
+
+@app.post("/debug/trace")
+def toggle_trace(enabled: bool = Query(...)) -> dict[str, bool]:
+    tracer.enabled = enabled
+    if not enabled:
+        tracer.clear()
+    return {"enabled": tracer.enabled}
 
 
 @app.post("/decide")
 def decide(symbol: str = Query(default="AAPL")) -> JudgeDecision:
-    decision, _ = orchestrator.step(symbol=symbol)
-    latest_decisions[symbol] = decision
-    return decision
+    record, _ = orchestrator.step(symbol=symbol)
+    # Read-your-writes for /latest: wait for the state cache only, not for telemetry.
+    api_state.flush()
+    return record.to_model()
@@ -0,0 +1,100 @@
+"""Trusted in-process record types for the decision hot path.
+
+The pydantic models in ``app.schemas`` validate every field on construction,
+which dominates the cost of moving bars, features and decisions between agents.
+These slotted dataclasses carry the same fields without validation; convert with
+``to_model()``/``from_model()`` at the FastAPI boundary where validation and
+serialization are actually needed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, ClassVar, TypeVar
+
+from pydantic import BaseModel
+
+from app.schemas import (
+    ExecutionFill,
+    FactualFeatures,
+    JudgeDecision,
+    MarketBar,
+    SubjectiveSignals,
+)
+
+RecordT = TypeVar("RecordT", bound="Record")
+
+ACTIONS = ("HOLD", "BUY", "SELL")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+class Record:
+    __slots__ = ()
+    model: ClassVar[type[BaseModel]]
+
+    def to_model(self) -> Any:
+        """Validate into the matching pydantic schema."""
+        return self.model(**{name: getattr(self, name) for name in self.__slots__})
+
+    @classmethod
+    def from_model(cls: type[RecordT], model: BaseModel) -> RecordT:
+        return cls(**{name: getattr(model, name) for name in cls.__slots__})
+
+
+@dataclass(slots=True)
+class BarRecord(Record):
+    model: ClassVar[type[BaseModel]] = MarketBar
+
+    timestamp: datetime
+    symbol: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+@dataclass(slots=True)
+class FeaturesRecord(Record):
+    model: ClassVar[type[BaseModel]] = FactualFeatures
+
+    timestamp: datetime
+    symbol: str
+    features: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SignalsRecord(Record):
+    model: ClassVar[type[BaseModel]] = SubjectiveSignals
+
+    timestamp: datetime
+    symbol: str
+    signals: dict[str, float] = field(default_factory=dict)
+    notes: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class DecisionRecord(Record):
+    model: ClassVar[type[BaseModel]] = JudgeDecision
+
+    timestamp: datetime
+    symbol: str
+    action: str
+    size: float
+    confidence: float
+    rationale: list[str]
+    guardrails_applied: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class FillRecord(Record):
+    model: ClassVar[type[BaseModel]] = ExecutionFill
+
+    timestamp: datetime
+    symbol: str
+    action: str
+    price: float
+    size: float
+    slippage_bps: float
+    latency_ms: float
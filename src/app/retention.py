@@ -0,0 +1,266 @@
+"""Tiered in-memory retention for telemetry time series.
+
+PnL points are kept raw for a recent window and are rolled up incrementally
+into 1m/1h/1d buckets as they arrive. A bucket holds the PnL OHLC, fill and
+decision counts, and a fill-latency summary. Each tier is a bounded deque sized
+from its retention, so memory stays flat however long the process runs.
+``query`` answers a time range from the cheapest tier that still meets the
+requested resolution.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, fields
+from datetime import UTC, datetime, timedelta
+from itertools import islice
+
+import numpy as np
+
+from app.utils.time_windows import floor_to_interval, from_epoch_ns, to_epoch_ns
+
+ROLLUP_SECONDS = {"1m": 60, "1h": 3600, "1d": 86400}
+TIERS = ("raw",) + tuple(ROLLUP_SECONDS)
+_EMPTY_NS = -1
+
+
+@dataclass(slots=True)
+class Rollup:
+    start: datetime
+    pnl_open: float
+    pnl_high: float
+    pnl_low: float
+    pnl_close: float
+    fills: int = 0
+    decisions: int = 0
+    latency_count: int = 0
+    latency_sum: float = 0.0
+    latency_min: float = float("inf")
+    latency_max: float = 0.0
+
+    def add_pnl(self, pnl: float) -> None:
+        if pnl > self.pnl_high:
+            self.pnl_high = pnl
+        if pnl < self.pnl_low:
+            self.pnl_low = pnl
+        self.pnl_close = pnl
+
+    def add_latency(self, latency_ms: float) -> None:
+        self.latency_count += 1
+        self.latency_sum += latency_ms
+        self.latency_min = min(self.latency_min, latency_ms)
+        self.latency_max = max(self.latency_max, latency_ms)
+
+    def to_dict(self) -> dict:
+        payload = asdict(self)
+        payload["latency_mean"] = (
+            self.latency_sum / self.latency_count if self.latency_count else None
+        )
+        if not self.latency_count:
+            payload["latency_min"] = None
+        return payload
+
+
+@dataclass(slots=True)
+class RawPoint:
+    timestamp: datetime
+    pnl: float
+    latency_ms: float
+
+    def to_dict(self) -> dict:
+        """Same shape as ``Rollup.to_dict`` so every tier serialises alike."""
+        rollup = Rollup(self.timestamp, self.pnl, self.pnl, self.pnl, self.pnl, fills=1)
+        rollup.add_latency(self.latency_ms)
+        return rollup.to_dict()
+
+
+@dataclass
+class SeriesQuery:
+    tier: str
+    resolution_seconds: int
+    points: list[dict]
+
+
+def _utc(timestamp: datetime) -> datetime:
+    return timestamp if timestamp.tzinfo is not None else timestamp.replace(tzinfo=UTC)
+
+
+class TieredSeries:
+    """Raw PnL points for ``raw_retention`` plus bounded 1m/1h/1d rollups."""
+
+    def __init__(
+        self,
+        raw_retention: timedelta = timedelta(hours=1),
+        rollup_retention: dict[str, timedelta] | None = None,
+        raw_max_points: int = 100_000,
+    ) -> None:
+        retention = {
+            "1m": timedelta(days=2),
+            "1h": timedelta(days=90),
+            "1d": timedelta(days=5 * 365),
+        }
+        retention.update(rollup_retention or {})
+        self.raw_retention = raw_retention
+        self.retention = retention
+        self.raw: deque[RawPoint] = deque(maxlen=raw_max_points)
+        self._closed: dict[str, deque[Rollup]] = {
+            tier: deque(maxlen=max(int(retention[tier].total_seconds() // seconds), 1))
+            for tier, seconds in ROLLUP_SECONDS.items()
+        }
+        self._open: dict[str, Rollup | None] = dict.fromkeys(ROLLUP_SECONDS)
+        self.last_pnl = 0.0
+        self.first_timestamp: datetime | None = None
+        self.late_points = 0
+
+    def _bucket(self, tier: str, timestamp: datetime) -> Rollup | None:
+        """The bucket covering ``timestamp``, rolling the tier forward if needed."""
+        start = floor_to_interval(timestamp, ROLLUP_SECONDS[tier])
+        current = self._open[tier]
+        if current is None or start > current.start:
+            if current is not None:
+                self._closed[tier].append(current)
+            current = self._open[tier] = Rollup(
+                start, self.last_pnl, self.last_pnl, self.last_pnl, self.last_pnl
+            )
+            return current
+        if start == current.start:
+            return current
+        # Out of order: only the most recent closed buckets are revisited.
+        for bucket in islice(reversed(self._closed[tier]), 4):
+            if bucket.start == start:
+                return bucket
+        return None
+
+    def add_pnl(self, timestamp: datetime, pnl: float, latency_ms: float) -> None:
+        timestamp = _utc(timestamp)
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        self.raw.append(RawPoint(timestamp, pnl, latency_ms))
+        cutoff = timestamp - self.raw_retention
+        while self.raw and self.raw[0].timestamp < cutoff:
+            self.raw.popleft()
+        for tier in ROLLUP_SECONDS:
+            bucket = self._bucket(tier, timestamp)
+            if bucket is None:
+                self.late_points += 1
+                continue
+            bucket.add_pnl(pnl)
+            bucket.fills += 1
+            bucket.add_latency(latency_ms)
+        self.last_pnl = pnl
+
+    def add_decision(self, timestamp: datetime) -> None:
+        timestamp = _utc(timestamp)
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        for tier in ROLLUP_SECONDS:
+            bucket = self._bucket(tier, timestamp)
+            if bucket is None:
+                self.late_points += 1
+                continue
+            bucket.decisions += 1
+
+    def export_state(self) -> dict[str, np.ndarray]:
+        """Raw points and every tier's buckets (the last one per tier is still open) as arrays."""
+        first = _EMPTY_NS if self.first_timestamp is None else to_epoch_ns(self.first_timestamp)
+        state = {
+            "raw_ts": np.array(
+                [to_epoch_ns(point.timestamp) for point in self.raw], dtype=np.int64
+            ),
+            "raw_pnl": np.array([point.pnl for point in self.raw], dtype=float),
+            "raw_latency": np.array([point.latency_ms for point in self.raw], dtype=float),
+            "scalars": np.array([self.last_pnl, first, self.late_points], dtype=float),
+            "open_tiers": np.array(
+                [tier for tier in ROLLUP_SECONDS if self._open[tier] is not None], dtype=str
+            ),
+        }
+        for tier in ROLLUP_SECONDS:
+            buckets = self.rollups(tier)
+            state[f"{tier}_start"] = np.array(
+                [to_epoch_ns(bucket.start) for bucket in buckets], dtype=np.int64
+            )
+            for item in fields(Rollup)[1:]:
+                state[f"{tier}_{item.name}"] = np.array(
+                    [getattr(bucket, item.name) for bucket in buckets]
+                )
+        return state
+
+    def restore_state(self, state: Mapping[str, np.ndarray]) -> None:
+        self.raw.clear()
+        for ts, pnl, latency in zip(
+            state["raw_ts"].tolist(),
+            state["raw_pnl"].tolist(),
+            state["raw_latency"].tolist(),
+            strict=True,
+        ):
+            self.raw.append(RawPoint(from_epoch_ns(ts), pnl, latency))
+        last_pnl, first, late = state["scalars"].tolist()
+        self.last_pnl = last_pnl
+        self.first_timestamp = None if first == _EMPTY_NS else from_epoch_ns(int(first))
+        self.late_points = int(late)
+        open_tiers = set(state["open_tiers"].tolist())
+        names = [item.name for item in fields(Rollup)[1:]]
+        for tier in ROLLUP_SECONDS:
+            starts = state[f"{tier}_start"].tolist()
+            columns = [state[f"{tier}_{name}"].tolist() for name in names]
+            buckets = [
+                Rollup(from_epoch_ns(start), *values)
+                for start, *values in zip(starts, *columns, strict=True)
+            ]
+            self._open[tier] = buckets.pop() if tier in open_tiers and buckets else None
+            self._closed[tier].clear()
+            self._closed[tier].extend(buckets)
+
+    def rollups(self, tier: str) -> list[Rollup]:
+        buckets = list(self._closed[tier])
+        if self._open[tier] is not None:
+            buckets.append(self._open[tier])
+        return buckets
+
+    def oldest(self, tier: str) -> datetime | None:
+        if tier == "raw":
+            return self.raw[0].timestamp if self.raw else None
+        closed = self._closed[tier]
+        if closed:
+            return closed[0].start
+        return self._open[tier].start if self._open[tier] is not None else None
+
+    def choose_tier(self, start: datetime, resolution_seconds: float) -> str:
+        """Coarsest tier no coarser than ``resolution_seconds`` whose history reaches ``start``.
+
+        Falls back to coarser tiers when the preferred one has already aged out
+        (history before the first recorded point never counts as aged out).
+        """
+        candidates = [
+            tier for tier in TIERS if tier == "raw" or ROLLUP_SECONDS[tier] <= resolution_seconds
+        ]
+        preferred = candidates[-1]
+        if self.first_timestamp is None:
+            return preferred
+        start = max(_utc(start), self.first_timestamp)
+        for tier in TIERS[TIERS.index(preferred) :]:
+            oldest = self.oldest(tier)
+            if oldest is not None and oldest <= start:
+                return tier
+        return TIERS[-1]
+
+    def query(
+        self,
+        start: datetime,
+        end: datetime,
+        resolution_seconds: float | None = None,
+        max_points: int = 1_000,
+    ) -> SeriesQuery:
+        """Points in ``[start, end]``; without a resolution, aim for at most ``max_points``."""
+        start, end = _utc(start), _utc(end)
+        if resolution_seconds is None:
+            resolution_seconds = (end - start).total_seconds() / max(max_points, 1)
+        tier = self.choose_tier(start, resolution_seconds)
+        if tier == "raw":
+            points = [point.to_dict() for point in self.raw if start <= point.timestamp <= end]
+            return SeriesQuery(tier, 0, points)
+        seconds = ROLLUP_SECONDS[tier]
+        first = floor_to_interval(start, seconds)
+        points = [bucket.to_dict() for bucket in self.rollups(tier) if first <= bucket.start <= end]
+        return SeriesQuery(tier, seconds, points)
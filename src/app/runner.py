@@ -1,63 +1,217 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import os
 import time
-from datetime import datetime
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
 
 import typer
 
+from agents.factual_agent import FactualAgent
+from agents.judge_agent import FACTUAL_COLUMNS, JudgeAgent
+from agents.subjective_agent import SubjectiveAgent
+from app import bench as bench_suite
+from app import loadtest as load
+from app.checkpoint import Checkpointer
 from app.config import settings
+from app.events import EventBus, sink_handler
+from app.profiling import StackSampler
 from app.telemetry import telemetry
+from app.utils.time_windows import trading_minutes
+from pipelines.backtest import run_backtest
+from pipelines.monte_carlo import BARS_PER_DAY, run_monte_carlo
 from pipelines.orchestrator import MarketMindOrchestrator
+from pipelines.replay import StepRecorder, read_log
+from pipelines.replay import replay as replay_steps
+from pipelines.sharded import ShardedLiveEngine
+from pipelines.walk_forward import build_panel, make_folds, run_walk_forward
 from services.execution import PaperBroker
 from services.feature_store import FeatureStore
+from services.ingestion import BarBuilder, StreamingMarketDataProvider, TickIngestor
 from services.market_data import MockMarketDataProvider
 from services.news_data import MockNewsProvider
+from services.portfolio_risk import PortfolioRisk
 from services.risk import RiskManager
 from services.sentiment import RuleBasedSentiment
-from agents.factual_agent import FactualAgent
-from agents.subjective_agent import SubjectiveAgent
-from agents.judge_agent import JudgeAgent
-from pipelines.backtest import run_backtest
+from services.synthetic import SyntheticMarket
 
 app = typer.Typer(add_completion=False, help="Market-Mind runner CLI.")
 
 
-def build_orchestrator() -> MarketMindOrchestrator:
+def build_orchestrator(event_bus: bool = False) -> MarketMindOrchestrator:
+    """Wire the default agents.
+
+    With ``event_bus`` the orchestrator's telemetry is recorded by a bus subscriber
+    on a worker thread; whoever asks for the bus closes it (``orchestrator.events.close()``).
+    """
     market_provider = MockMarketDataProvider()
     feature_store = FeatureStore()
-    factual_agent = FactualAgent(provider=market_provider, feature_store=feature_store)
+    factual_agent = FactualAgent(
+        provider=market_provider,
+        feature_store=feature_store,
+        features=FACTUAL_COLUMNS + ("last_close",),
+    )
 
     news_provider = MockNewsProvider()
     sentiment = RuleBasedSentiment()
     subjective_agent = SubjectiveAgent(provider=news_provider, sentiment_model=sentiment)
 
     judge_agent = JudgeAgent()
-    risk_manager = RiskManager()
+    risk_manager = RiskManager(
+        portfolio=(
+            PortfolioRisk(settings.symbols, sectors=settings.symbol_sectors)
+            if settings.portfolio_risk_enabled
+            else None
+        )
+    )
     broker = PaperBroker()
 
-    return MarketMindOrchestrator(
+    orchestrator = MarketMindOrchestrator(
         factual_agent=factual_agent,
         subjective_agent=subjective_agent,
         judge_agent=judge_agent,
         risk_manager=risk_manager,
         broker=broker,
     )
+    if event_bus:
+        orchestrator.events = EventBus()
+        orchestrator.events.subscribe("telemetry", sink_handler(orchestrator.telemetry))
+    return orchestrator
 
 
 @app.command()
-def live(symbol: str = typer.Option("AAPL"), interval: int = typer.Option(settings.interval_seconds)):
+def live(
+    symbol: str = typer.Option("AAPL"),
+    interval: int = typer.Option(settings.interval_seconds),
+    record: Path | None = typer.Option(None, help="Append every step's inputs to this replay log."),
+    checkpoint: Path | None = typer.Option(
+        Path(settings.checkpoint_path) if settings.checkpoint_path else None,
+        help="Restore warm state from this checkpoint on start and rewrite it periodically.",
+    ),
+):
     """Run the live decision loop with mock providers."""
-    orchestrator = build_orchestrator()
+    orchestrator = build_orchestrator(event_bus=True)
+    recorder = StepRecorder(record).attach(orchestrator) if record else None
+    checkpointer = _restore(checkpoint, orchestrator.checkpoint_components(), orchestrator.events)
     typer.echo(f"Starting live loop for {symbol} at {interval}s intervals")
     try:
         while True:
             decision, fill = orchestrator.step(symbol=symbol)
-            typer.echo(f"{decision.timestamp.isoformat()} {symbol} {decision.action} size={decision.size:.2f}")
+            typer.echo(
+                f"{decision.timestamp.isoformat()} {symbol} {decision.action} "
+                f"size={decision.size:.2f}"
+            )
             if fill:
                 typer.echo(f" fill @{fill.price:.2f} latency={fill.latency_ms:.1f}ms")
+            if checkpointer is not None:
+                checkpointer.maybe_write()
             time.sleep(interval)
     except KeyboardInterrupt:
         typer.echo("Shutting down...")
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if checkpointer is not None:
+            checkpointer.write()
+        orchestrator.events.close()
+
+
+def _restore(
+    path: Path | None, components: dict, events: EventBus | None = None
+) -> Checkpointer | None:
+    if path is None:
+        return None
+    # Subscribers must be caught up before their state is exported.
+    before_write = events.flush if events is not None else None
+    checkpointer = Checkpointer(
+        path, components, settings.checkpoint_interval_seconds, before_write=before_write
+    )
+    began = time.perf_counter()
+    header = checkpointer.restore()
+    if header is None:
+        typer.echo(f"No checkpoint at {path}; starting cold")
+    else:
+        typer.echo(
+            f"Restored {', '.join(header['components'])} from checkpoint of {header['created']} "
+            f"in {(time.perf_counter() - began) * 1e3:.0f}ms"
+        )
+    return checkpointer
+
+
+@app.command()
+def engine(
+    symbols: str = typer.Option(
+        ",".join(settings.symbols), help="Comma-separated universe to trade."
+    ),
+    workers: int = typer.Option(2, help="Worker processes to shard the universe across."),
+    interval: int = typer.Option(settings.interval_seconds),
+    ticks: int = typer.Option(0, help="Stop after this many ticks (0 runs until interrupted)."),
+    checkpoint: Path | None = typer.Option(
+        Path(settings.checkpoint_path) if settings.checkpoint_path else None,
+        help=(
+            "Restore the coordinator ledger, telemetry, portfolio risk and (for "
+            "streaming providers) bar windows from this checkpoint and rewrite it periodically."
+        ),
+    ),
+):
+    """Run the live loop sharded across worker processes with shared-memory bars."""
+    universe = [item.strip().upper() for item in symbols.split(",") if item.strip()]
+    typer.echo(f"Starting sharded engine for {len(universe)} symbols on {workers} workers")
+    with ShardedLiveEngine(universe, workers=workers) as live_engine:
+        checkpointer = _restore(checkpoint, live_engine.checkpoint_components())
+        completed = 0
+        try:
+            while not ticks or completed < ticks:
+                began = time.perf_counter()
+                results = live_engine.tick()
+                elapsed = time.perf_counter() - began
+                completed += 1
+                trades = sum(fill is not None for _, fill in results)
+                typer.echo(
+                    f"tick {completed}: {len(results)} decisions, {trades} fills "
+                    f"in {elapsed * 1e3:.1f}ms ({len(results) / elapsed:,.0f} symbols/s) "
+                    f"PnL={live_engine.ledger.total_pnl:.2f}"
+                )
+                if checkpointer is not None:
+                    checkpointer.maybe_write()
+                if not ticks or completed < ticks:
+                    time.sleep(max(interval - elapsed, 0.0))
+        except KeyboardInterrupt:
+            typer.echo("Shutting down...")
+        finally:
+            if checkpointer is not None:
+                checkpointer.write()
+
+
+@app.command()
+def ingest(
+    source: str = typer.Option(
+        "-", help="Tick source: file/FIFO path, '-', tcp://host:port or unix:///path."
+    ),
+    interval: int = typer.Option(60, help="Bar interval in seconds."),
+    lateness: float = typer.Option(2.0, help="Allowed out-of-order lateness in seconds."),
+    late_policy: str = typer.Option("drop", help="Ticks behind the watermark: drop or revise."),
+):
+    """Build bars from a tick stream and report throughput and late-tick counts."""
+    provider = StreamingMarketDataProvider()
+    ingestor = TickIngestor(BarBuilder(provider, interval, lateness, late_policy))
+    began = time.perf_counter()
+    try:
+        ingestor.consume(source)
+    except KeyboardInterrupt:
+        typer.echo("Shutting down...")
+    ingestor.builder.flush()
+    elapsed = max(time.perf_counter() - began, 1e-9)
+    stats = ingestor.builder.stats()
+    typer.echo(
+        f"Ingested {stats['ticks']:,.0f} ticks in {elapsed:.2f}s "
+        f"({stats['ticks'] / elapsed:,.0f} ticks/s) | bars={stats['bars_emitted']:,.0f} "
+        f"late={stats['late_ticks']:,.0f} revised={stats['revisions']:,.0f} "
+        f"quotes={len(ingestor.quotes)} malformed={ingestor.malformed}"
+    )
 
 
 @app.command()
@@ -66,16 +220,278 @@ def backtest(
     start: str = typer.Option(..., help="Start date YYYY-MM-DD"),
     end: str = typer.Option(..., help="End date YYYY-MM-DD"),
     step_seconds: int = typer.Option(60),
+    output: Path | None = typer.Option(
+        None, help="Export decisions to .npz (all columns) or .parquet."
+    ),
+    spill_dir: Path | None = typer.Option(
+        None, help="Spill sealed result chunks to this directory."
+    ),
 ):
     """Run a simple parity backtest using the orchestrator."""
     orchestrator = build_orchestrator()
     start_ts = datetime.fromisoformat(start)
     end_ts = datetime.fromisoformat(end)
     typer.echo(f"Running backtest for {symbol} from {start_ts.date()} to {end_ts.date()}")
-    result = run_backtest(orchestrator, symbol=symbol, start=start_ts, end=end_ts, step_seconds=step_seconds)
-    typer.echo(f"Decisions generated: {len(result.decisions)} | Trades: {result.trades}")
+    result = run_backtest(
+        orchestrator,
+        symbol=symbol,
+        start=start_ts,
+        end=end_ts,
+        step_seconds=step_seconds,
+        spill_dir=spill_dir,
+    )
+    typer.echo(f"Decisions generated: {len(result)} | Trades: {result.trades}")
+    if output:
+        if output.suffix == ".parquet":
+            result.to_parquet(output)
+        else:
+            result.to_npz(output)
+        typer.echo(f"Results written to {output}")
+    result.close()
     metrics = telemetry.export_metrics()
-    typer.echo(f"PnL={metrics['pnl']:.2f} Sharpe={metrics['sharpe_30d']:.2f} DD={metrics['max_drawdown']:.2f}")
+    typer.echo(
+        f"PnL={metrics['pnl']:.2f} Sharpe={metrics['sharpe_30d']:.2f} "
+        f"DD={metrics['max_drawdown']:.2f}"
+    )
+
+
+@app.command("walk-forward")
+def walk_forward(
+    symbol: str = typer.Option("AAPL"),
+    start: str = typer.Option("2024-01-02", help="First session date YYYY-MM-DD"),
+    bars: int = typer.Option(5_000, help="Minute bars in the full span."),
+    train: int = typer.Option(1_500, help="Bars per train window."),
+    test: int = typer.Option(500, help="Bars per test window (also the roll step)."),
+    workers: int = typer.Option(2, help="Processes to run folds on."),
+):
+    """Calibrate on rolling train windows and evaluate out-of-sample, reusing one feature panel."""
+    history = SyntheticMarket([symbol]).advance(bars).records(symbol)
+    for bar, ts in zip(history, trading_minutes(datetime.fromisoformat(start), bars), strict=True):
+        bar.timestamp = ts
+    subjective_agent = SubjectiveAgent(
+        provider=MockNewsProvider(), sentiment_model=RuleBasedSentiment()
+    )
+    began = time.perf_counter()
+    panel = build_panel(symbol, history, subjective_agent)
+    built = time.perf_counter()
+    result = run_walk_forward(panel, make_folds(len(panel), train, test), workers=workers)
+    finished = time.perf_counter()
+    for fold in result.folds:
+        typer.echo(
+            f"fold {fold.index}: test {fold.test_start:%Y-%m-%d %H:%M} -> "
+            f"{fold.test_end:%Y-%m-%d %H:%M} tau={fold.tau:.2f} "
+            f"train_sharpe={fold.train['sharpe']:.2f} | test PnL={fold.test['pnl']:.2f} "
+            f"Sharpe={fold.test['sharpe']:.2f} DD={fold.test['max_drawdown']:.2f} "
+            f"trades={fold.test['trades']:.0f}"
+        )
+    agg = result.aggregate
+    typer.echo(
+        f"out-of-sample: PnL={agg['pnl']:.2f} Sharpe={agg['sharpe']:.2f} "
+        f"DD={agg['max_drawdown']:.2f} trades={agg['trades']:.0f} folds={agg['folds']:.0f} | "
+        f"panel {built - began:.2f}s, folds {finished - built:.2f}s"
+    )
+
+
+@app.command("monte-carlo")
+def monte_carlo(
+    paths: int = typer.Option(1_000, help="Independent seeded price/sentiment paths."),
+    days: int = typer.Option(21, help="Trading days of minute bars per path."),
+    seed: int = typer.Option(7),
+    chunk: int = typer.Option(256, help="Paths simulated together in one vectorized block."),
+    workers: int = typer.Option(os.cpu_count() or 1, help="Processes to run chunks on."),
+    output: Path | None = typer.Option(None, help="Write the summary as JSON to this path."),
+):
+    """Run the full decision logic over many simulated paths and report outcome distributions."""
+    began = time.perf_counter()
+    result = run_monte_carlo(
+        paths, bars=days * BARS_PER_DAY, seed=seed, chunk_size=chunk, workers=workers
+    )
+    elapsed = time.perf_counter() - began
+    summary = result.summary()
+    for name, stats in summary.items():
+        typer.echo(f"{name:>28}: " + " ".join(f"{key}={value:.4g}" for key, value in stats.items()))
+    rate = paths * result.bars / elapsed
+    typer.echo(f"{paths} paths x {result.bars} bars in {elapsed:.1f}s ({rate:,.0f} bars/s)")
+    if output:
+        output.write_text(json.dumps(summary, indent=2) + "\n")
+
+
+@app.command()
+def replay(
+    log: Path = typer.Option(..., help="Replay log written by `live --record`."),
+    interval: int = typer.Option(
+        settings.interval_seconds, help="Recorded step interval, for speed-up."
+    ),
+):
+    """Replay recorded step inputs through the agents and risk manager without I/O."""
+    steps = list(read_log(log))
+    began = time.perf_counter()
+    try:
+        decisions = replay_steps(steps)
+    except ValueError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1) from exc
+    elapsed = max(time.perf_counter() - began, 1e-9)
+    actions = {
+        action: sum(d.action == action for d in decisions) for action in ("BUY", "SELL", "HOLD")
+    }
+    typer.echo(
+        f"Replayed {len(decisions)} steps in {elapsed:.3f}s "
+        f"({len(decisions) * interval / elapsed:,.0f}x real time) | "
+        + " ".join(f"{action}={count}" for action, count in actions.items())
+    )
+
+
+@app.command()
+def bench(
+    case: list[str] | None = typer.Option(None, "--case", help="Benchmark(s) to run; default all."),
+    output: Path | None = typer.Option(None, help="Write JSON results to this path."),
+    baseline: Path = typer.Option(
+        bench_suite.DEFAULT_BASELINE, help="Baseline JSON to compare against."
+    ),
+    tolerance: float = typer.Option(
+        bench_suite.DEFAULT_TOLERANCE, help="Allowed relative regression."
+    ),
+    scale: float = typer.Option(1.0, help="Multiplier applied to every case's iteration count."),
+    save_baseline: bool = typer.Option(False, help="Overwrite the baseline with these results."),
+):
+    """Run the benchmark suite and fail on regressions against the stored baseline."""
+    results = bench_suite.run_suite(case, scale=scale)
+    _report_and_gate(
+        results, bench_suite.results_to_json(results), output, baseline, tolerance, save_baseline
+    )
+
+
+def _report_and_gate(
+    results: list[bench_suite.BenchResult],
+    payload: dict,
+    output: Path | None,
+    baseline: Path,
+    tolerance: float,
+    save_baseline: bool,
+) -> None:
+    rendered = json.dumps(payload, indent=2)
+    if output:
+        output.write_text(rendered + "\n")
+    typer.echo(rendered)
+
+    if save_baseline:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline.write_text(rendered + "\n")
+        typer.echo(f"Baseline written to {baseline}", err=True)
+        return
+    if not baseline.exists():
+        typer.echo(f"No baseline at {baseline}; skipping regression check", err=True)
+        return
+
+    regressions = bench_suite.compare(
+        results, bench_suite.load_baseline(baseline), tolerance=tolerance
+    )
+    for reg in regressions:
+        typer.echo(
+            f"REGRESSION {reg.name}: {reg.metric} {reg.value:.2f} vs baseline {reg.baseline:.2f} "
+            f"({reg.change:+.1%}, tolerance {reg.tolerance:.0%})",
+            err=True,
+        )
+    if regressions:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def loadtest(
+    rate: float = typer.Option(50.0, help="Offered requests per second (open loop)."),
+    duration: float = typer.Option(10.0, help="Seconds per load step."),
+    mix: str = typer.Option("decide=0.2,latest=0.5,metrics=0.3", help="Endpoint weights."),
+    symbols: str = typer.Option(
+        ",".join(settings.symbols), help="Comma-separated symbols to query."
+    ),
+    saturate: str | None = typer.Option(
+        None, help="Comma-separated rates to step through to find the knee."
+    ),
+    workers: int = typer.Option(1, help="uvicorn worker processes for the local server."),
+    url: str | None = typer.Option(
+        None, help="Target an already running server instead of starting one."
+    ),
+    output: Path | None = typer.Option(None, help="Write JSON results to this path."),
+    baseline: Path = typer.Option(
+        Path("bench/loadtest_baseline.json"), help="Baseline JSON to compare against."
+    ),
+    tolerance: float = typer.Option(
+        bench_suite.DEFAULT_TOLERANCE, help="Allowed relative regression."
+    ),
+    save_baseline: bool = typer.Option(False, help="Overwrite the baseline with these results."),
+):
+    """Drive the API with an open-loop request mix; gate latency/throughput against a baseline."""
+    request_mix = load.parse_mix(mix)
+    universe = [item.strip().upper() for item in symbols.split(",") if item.strip()]
+    rates = [float(item) for item in saturate.split(",")] if saturate else [rate]
+
+    def run_steps(base_url: str) -> list[load.LoadResult]:
+        steps = []
+        for step_rate in rates:
+            run = load.run_load(base_url, step_rate, duration, request_mix, universe)
+            result = asyncio.run(run)
+            steps.append(result)
+            typer.echo(
+                f"rate {step_rate:,.0f}/s: {result.throughput:,.1f} req/s, "
+                f"errors {result.error_rate:.2%}, p50 {result.p50_ms:.1f}ms "
+                f"p99 {result.p99_ms:.1f}ms p999 {result.p999_ms:.1f}ms",
+                err=True,
+            )
+            for stats in result.endpoints.values():
+                typer.echo(
+                    f"  {stats.name:<8} n={stats.requests} err={stats.error_rate:.2%} "
+                    f"p50={stats.p50_ms:.1f}ms p99={stats.p99_ms:.1f}ms p999={stats.p999_ms:.1f}ms",
+                    err=True,
+                )
+        return steps
+
+    if url:
+        steps = run_steps(url)
+    else:
+        with load.LocalServer(workers=workers) as server:
+            steps = run_steps(server.url)
+
+    knee = load.find_knee(steps) if saturate else None
+    if knee is not None:
+        typer.echo(f"knee: {knee:,.0f} req/s", err=True)
+    # Gate on the heaviest step that was still sustained (the knee), else the last one.
+    gated = next((step for step in steps if step.target_rate == knee), steps[-1])
+    results = load.to_bench_results(gated, knee)
+    payload = bench_suite.results_to_json(results)
+    payload["steps"] = [
+        {**asdict(step), "error_rate": step.error_rate} for step in steps
+    ]
+    _report_and_gate(results, payload, output, baseline, tolerance, save_baseline)
+
+
+@app.command()
+def profile(
+    symbol: str = typer.Option("AAPL"),
+    steps: int = typer.Option(200, help="Orchestrator steps (or backtest bars) to run."),
+    use_backtest: bool = typer.Option(
+        False, "--backtest", help="Profile run_backtest instead of bare steps."
+    ),
+    output: Path = typer.Option(Path("profile.collapsed"), help="Collapsed-stack output path."),
+    interval_ms: float = typer.Option(1.0, help="Sampling interval in milliseconds."),
+):
+    """Profile N orchestrator steps or a backtest and write collapsed stacks for flamegraphs."""
+    orchestrator = build_orchestrator()
+    start_ts = datetime(2024, 1, 2, 14, 30)
+    with StackSampler(interval=interval_ms / 1e3) as sampler:
+        began = time.perf_counter()
+        if use_backtest:
+            end_ts = start_ts + timedelta(minutes=steps - 1)
+            run_backtest(orchestrator, symbol=symbol, start=start_ts, end=end_ts, step_seconds=60)
+        else:
+            for _ in range(steps):
+                orchestrator.step(symbol=symbol)
+        elapsed = time.perf_counter() - began
+    sampler.write(output)
+    typer.echo(
+        f"Profiled {steps} {'backtest bars' if use_backtest else 'steps'} in {elapsed:.2f}s "
+        f"({sampler.samples} samples, {len(sampler.counts)} unique stacks) -> {output}"
+    )
 
 
 def main():
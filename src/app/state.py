@@ -0,0 +1,97 @@
+"""Cross-process API state shared by every uvicorn worker.
+
+Latest decisions, per-symbol telemetry snapshots and the metrics map are kept
+in a local SQLite database in WAL mode: readers never block on (or wait for)
+the writer, and each worker sees the most recent committed state regardless of
+which process produced it. Payloads are stored as validated JSON so reads can
+be returned to clients without re-serialising.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.schemas import JudgeDecision, TelemetrySnapshot
+
+
+class SharedStateStore:
+    def __init__(self, database_url: str):
+        self.path = database_url.replace("sqlite:///", "")
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS latest_decisions ("
+            "symbol TEXT PRIMARY KEY, payload TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "symbol TEXT PRIMARY KEY, payload TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS metrics (name TEXT PRIMARY KEY, value REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5.0)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def publish(
+        self,
+        decision: JudgeDecision,
+        snapshot: TelemetrySnapshot | None = None,
+        metrics: dict[str, float] | None = None,
+    ) -> None:
+        """Atomically publish a decision with the telemetry it produced."""
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO latest_decisions (symbol, payload, updated) "
+                "VALUES (?, ?, ?)",
+                (decision.symbol, decision.model_dump_json(), now),
+            )
+            if snapshot is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots (symbol, payload, updated) VALUES (?, ?, ?)",
+                    (snapshot.symbol, snapshot.model_dump_json(), now),
+                )
+            if metrics:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO metrics (name, value) VALUES (?, ?)",
+                    list(metrics.items()),
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _payload(self, table: str, symbol: str) -> str | None:
+        query = f"SELECT payload FROM {table} WHERE symbol = ?"
+        row = self._conn().execute(query, (symbol,)).fetchone()
+        return row[0] if row else None
+
+    def latest_decision_json(self, symbol: str) -> str | None:
+        return self._payload("latest_decisions", symbol)
+
+    def latest_decision(self, symbol: str) -> JudgeDecision | None:
+        payload = self.latest_decision_json(symbol)
+        return JudgeDecision.model_validate_json(payload) if payload else None
+
+    def snapshot_json(self, symbol: str) -> str | None:
+        return self._payload("snapshots", symbol)
+
+    def metrics(self) -> dict[str, float]:
+        return dict(self._conn().execute("SELECT name, value FROM metrics").fetchall())
@@ -3,15 +3,18 @@ from __future__ import annotations
 import sqlite3
 import time
 from collections import deque
-from datetime import datetime, timezone
+from collections.abc import Mapping
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Deque
 
 import numpy as np
 import structlog
 
 from app.config import settings
-from app.schemas import ExecutionFill, JudgeDecision, TelemetrySnapshot
+from app.records import DecisionRecord, FillRecord
+from app.retention import TieredSeries
+from app.schemas import TelemetrySnapshot
+from app.utils.time_windows import from_epoch_ns, to_epoch_ns
 
 LOG = structlog.get_logger("market_mind")
 
@@ -24,16 +27,43 @@ structlog.configure(
 )
 
 
-class TelemetryStore:
-    """Tracks decisions, fills, and derived metrics."""
+PRUNE_EVERY = 1_000
+
+
+def default_series() -> TieredSeries:
+    return TieredSeries(
+        raw_retention=timedelta(seconds=settings.telemetry_raw_retention_seconds),
+        rollup_retention={
+            "1m": timedelta(hours=settings.telemetry_minute_retention_hours),
+            "1h": timedelta(days=settings.telemetry_hour_retention_days),
+            "1d": timedelta(days=settings.telemetry_day_retention_days),
+        },
+    )
 
-    def __init__(self, database_url: str):
+
+class TelemetryStore:
+    """Tracks decisions, fills, and derived metrics.
+
+    ``pnl_history`` holds the recent window used for Sharpe and drawdown; the full
+    history is kept at decreasing resolution in ``series``. Fills older than
+    ``fill_retention_days`` are pruned from SQLite every ``PRUNE_EVERY`` inserts.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        series: TieredSeries | None = None,
+        fill_retention_days: int = settings.fill_retention_days,
+    ):
         self.database_url = database_url.replace("sqlite:///", "")
         Path(self.database_url).parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
-        self.pnl_history: Deque[float] = deque(maxlen=512)
-        self.timestamps: Deque[datetime] = deque(maxlen=512)
-        self.decisions: Deque[JudgeDecision] = deque(maxlen=32)
+        self.pnl_history: deque[float] = deque(maxlen=512)
+        self.timestamps: deque[datetime] = deque(maxlen=512)
+        self.decisions: deque[DecisionRecord] = deque(maxlen=32)
+        self.series = series or default_series()
+        self.fill_retention_days = fill_retention_days
+        self._inserts_since_prune = 0
 
     def _init_db(self) -> None:
         with sqlite3.connect(self.database_url) as conn:
@@ -51,13 +81,15 @@ class TelemetryStore:
                 )
                 """
             )
+            conn.execute("CREATE INDEX IF NOT EXISTS fills_ts ON fills (ts)")
             conn.commit()
 
-    def record_decision(self, decision: JudgeDecision) -> None:
+    def record_decision(self, decision: DecisionRecord) -> None:
         LOG.info("decision", symbol=decision.symbol, action=decision.action, size=decision.size)
         self.decisions.append(decision)
+        self.series.add_decision(decision.timestamp)
 
-    def record_fill(self, fill: ExecutionFill, pnl_delta: float) -> None:
+    def record_fill(self, fill: FillRecord, pnl_delta: float) -> None:
         LOG.info(
             "fill",
             symbol=fill.symbol,
@@ -81,13 +113,49 @@ class TelemetryStore:
                     fill.latency_ms,
                 ),
             )
+            self._inserts_since_prune += 1
+            if self.fill_retention_days > 0 and self._inserts_since_prune >= PRUNE_EVERY:
+                self.prune_fills(conn, now=fill.timestamp)
             conn.commit()
-        self._update_pnl(fill.timestamp, pnl_delta)
-
-    def _update_pnl(self, timestamp: datetime, pnl_delta: float) -> None:
+        self._update_pnl(fill.timestamp, pnl_delta, fill.latency_ms)
+
+    def prune_fills(
+        self, conn: sqlite3.Connection | None = None, now: datetime | None = None
+    ) -> int:
+        """Delete fills older than the retention window; returns the number removed."""
+        self._inserts_since_prune = 0
+        now = now or datetime.now(tz=UTC)
+        cutoff = (now - timedelta(days=self.fill_retention_days)).isoformat()
+        if conn is None:
+            with sqlite3.connect(self.database_url) as own:
+                removed = own.execute("DELETE FROM fills WHERE ts < ?", (cutoff,)).rowcount
+                own.commit()
+            return removed
+        return conn.execute("DELETE FROM fills WHERE ts < ?", (cutoff,)).rowcount
+
+    def _update_pnl(self, timestamp: datetime, pnl_delta: float, latency_ms: float = 0.0) -> None:
         cumulative = (self.pnl_history[-1] if self.pnl_history else 0.0) + pnl_delta
         self.pnl_history.append(cumulative)
         self.timestamps.append(timestamp)
+        self.series.add_pnl(timestamp, cumulative, latency_ms)
+
+    def export_state(self) -> dict[str, np.ndarray]:
+        """PnL window and tiered series; fills already live in SQLite."""
+        state = {
+            "pnl_history": np.array(self.pnl_history, dtype=float),
+            "timestamps": np.array([to_epoch_ns(ts) for ts in self.timestamps], dtype=np.int64),
+        }
+        state.update({f"series_{key}": value for key, value in self.series.export_state().items()})
+        return state
+
+    def restore_state(self, state: Mapping[str, np.ndarray]) -> None:
+        self.pnl_history.clear()
+        self.pnl_history.extend(state["pnl_history"].tolist())
+        self.timestamps.clear()
+        self.timestamps.extend(from_epoch_ns(ts) for ts in state["timestamps"].tolist())
+        self.series.restore_state(
+            {key[7:]: value for key, value in state.items() if key.startswith("series_")}
+        )
 
     def compute_sharpe(self) -> float:
         if len(self.pnl_history) < 5:
@@ -107,7 +175,7 @@ class TelemetryStore:
 
     def latest_snapshot(self, symbol: str) -> TelemetrySnapshot:
         decision = self.decisions[-1] if self.decisions else None
-        ts = datetime.now(tz=timezone.utc)
+        ts = datetime.now(tz=UTC)
         pnl = self.pnl_history[-1] if self.pnl_history else 0.0
         return TelemetrySnapshot(
             timestamp=ts,
@@ -115,7 +183,7 @@ class TelemetryStore:
             pnl=pnl,
             sharpe_30d=self.compute_sharpe(),
             max_drawdown=self.compute_drawdown(),
-            decision=decision,
+            decision=decision.to_model() if decision is not None else None,
         )
 
     def export_metrics(self) -> dict[str, float]:
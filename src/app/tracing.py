@@ -0,0 +1,104 @@
+"""Opt-in nested span tracing with a bounded in-memory ring buffer."""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from app.config import settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_NOOP = nullcontext()
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    start_ns: int
+    duration_ns: int = 0
+    children: list[Span] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ns / 1e6,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class _SpanScope:
+    __slots__ = ("tracer", "span")
+
+    def __init__(self, tracer: Tracer, name: str):
+        self.tracer = tracer
+        self.span = Span(name=name, start_ns=time.perf_counter_ns())
+
+    def __enter__(self) -> Span:
+        self.tracer._stack().append(self.span)
+        return self.span
+
+    def __exit__(self, *exc: object) -> None:
+        span = self.span
+        span.duration_ns = time.perf_counter_ns() - span.start_ns
+        stack = self.tracer._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            self.tracer._traces.append(span)
+
+
+class Tracer:
+    """Records nested spans per thread; completed root spans land in a ring buffer."""
+
+    def __init__(self, enabled: bool = False, capacity: int = 256):
+        self.enabled = enabled
+        self._traces: deque[Span] = deque(maxlen=capacity)
+        self._local = threading.local()
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str) -> AbstractContextManager[Any]:
+        if not self.enabled:
+            return _NOOP
+        return _SpanScope(self, name)
+
+    def recent(self, limit: int | None = None) -> list[dict[str, Any]]:
+        traces = list(self._traces)
+        if limit is not None:
+            traces = traces[-limit:]
+        return [span.to_dict() for span in traces]
+
+    def clear(self) -> None:
+        self._traces.clear()
+
+
+tracer = Tracer(enabled=settings.trace_enabled, capacity=settings.trace_buffer_size)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator that wraps a call in a span when tracing is enabled."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _SpanScope(tracer, name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta, timezone
+from datetime import UTC, datetime, time, timedelta
 
 import pandas as pd
 from dateutil import tz
@@ -22,8 +22,41 @@ def rolling_window(series: pd.Series, window: int) -> pd.Series:
     return series.rolling(window=window, min_periods=1).mean()
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def to_epoch_ns(timestamp: datetime) -> int:
+    """Exact (microsecond-resolution) nanoseconds since the Unix epoch."""
+    return (timestamp - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def from_epoch_ns(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value // 1000)
+
+
 def floor_to_interval(timestamp: datetime, seconds: int) -> datetime:
-    epoch = datetime.fromtimestamp(0, tz=timezone.utc)
+    epoch = datetime.fromtimestamp(0, tz=UTC)
     delta = timestamp - epoch
     floored = int(delta.total_seconds() // seconds) * seconds
     return epoch + timedelta(seconds=floored)
+
+
+def trading_minutes(start: datetime, count: int) -> list[datetime]:
+    """``count`` consecutive regular-session minute timestamps (UTC) at or after ``start``.
+
+    Weekends are skipped; exchange holidays are not modelled.
+    """
+    eastern = tz.gettz(settings.timezone_et)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=UTC)
+    day = start.astimezone(eastern).date()
+    stamps: list[datetime] = []
+    while len(stamps) < count:
+        if day.weekday() < 5:
+            session_open = datetime.combine(day, time(hour=9, minute=30), tzinfo=eastern)
+            for minute in range(390):
+                ts = (session_open + timedelta(minutes=minute)).astimezone(UTC)
+                if ts >= start:
+                    stamps.append(ts)
+        day += timedelta(days=1)
+    return stamps[:count]
@@ -1,21 +1,181 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import List
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
 
-from app.schemas import ExecutionFill, JudgeDecision
+import numpy as np
+import pandas as pd
+
+from app.records import ACTION_CODES, ACTIONS, DecisionRecord, FillRecord
+from app.utils.time_windows import from_epoch_ns, to_epoch_ns
+from pipelines.columnar import ColumnStore, StringPool
 from pipelines.orchestrator import MarketMindOrchestrator
 
+try:  # pragma: no cover - exercised only when dependency available
+    import pyarrow  # type: ignore  # noqa: F401
+except ImportError:  # pragma: no cover - parquet export is optional
+    pyarrow = None  # type: ignore
+
+DECISION_SCHEMA = {
+    "timestamp": "int64",
+    "symbol": "int32",
+    "action": "int8",
+    "size": "float64",
+    "confidence": "float64",
+}
+FILL_SCHEMA = {
+    "timestamp": "int64",
+    "symbol": "int32",
+    "action": "int8",
+    "price": "float64",
+    "size": "float64",
+    "slippage_bps": "float64",
+    "latency_ms": "float64",
+}
+
+
+def _epoch_ns(timestamp: datetime) -> int:
+    # Naive timestamps are taken as UTC; records come back timezone-aware.
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return to_epoch_ns(timestamp)
+
 
-@dataclass
 class BacktestResult:
-    decisions: List[JudgeDecision]
-    fills: List[ExecutionFill]
+    """Columnar decisions and fills from a backtest.
+
+    Actions are stored as ``ACTION_CODES``, symbols and rationale/guardrail
+    strings are interned in one ``StringPool``, and numeric fields live in typed
+    arrays (about 45 bytes per decision). ``spill_dir`` writes every sealed chunk
+    of ``chunk_size`` rows to ``.npz`` so long multi-symbol runs keep a bounded
+    footprint; ``close()`` deletes them. ``decisions`` and ``fills`` rebuild
+    records on access.
+    """
+
+    def __init__(self, chunk_size: int = 65_536, spill_dir: Path | None = None) -> None:
+        self.pool = StringPool()
+        spill = Path(spill_dir) if spill_dir is not None else None
+        self._decisions = ColumnStore(
+            DECISION_SCHEMA,
+            ("rationale", "guardrails"),
+            self.pool,
+            chunk_size,
+            spill,
+            name="decisions",
+        )
+        self._fills = ColumnStore(FILL_SCHEMA, (), self.pool, chunk_size, spill, name="fills")
+
+    def add_decision(self, decision: DecisionRecord) -> None:
+        self._decisions.append(
+            (
+                _epoch_ns(decision.timestamp),
+                self.pool.code(decision.symbol),
+                ACTION_CODES[decision.action],
+                decision.size,
+                decision.confidence,
+            ),
+            (decision.rationale, decision.guardrails_applied),
+        )
+
+    def add_fill(self, fill: FillRecord) -> None:
+        self._fills.append(
+            (
+                _epoch_ns(fill.timestamp),
+                self.pool.code(fill.symbol),
+                ACTION_CODES[fill.action],
+                fill.price,
+                fill.size,
+                fill.slippage_bps,
+                fill.latency_ms,
+            )
+        )
 
     @property
     def trades(self) -> int:
-        return len(self.fills)
+        return len(self._fills)
+
+    def close(self) -> None:
+        self._decisions.close()
+        self._fills.close()
+
+    def __len__(self) -> int:
+        return len(self._decisions)
+
+    def nbytes(self) -> int:
+        return self._decisions.nbytes() + self._fills.nbytes() + self.pool.nbytes()
+
+    def decision_columns(self) -> dict[str, np.ndarray]:
+        return self._decisions.columns()
+
+    def fill_columns(self) -> dict[str, np.ndarray]:
+        return self._fills.columns()
+
+    @property
+    def decisions(self) -> list[DecisionRecord]:
+        columns = self.decision_columns()
+        strings = self.pool.strings
+        return [
+            DecisionRecord(
+                from_epoch_ns(ts),
+                strings[symbol],
+                ACTIONS[action],
+                size,
+                confidence,
+                rationale,
+                guardrails,
+            )
+            for ts, symbol, action, size, confidence, rationale, guardrails in zip(
+                columns["timestamp"].tolist(),
+                columns["symbol"].tolist(),
+                columns["action"].tolist(),
+                columns["size"].tolist(),
+                columns["confidence"].tolist(),
+                self._decisions.lists(columns, "rationale"),
+                self._decisions.lists(columns, "guardrails"),
+                strict=True,
+            )
+        ]
+
+    @property
+    def fills(self) -> list[FillRecord]:
+        columns = self.fill_columns()
+        strings = self.pool.strings
+        return [
+            FillRecord(
+                from_epoch_ns(ts), strings[symbol], ACTIONS[action], price, size, slippage, latency
+            )
+            for ts, symbol, action, price, size, slippage, latency in zip(
+                *(columns[name].tolist() for name in FILL_SCHEMA), strict=True
+            )
+        ]
+
+    def to_npz(self, path: Path) -> None:
+        """Write every column plus the string pool to one compressed ``.npz``."""
+        arrays = {f"decisions.{name}": values for name, values in self.decision_columns().items()}
+        arrays.update({f"fills.{name}": values for name, values in self.fill_columns().items()})
+        arrays["strings"] = np.array(self.pool.strings, dtype=str)
+        arrays["actions"] = np.array(ACTIONS, dtype=str)
+        np.savez_compressed(path, **arrays)
+
+    def to_frame(self, kind: str = "decisions") -> pd.DataFrame:
+        """Decode ``"decisions"`` or ``"fills"`` to a DataFrame with categorical symbols/actions."""
+        if kind not in ("decisions", "fills"):
+            raise ValueError(f"kind must be 'decisions' or 'fills', got {kind!r}")
+        store = self._decisions if kind == "decisions" else self._fills
+        columns = store.columns()
+        strings = np.array(self.pool.strings, dtype=object)
+        frame = pd.DataFrame({name: columns[name] for name in store.schema})
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], unit="ns", utc=True)
+        frame["symbol"] = pd.Categorical(strings[columns["symbol"]] if len(frame) else [])
+        frame["action"] = pd.Categorical.from_codes(columns["action"], categories=list(ACTIONS))
+        for column in store.list_columns:
+            frame[column] = ["; ".join(items) for items in store.lists(columns, column)]
+        return frame
+
+    def to_parquet(self, path: Path, kind: str = "decisions") -> None:
+        if pyarrow is None:
+            raise RuntimeError("Parquet export requires pyarrow; install the 'parquet' extra")
+        self.to_frame(kind).to_parquet(path, index=False)
 
 
 def run_backtest(
@@ -24,14 +184,32 @@ def run_backtest(
     start: datetime,
     end: datetime,
     step_seconds: int = 60,
+    spill_dir: Path | None = None,
 ) -> BacktestResult:
-    decisions: List[JudgeDecision] = []
-    fills: List[ExecutionFill] = []
-    cursor = start
-    while cursor <= end:
-        decision, fill = orchestrator.step(symbol=symbol)
-        decisions.append(decision)
-        if fill:
-            fills.append(fill)
-        cursor = cursor + timedelta(seconds=step_seconds)
-    return BacktestResult(decisions=decisions, fills=fills)
+    """Step the orchestrator once per ``step_seconds`` from ``start`` to ``end``.
+
+    A market data provider with a settable clock (``as_of``, e.g.
+    ``MockMarketDataProvider``) is pinned to the cursor at every step, so each
+    step sees the bars up to that time; the clock is restored afterwards.
+    """
+    result = BacktestResult(spill_dir=spill_dir)
+    provider = orchestrator.factual_agent.provider
+    clocked = hasattr(provider, "as_of")
+    previous = provider.as_of if clocked else None
+    cursor = start if start.tzinfo else start.replace(tzinfo=UTC)
+    end = end if end.tzinfo else end.replace(tzinfo=UTC)
+    try:
+        while cursor <= end:
+            if clocked:
+                provider.as_of = cursor
+            decision, fill = orchestrator.step(symbol=symbol)
+            result.add_decision(decision)
+            if fill:
+                result.add_fill(fill)
+            cursor = cursor + timedelta(seconds=step_seconds)
+    finally:
+        if clocked:
+            provider.as_of = previous
+    if orchestrator.events is not None:
+        orchestrator.events.flush()
+    return result
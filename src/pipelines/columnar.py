@@ -0,0 +1,173 @@
+"""Append-only columnar storage with string interning and chunked spill-to-disk."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import weakref
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+
+import numpy as np
+
+
+class StringPool:
+    """Interns strings to dense integer codes shared by every chunk of a store."""
+
+    def __init__(self, strings: Sequence[str] = ()) -> None:
+        self.strings: list[str] = []
+        self._codes: dict[str, int] = {}
+        for value in strings:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def nbytes(self) -> int:
+        return sum(len(value) for value in self.strings)
+
+
+# dtype -> array.array typecode for the active (growing) chunk.
+_TYPECODES = {"int8": "b", "uint8": "B", "int32": "i", "uint32": "I", "int64": "q", "float64": "d"}
+
+
+class ColumnStore:
+    """Typed columns plus variable-length string-list columns, sealed every ``chunk_size`` rows.
+
+    Scalar columns are declared in ``schema`` as ``name -> dtype``. Each list
+    column stores per-row lengths (``<name>_len``, uint32) and a flat array of
+    pooled string codes (``<name>_codes``). Sealed chunks stay in memory as NumPy
+    arrays or, with ``spill_dir``, are written to ``.npz`` files and reloaded on
+    demand, so resident memory is bounded by one chunk plus the string pool.
+
+    Each store spills into its own temporary directory under ``spill_dir``, so
+    stores may share one; it is removed by ``close()`` or when the store is
+    garbage collected.
+    """
+
+    def __init__(
+        self,
+        schema: Mapping[str, str],
+        list_columns: Sequence[str] = (),
+        pool: StringPool | None = None,
+        chunk_size: int = 65_536,
+        spill_dir: Path | None = None,
+        name: str = "rows",
+    ) -> None:
+        self.schema = dict(schema)
+        self.list_columns = tuple(list_columns)
+        self.pool = pool or StringPool()
+        self.chunk_size = chunk_size
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.name = name
+        self._chunks: list[dict[str, np.ndarray] | Path] = []
+        self._spill_path: Path | None = None
+        self._cleanup: weakref.finalize | None = None
+        self._sealed_rows = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._active = {column: array(_TYPECODES[dtype]) for column, dtype in self.schema.items()}
+        for column in self.list_columns:
+            self._active[f"{column}_len"] = array("I")
+            self._active[f"{column}_codes"] = array("i")
+        self._rows = 0
+
+    def append(self, values: Sequence[float | int], lists: Sequence[Sequence[str]] = ()) -> None:
+        """Append one row: ``values`` in ``schema`` order, ``lists`` in ``list_columns`` order."""
+        for column, value in zip(self.schema, values, strict=True):
+            self._active[column].append(value)
+        code = self.pool.code
+        for column, items in zip(self.list_columns, lists, strict=True):
+            self._active[f"{column}_len"].append(len(items))
+            self._active[f"{column}_codes"].extend(code(item) for item in items)
+        self._rows += 1
+        if self._rows >= self.chunk_size:
+            self.seal()
+
+    def seal(self) -> None:
+        """Freeze the active rows into a chunk (spilled to disk when ``spill_dir`` is set)."""
+        if not self._rows:
+            return
+        chunk = self._active_arrays()
+        if self.spill_dir is not None:
+            path = self._spill_root() / f"{len(self._chunks):05d}.npz"
+            np.savez(path, **chunk)
+            self._chunks.append(path)
+        else:
+            self._chunks.append(chunk)
+        self._sealed_rows += self._rows
+        self._reset()
+
+    def _spill_root(self) -> Path:
+        if self._spill_path is None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._spill_path = Path(tempfile.mkdtemp(prefix=f"{self.name}-", dir=self.spill_dir))
+            self._cleanup = weakref.finalize(
+                self, shutil.rmtree, self._spill_path, ignore_errors=True
+            )
+        return self._spill_path
+
+    def close(self) -> None:
+        """Delete spilled chunks; the store must not be read afterwards."""
+        if self._cleanup is not None:
+            self._cleanup()
+
+    def __len__(self) -> int:
+        return self._sealed_rows + self._rows
+
+    def chunks(self) -> Iterator[dict[str, np.ndarray]]:
+        for chunk in self._chunks:
+            if isinstance(chunk, Path):
+                with np.load(chunk) as stored:
+                    yield {column: stored[column] for column in stored.files}
+            else:
+                yield chunk
+        if self._rows:
+            yield self._active_arrays()
+
+    def _active_arrays(self) -> dict[str, np.ndarray]:
+        # Copy so no NumPy view pins the growable buffers.
+        return {
+            column: np.frombuffer(values, dtype=values.typecode).copy()
+            for column, values in self._active.items()
+        }
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Every row concatenated across chunks; ``*_codes`` index into ``pool.strings``."""
+        chunks = list(self.chunks())
+        columns = {}
+        for column in self._active:
+            parts = [chunk[column] for chunk in chunks]
+            columns[column] = (
+                np.concatenate(parts) if parts else np.empty(0, dtype=self._active[column].typecode)
+            )
+        return columns
+
+    def lists(self, columns: Mapping[str, np.ndarray], column: str) -> list[list[str]]:
+        """Rebuild the string lists of ``column`` from concatenated columns."""
+        strings = self.pool.strings
+        codes = columns[f"{column}_codes"].tolist()
+        lists, start = [], 0
+        for length in columns[f"{column}_len"].tolist():
+            lists.append([strings[code] for code in codes[start : start + length]])
+            start += length
+        return lists
+
+    def nbytes(self) -> int:
+        """Resident bytes held by in-memory chunks and the active chunk (excluding the pool)."""
+        resident = sum(
+            array_.nbytes
+            for chunk in self._chunks
+            if not isinstance(chunk, Path)
+            for array_ in chunk.values()
+        )
+        return resident + sum(values.itemsize * len(values) for values in self._active.values())
@@ -0,0 +1,307 @@
+"""Monte Carlo robustness runs over many independent seeded market paths.
+
+Each path gets its own ``SyntheticMarket`` (so its volatility regime, jumps and
+price level are independent of every other path) plus persistent sentiment
+signals: AR(1) processes with the same spread as ``MockNewsProvider``'s draws
+and occasional headlines scored like ``RuleBasedSentiment`` (the sign of the
+prevailing news tone). Paths are processed in chunks laid out as
+``[paths, bars]`` arrays:
+
+* factual features come from rolling window sums and match ``FeatureStore``;
+* ``JudgeAgent.decide_batch`` scores every bar of every path in one call;
+* ``simulation.simulate_paths`` steps guardrails and ledger accounting through
+  time once, vectorized across paths, as ``walk_forward`` does for its folds.
+
+Every path draws from streams derived from ``(seed, path)``, so results do not
+depend on the chunk size or the number of worker processes.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+import numpy as np
+from scipy.signal import lfilter
+
+from agents.judge_agent import FACTUAL_COLUMNS, JudgeAgent
+from app.config import settings
+from app.utils.time_windows import is_regular_trading_hours, trading_minutes
+from pipelines.simulation import GUARDRAILS, risk_limits, simulate_paths
+from pipelines.walk_forward import JUDGE_PARAMS
+from services.feature_store import FeatureStore
+from services.risk import RiskManager
+from services.synthetic import SyntheticMarket
+
+METRICS = ("pnl", "sharpe", "max_drawdown", "trades", "blocked", "attempts")
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+BARS_PER_DAY = 390
+
+# Bounds of MockNewsProvider's uniform draws (news_sentiment, social_velocity_z,
+# search_trend_z) and the matching standard deviations.
+_SIGNAL_BOUNDS = np.array([1.0, 1.5, 1.0])
+_SIGNAL_SCALE = _SIGNAL_BOUNDS / np.sqrt(3.0)
+
+
+@dataclass(frozen=True)
+class SentimentModel:
+    """Per-bar dynamics of the simulated subjective signals."""
+
+    persistence: float = 0.99
+    headline_rate: float = 0.02
+
+    def __post_init__(self) -> None:
+        if not 0.0 <= self.persistence < 1.0:
+            raise ValueError("persistence must be within [0, 1)")
+        if not 0.0 <= self.headline_rate <= 1.0:
+            raise ValueError("headline_rate must be within [0, 1]")
+
+
+def path_seed(seed: int, path: int) -> int:
+    """Seed of path ``path``; independent of how paths are grouped into chunks."""
+    return int(np.random.SeedSequence([seed, path]).generate_state(1, np.uint64)[0])
+
+
+@dataclass
+class PathInputs:
+    """Judge inputs for a block of paths; arrays are ``[paths, bars]`` plus any column axis."""
+
+    close: np.ndarray
+    features: np.ndarray
+    signals: np.ndarray
+    sizing_vol: np.ndarray
+
+
+def warmup_bars() -> int:
+    return FeatureStore().min_history(FACTUAL_COLUMNS)
+
+
+def rolling_features(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """``FACTUAL_COLUMNS`` for every full window of ``[paths, bars]`` OHLCV columns.
+
+    Row ``j`` of the result describes the window ending at bar ``j + warmup_bars() - 1``.
+    """
+    history = warmup_bars()
+    ends = np.arange(history - 1, close.shape[-1])
+
+    def window_sum(values: np.ndarray, stop: np.ndarray, width: int) -> np.ndarray:
+        # values[..., k] is summed for stop - width <= k < stop.
+        total = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,))
+        np.cumsum(values, axis=-1, out=total[..., 1:])
+        return total[..., stop] - total[..., stop - width]
+
+    delta = np.diff(close, axis=-1)
+    gain = window_sum(np.clip(delta, 0, None), ends, 14) / 14
+    loss = -window_sum(np.clip(delta, None, 0), ends, 14) / 14
+    falling = window_sum((delta < 0).astype(float), ends, 14)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(falling > 0, 100 - 100 / (1 + gain / loss), np.nan)
+
+    momentum = close[..., ends] / close[..., ends - 20] - 1
+
+    returns = close[..., 1:] / close[..., :-1] - 1
+    mean = window_sum(returns, ends, 20) / 20
+    variance = (window_sum(returns**2, ends, 20) - 20 * mean**2) / 19
+    vol = np.sqrt(np.maximum(variance, 0.0))
+
+    volume_mean = window_sum(volume, ends + 1, 20) / 20
+    volume_var = (window_sum(volume**2, ends + 1, 20) - 20 * volume_mean**2) / 19
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_z = np.where(
+            volume_var > 0, (volume[..., ends] - volume_mean) / np.sqrt(volume_var), np.nan
+        )
+
+    return np.stack([rsi, momentum, vol, volume_z], axis=-1)
+
+
+def simulate_signals(
+    paths: Sequence[int], bars: int, seed: int, model: SentimentModel
+) -> np.ndarray:
+    """``SUBJECTIVE_COLUMNS`` for each path, shape ``[paths, bars, 4]``."""
+    shocks = np.empty((len(paths), bars, 3))
+    arrivals = np.empty((len(paths), bars))
+    for row, path in enumerate(paths):
+        rng = np.random.default_rng(np.random.SeedSequence([seed, path, 1]))
+        shocks[row] = rng.standard_normal((bars, 3))
+        arrivals[row] = rng.random(bars)
+    phi = model.persistence
+    innovation = np.sqrt(1 - phi**2)
+    shocks[:, 0] /= innovation  # start each process from its stationary distribution
+    tone = lfilter([innovation], [1.0, -phi], shocks, axis=1) * _SIGNAL_SCALE
+    tone = np.clip(tone, -_SIGNAL_BOUNDS, _SIGNAL_BOUNDS)
+    headline = np.where(arrivals < model.headline_rate, np.sign(tone[..., 0]), 0.0)
+    return np.stack([tone[..., 0], tone[..., 1], headline, tone[..., 2]], axis=-1)
+
+
+def generate_paths(
+    paths: Sequence[int],
+    bars: int,
+    seed: int = 7,
+    market_params: dict | None = None,
+    sentiment: SentimentModel | None = None,
+) -> PathInputs:
+    """Prices, features and signals for ``bars`` decision bars per path (after the warm-up)."""
+    market_params = market_params or {}
+    sentiment = sentiment or SentimentModel()
+    total = bars + warmup_bars() - 1
+    close = np.empty((len(paths), total))
+    volume = np.empty((len(paths), total))
+    for row, path in enumerate(paths):
+        block = SyntheticMarket(["MC"], seed=path_seed(seed, path), **market_params).advance(total)
+        close[row], volume[row] = block.close[0], block.volume[0]
+    features = rolling_features(close, volume)
+    return PathInputs(
+        close=close[:, total - bars :],
+        features=features,
+        signals=simulate_signals(paths, bars, seed, sentiment),
+        sizing_vol=features[..., FACTUAL_COLUMNS.index("rolling_vol_20d")],
+    )
+
+
+def path_metrics(equity: np.ndarray) -> dict[str, np.ndarray]:
+    """Per-path ``walk_forward.equity_metrics`` (PnL, Sharpe, drawdown) of ``[paths, bars]``."""
+    metrics = {
+        "pnl": equity[:, -1].copy(),
+        "max_drawdown": (equity - np.maximum.accumulate(equity, axis=1)).min(axis=1),
+        "sharpe": np.zeros(len(equity)),
+    }
+    if equity.shape[1] >= 5:
+        returns = np.diff(equity, axis=1)
+        std = returns.std(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics["sharpe"] = np.where(std > 0, np.sqrt(252) * returns.mean(axis=1) / std, 0.0)
+    return metrics
+
+
+@dataclass
+class MonteCarloResult:
+    """Per-path metrics (``METRICS`` plus a count per guardrail), in path order."""
+
+    paths: dict[str, np.ndarray]
+    bars: int
+    seed: int
+    percentiles: tuple[float, ...] = field(default=DEFAULT_PERCENTILES)
+
+    def __len__(self) -> int:
+        return len(self.paths["pnl"])
+
+    def guardrail_rates(self) -> dict[str, np.ndarray]:
+        """Fraction of each path's attempted trades that each guardrail blocked."""
+        attempts = np.maximum(self.paths["attempts"], 1)
+        return {name: self.paths[name] / attempts for name in GUARDRAILS}
+
+    def distribution(self, values: np.ndarray) -> dict[str, float]:
+        stats = {"mean": float(values.mean()), "std": float(values.std())}
+        for pct, value in zip(
+            self.percentiles, np.percentile(values, self.percentiles), strict=True
+        ):
+            stats[f"p{pct:g}"] = float(value)
+        return stats
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        summary = {
+            name: self.distribution(self.paths[name])
+            for name in ("pnl", "sharpe", "max_drawdown", "trades")
+        }
+        summary.update(
+            {
+                f"{name}_rate": self.distribution(rate)
+                for name, rate in self.guardrail_rates().items()
+            }
+        )
+        summary["pnl"]["prob_loss"] = float((self.paths["pnl"] < 0).mean())
+        return summary
+
+
+@dataclass
+class _ChunkTask:
+    paths: range
+    bars: int
+    seed: int
+    tradable: np.ndarray
+    market_params: dict
+    sentiment: SentimentModel
+    judge_params: dict
+    max_position: float
+    max_daily_loss: float
+    slippage_bps: float
+
+
+def _run_chunk(task: _ChunkTask) -> dict[str, np.ndarray]:
+    inputs = generate_paths(task.paths, task.bars, task.seed, task.market_params, task.sentiment)
+    judge = JudgeAgent(**task.judge_params)
+    batch = judge.decide_batch(inputs.features, inputs.signals, inputs.sizing_vol)
+    outcome = simulate_paths(
+        inputs.close,
+        batch.action,
+        batch.size,
+        task.tradable,
+        task.max_position,
+        task.max_daily_loss,
+        task.slippage_bps,
+    )
+    metrics = path_metrics(outcome.equity)
+    metrics.update(
+        trades=outcome.trades,
+        blocked=outcome.blocked,
+        attempts=outcome.attempts,
+        **outcome.guardrails,
+    )
+    return metrics
+
+
+def run_monte_carlo(
+    n_paths: int,
+    bars: int = 21 * BARS_PER_DAY,
+    judge_agent: JudgeAgent | None = None,
+    risk_manager: RiskManager | None = None,
+    seed: int = 7,
+    start: datetime | None = None,
+    market_params: dict | None = None,
+    sentiment: SentimentModel | None = None,
+    slippage_bps: float = settings.slippage_bps,
+    chunk_size: int = 256,
+    workers: int = 1,
+) -> MonteCarloResult:
+    """Simulate ``n_paths`` paths of ``bars`` trading minutes.
+
+    With ``workers > 1`` the path chunks run in parallel processes. Raises
+    ``ValueError`` if ``risk_manager`` carries portfolio limits.
+    """
+    if n_paths < 1 or bars < 1:
+        raise ValueError("n_paths and bars must be >= 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    judge_agent = judge_agent or JudgeAgent()
+    max_position, max_daily_loss = risk_limits(risk_manager or RiskManager())
+    judge_params = {
+        name: getattr(judge_agent, name) for name in JUDGE_PARAMS + ("tau_buy", "tau_sell")
+    }
+    start = start or datetime(2024, 1, 2, 14, 30, tzinfo=UTC)
+    timestamps = trading_minutes(start, bars)
+    tradable = np.array([is_regular_trading_hours(ts) for ts in timestamps], dtype=bool)
+    tasks = [
+        _ChunkTask(
+            paths=range(first, min(first + chunk_size, n_paths)),
+            bars=bars,
+            seed=seed,
+            tradable=tradable,
+            market_params=dict(market_params or {}),
+            sentiment=sentiment or SentimentModel(),
+            judge_params=judge_params,
+            max_position=max_position,
+            max_daily_loss=max_daily_loss,
+            slippage_bps=slippage_bps,
+        )
+        for first in range(0, n_paths, chunk_size)
+    ]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+            chunks = list(pool.map(_run_chunk, tasks))
+    else:
+        chunks = [_run_chunk(task) for task in tasks]
+    paths = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+    return MonteCarloResult(paths=paths, bars=bars, seed=seed)
@@ -1,45 +1,114 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING
 
 from agents.factual_agent import FactualAgent
 from agents.judge_agent import JudgeAgent
 from agents.subjective_agent import SubjectiveAgent
-from app.schemas import ExecutionFill, JudgeDecision
-from app.telemetry import telemetry
+from app.events import DecisionEvent, EventBus, FillEvent, StepEvent
+from app.records import DecisionRecord, FillRecord
+from app.telemetry import TelemetryStore
+from app.telemetry import telemetry as default_telemetry
+from app.tracing import traced, tracer
 from services.execution import PaperBroker
 from services.risk import RiskContext, RiskManager
 
+if TYPE_CHECKING:  # pragma: no cover
+    from app.checkpoint import Checkpointable
+    from pipelines.replay import StepRecorder
+
 
 @dataclass
 class MarketMindOrchestrator:
+    """Runs one decision step per call.
+
+    With an ``events`` bus, decisions and fills are published for subscribers to
+    record off the critical path; without one they go straight to ``telemetry``.
+    """
+
     factual_agent: FactualAgent
     subjective_agent: SubjectiveAgent
     judge_agent: JudgeAgent
     risk_manager: RiskManager
     broker: PaperBroker
+    recorder: StepRecorder | None = None
+    telemetry: TelemetryStore = field(default_factory=lambda: default_telemetry)
+    events: EventBus | None = None
 
-    def step(self, symbol: str) -> tuple[JudgeDecision, Optional[ExecutionFill]]:
+    @traced("orchestrator.step")
+    def step(self, symbol: str) -> tuple[DecisionRecord, FillRecord | None]:
+        return self.settle(*self.propose(symbol=symbol))
+
+    def propose(self, symbol: str) -> tuple[DecisionRecord, datetime, float | None]:
+        """Run the agents: the judge's decision, its bar timestamp and mark price (if any)."""
         factual = self.factual_agent.run(symbol=symbol)
         subjective = self.subjective_agent.run(symbol=symbol)
         decision = self.judge_agent.run(factual=factual, subjective=subjective)
+        return decision, factual.timestamp, factual.features.get("last_close")
+
+    def settle(
+        self, decision: DecisionRecord, timestamp: datetime, mark_price: float | None
+    ) -> tuple[DecisionRecord, FillRecord | None]:
+        """Mark, risk-check, record and execute a proposed decision.
+
+        Kept apart from ``propose`` so the sharded engine can run the agents in
+        workers and settle every shard against one ledger and risk state.
+        """
+        symbol = decision.symbol
+        # Without a price there is nothing to mark or fill at; the step still records its decision.
+        if mark_price is not None:
+            self.broker.mark(symbol, mark_price)
+        snapshot = self.broker.ledger.snapshot(symbol)
+        portfolio = self.risk_manager.portfolio
+        if portfolio is not None and mark_price is not None:
+            portfolio.observe(symbol, timestamp, mark_price)
 
         context = RiskContext(
-            timestamp=factual.timestamp,
+            timestamp=timestamp,
             symbol=symbol,
-            current_position=self.broker.positions.get(symbol, 0.0),
-            cumulative_pnl=self.broker.pnl,
+            current_position=snapshot.position,
+            cumulative_pnl=snapshot.total_pnl,
+            mark_price=mark_price,
         )
-        guarded = self.risk_manager.evaluate(decision, context=context)
-        telemetry.record_decision(guarded)
+        if self.recorder is not None:
+            self.recorder.record(context)
+        with tracer.span("risk.evaluate"):
+            guarded = self.risk_manager.evaluate(decision, context=context)
+        if self.events is not None:
+            self.events.publish(DecisionEvent(guarded))
+        else:
+            with tracer.span("telemetry.record_decision"):
+                self.telemetry.record_decision(guarded)
 
-        mark_price = factual.features.get("last_close", 0.0)
         fill = None
-        if guarded.action in {"BUY", "SELL"} and guarded.size > 0:
-            fill, pnl_delta = self.broker.execute(guarded, mark_price)
+        if mark_price is not None and guarded.action in {"BUY", "SELL"} and guarded.size > 0:
+            with tracer.span("broker.execute"):
+                fill, pnl_delta = self.broker.execute(guarded, mark_price)
             if fill:
-                telemetry.record_fill(fill, pnl_delta=pnl_delta)
+                if portfolio is not None:
+                    portfolio.apply_fill(symbol, fill.size if fill.action == "BUY" else -fill.size)
+                if self.events is not None:
+                    self.events.publish(FillEvent(fill, pnl_delta))
+                else:
+                    with tracer.span("telemetry.record_fill"):
+                        self.telemetry.record_fill(fill, pnl_delta=pnl_delta)
 
+        if self.events is not None:
+            self.events.publish(StepEvent(guarded, fill))
         return guarded, fill
 
+    def checkpoint_components(self) -> dict[str, Checkpointable]:
+        """Warm state worth persisting across restarts, keyed by checkpoint component name."""
+        components: dict[str, Checkpointable] = {
+            "ledger": self.broker.ledger,
+            "telemetry": self.telemetry,
+        }
+        if self.factual_agent.resampler is not None:
+            components["resampler"] = self.factual_agent.resampler
+        if hasattr(self.factual_agent.provider, "export_state"):
+            components["bars"] = self.factual_agent.provider
+        if self.risk_manager.portfolio is not None:
+            components["portfolio_risk"] = self.risk_manager.portfolio
+        return components
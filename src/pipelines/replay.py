@@ -0,0 +1,327 @@
+"""Deterministic record-and-replay of orchestrator step inputs.
+
+Recording wraps the market-data and news providers of a live orchestrator and
+appends each step's inputs (bars, raw news signals and the broker state and mark
+the risk check saw) to a compact binary log. Replay feeds those inputs back
+through the agents and risk manager entirely in memory, so strategy changes can
+be checked against recorded production decisions.
+
+Portfolio risk depends on every symbol's positions and price history, which the
+log does not hold, so steps recorded with it enabled are refused at replay.
+
+Log layout (little-endian)::
+
+    header  b"MMRL" u16 version
+    frame   u32 payload_length, payload
+    payload str symbol, f8 position, f8 cumulative_pnl, f8 mark_price (NaN if none),
+            u1 portfolio_risk,
+            u32 n, i8[n] ts_ns, f8[n] open/high/low/close/volume,
+            i8 signal_ts_ns, u16 k, (str key, f8 value) * k, u16 m, str note * m
+    str     u32 length, utf-8 bytes
+
+Version 1 logs have no ``mark_price``/``portfolio_risk``; they read as ``None``/off.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from agents.factual_agent import FactualAgent
+from agents.judge_agent import JudgeAgent
+from agents.subjective_agent import SubjectiveAgent
+from app.records import BarRecord, DecisionRecord, SignalsRecord
+from app.utils.time_windows import from_epoch_ns, to_epoch_ns
+from services.feature_store import FeatureStore
+from services.market_data import MarketDataProvider
+from services.news_data import NewsProvider
+from services.risk import RiskContext, RiskManager
+from services.sentiment import RuleBasedSentiment, SentimentModel
+
+MAGIC = b"MMRL"
+LOG_VERSION = 2
+
+_HEADER = struct.Struct("<4sH")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_BROKER = struct.Struct("<dddB")
+_BROKER_V1 = struct.Struct("<dd")
+
+_BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(slots=True)
+class RecordedStep:
+    symbol: str
+    bars: list[BarRecord]
+    signals: SignalsRecord
+    position: float
+    cumulative_pnl: float
+    mark_price: float | None = None
+    portfolio_risk: bool = False
+
+
+def _pack_str(out: list[bytes], value: str) -> None:
+    raw = value.encode()
+    out.append(_U32.pack(len(raw)))
+    out.append(raw)
+
+
+def encode_step(step: RecordedStep) -> bytes:
+    out: list[bytes] = []
+    _pack_str(out, step.symbol)
+    mark_price = math.nan if step.mark_price is None else step.mark_price
+    out.append(_BROKER.pack(step.position, step.cumulative_pnl, mark_price, step.portfolio_risk))
+    bars = step.bars
+    out.append(_U32.pack(len(bars)))
+    out.append(
+        np.fromiter(
+            (to_epoch_ns(bar.timestamp) for bar in bars), dtype="<i8", count=len(bars)
+        ).tobytes()
+    )
+    for name in _BAR_FIELDS:
+        out.append(
+            np.fromiter(
+                (getattr(bar, name) for bar in bars), dtype="<f8", count=len(bars)
+            ).tobytes()
+        )
+    signals = step.signals
+    out.append(_I64.pack(to_epoch_ns(signals.timestamp)))
+    out.append(_U16.pack(len(signals.signals)))
+    for key, value in signals.signals.items():
+        _pack_str(out, key)
+        out.append(_F64.pack(value))
+    out.append(_U16.pack(len(signals.notes)))
+    for note in signals.notes:
+        _pack_str(out, note)
+    return b"".join(out)
+
+
+class _Reader:
+    __slots__ = ("buffer", "offset")
+
+    def __init__(self, buffer: bytes):
+        self.buffer = buffer
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.buffer, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def string(self) -> str:
+        (length,) = self.unpack(_U32)
+        start = self.offset
+        self.offset += length
+        return self.buffer[start : self.offset].decode()
+
+    def array(self, dtype: str, count: int) -> np.ndarray:
+        values = np.frombuffer(self.buffer, dtype=dtype, count=count, offset=self.offset)
+        self.offset += values.nbytes
+        return values
+
+
+def decode_step(payload: bytes, version: int = LOG_VERSION) -> RecordedStep:
+    reader = _Reader(payload)
+    symbol = reader.string()
+    if version == 1:
+        position, cumulative_pnl = reader.unpack(_BROKER_V1)
+        mark_price, portfolio_risk = None, 0
+    else:
+        position, cumulative_pnl, mark_price, portfolio_risk = reader.unpack(_BROKER)
+        mark_price = None if math.isnan(mark_price) else mark_price
+    (count,) = reader.unpack(_U32)
+    timestamps = reader.array("<i8", count).tolist()
+    columns = [reader.array("<f8", count).tolist() for _ in _BAR_FIELDS]
+    bars = [
+        BarRecord(from_epoch_ns(ts), symbol, open_, high, low, close, volume)
+        for ts, open_, high, low, close, volume in zip(timestamps, *columns, strict=True)
+    ]
+    (signal_ts,) = reader.unpack(_I64)
+    (n_signals,) = reader.unpack(_U16)
+    signals = {}
+    for _ in range(n_signals):
+        key = reader.string()
+        (signals[key],) = reader.unpack(_F64)
+    (n_notes,) = reader.unpack(_U16)
+    notes = [reader.string() for _ in range(n_notes)]
+    return RecordedStep(
+        symbol=symbol,
+        bars=bars,
+        signals=SignalsRecord(from_epoch_ns(signal_ts), symbol, signals, notes),
+        position=position,
+        cumulative_pnl=cumulative_pnl,
+        mark_price=mark_price,
+        portfolio_risk=bool(portfolio_risk),
+    )
+
+
+def read_log(path: Path) -> Iterator[RecordedStep]:
+    """Yield recorded steps; a truncated trailing frame (e.g. after a crash) is ignored."""
+    data = Path(path).read_bytes()
+    if len(data) < _HEADER.size:
+        return
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a Market-Mind replay log")
+    if not 1 <= version <= LOG_VERSION:
+        raise ValueError(f"Unsupported replay log version {version} (expected {LOG_VERSION})")
+    offset = _HEADER.size
+    while offset + _U32.size <= len(data):
+        (length,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        if offset + length > len(data):
+            break
+        yield decode_step(data[offset : offset + length], version)
+        offset += length
+
+
+@dataclass
+class _RecordingMarketData:
+    inner: MarketDataProvider
+    last_bars: list[BarRecord] = field(default_factory=list)
+
+    def get_bars(self, symbol: str, lookback: int) -> list[BarRecord]:
+        self.last_bars = self.inner.get_bars(symbol=symbol, lookback=lookback)
+        return self.last_bars
+
+    def __getattr__(self, name: str):
+        return getattr(self.inner, name)
+
+
+@dataclass
+class _RecordingNews:
+    inner: NewsProvider
+    last_signals: SignalsRecord | None = None
+
+    def fetch_signals(self, symbol: str) -> SignalsRecord:
+        signals = self.inner.fetch_signals(symbol)
+        # SubjectiveAgent replaces ``signals.signals`` with the enriched dict, so keep a copy.
+        self.last_signals = SignalsRecord(
+            signals.timestamp, signals.symbol, dict(signals.signals), list(signals.notes)
+        )
+        return signals
+
+    def __getattr__(self, name: str):
+        return getattr(self.inner, name)
+
+
+class StepRecorder:
+    """Appends every orchestrator step's inputs to a binary log."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: BinaryIO = self.path.open("ab")
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(MAGIC, LOG_VERSION))
+        self._market: _RecordingMarketData | None = None
+        self._news: _RecordingNews | None = None
+        self._risk_manager: RiskManager | None = None
+        self.steps = 0
+
+    def attach(self, orchestrator) -> StepRecorder:
+        """Wrap the orchestrator's providers and register this recorder on it."""
+        self._market = _RecordingMarketData(orchestrator.factual_agent.provider)
+        self._news = _RecordingNews(orchestrator.subjective_agent.provider)
+        orchestrator.factual_agent.provider = self._market
+        orchestrator.subjective_agent.provider = self._news
+        self._risk_manager = orchestrator.risk_manager
+        orchestrator.recorder = self
+        return self
+
+    def record(self, context: RiskContext) -> None:
+        if self._market is None or self._news is None or self._news.last_signals is None:
+            raise RuntimeError("StepRecorder.attach() must be called before recording")
+        self.write(
+            RecordedStep(
+                symbol=context.symbol,
+                bars=self._market.last_bars,
+                signals=self._news.last_signals,
+                position=context.current_position,
+                cumulative_pnl=context.cumulative_pnl,
+                mark_price=context.mark_price,
+                portfolio_risk=self._risk_manager.portfolio is not None,
+            )
+        )
+
+    def write(self, step: RecordedStep) -> None:
+        payload = encode_step(step)
+        self._file.write(_U32.pack(len(payload)))
+        self._file.write(payload)
+        self._file.flush()
+        self.steps += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ReplayMarketData:
+    def __init__(self) -> None:
+        self.bars: list[BarRecord] = []
+
+    def get_bars(self, symbol: str, lookback: int) -> list[BarRecord]:
+        return self.bars
+
+
+class _ReplayNews:
+    def __init__(self) -> None:
+        self.signals: SignalsRecord | None = None
+
+    def fetch_signals(self, symbol: str) -> SignalsRecord:
+        signals = self.signals
+        return SignalsRecord(
+            signals.timestamp, signals.symbol, dict(signals.signals), list(signals.notes)
+        )
+
+
+def replay(
+    steps: list[RecordedStep],
+    judge_agent: JudgeAgent | None = None,
+    risk_manager: RiskManager | None = None,
+    feature_store: FeatureStore | None = None,
+    sentiment_model: SentimentModel | None = None,
+) -> list[DecisionRecord]:
+    """Re-run recorded inputs through the agents and risk manager without any I/O.
+
+    Pass modified agents or risk settings to regression-test strategy changes.
+    Raises ``ValueError`` for portfolio risk, whose cross-symbol state the log
+    does not capture.
+    """
+    if risk_manager is not None and risk_manager.portfolio is not None:
+        raise ValueError("Replay cannot evaluate portfolio risk; pass a RiskManager without one")
+    if any(step.portfolio_risk for step in steps):
+        raise ValueError("Log was recorded with portfolio risk enabled and cannot be replayed")
+    market = _ReplayMarketData()
+    news = _ReplayNews()
+    factual_agent = FactualAgent(provider=market, feature_store=feature_store or FeatureStore())
+    subjective_agent = SubjectiveAgent(
+        provider=news, sentiment_model=sentiment_model or RuleBasedSentiment()
+    )
+    judge_agent = judge_agent or JudgeAgent()
+    risk_manager = risk_manager or RiskManager()
+
+    decisions: list[DecisionRecord] = []
+    for step in steps:
+        market.bars = step.bars
+        news.signals = step.signals
+        factual = factual_agent.run(symbol=step.symbol)
+        subjective = subjective_agent.run(symbol=step.symbol)
+        decision = judge_agent.run(factual=factual, subjective=subjective)
+        context = RiskContext(
+            timestamp=factual.timestamp,
+            symbol=step.symbol,
+            current_position=step.position,
+            cumulative_pnl=step.cumulative_pnl,
+            mark_price=step.mark_price,
+        )
+        decisions.append(risk_manager.evaluate(decision, context=context))
+    return decisions
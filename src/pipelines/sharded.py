@@ -0,0 +1,287 @@
+"""Multi-process live engine that shards the symbol universe across workers.
+
+The coordinator fetches bars once per tick and publishes them into a
+shared-memory ``SharedBarBuffer``; each worker runs the agents over its shard,
+building features straight from views of the shared arrays. The proposed
+decisions travel back over a queue and the coordinator settles them in symbol
+order against one ledger and risk manager, so the position, daily-loss and
+portfolio guardrails all see the consolidated book.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from app.records import BarRecord, DecisionRecord, FillRecord
+from app.telemetry import TelemetryStore
+from app.telemetry import telemetry as default_telemetry
+from app.utils.time_windows import from_epoch_ns, to_epoch_ns
+from services.market_data import MarketDataProvider, MockMarketDataProvider
+from services.news_data import MockNewsProvider
+from services.portfolio import PortfolioLedger, SymbolIndex
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.checkpoint import Checkpointable
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class SharedBarBuffer:
+    """Per-symbol OHLCV windows laid out as NumPy views over one shared-memory block.
+
+    ``timestamps`` is ``int64[symbols, lookback]`` (epoch ns), ``values`` is
+    ``float64[symbols, 5, lookback]`` and ``counts`` holds the number of valid
+    bars per symbol, right-aligned in each window.
+    """
+
+    def __init__(self, n_symbols: int, lookback: int, name: str | None = None):
+        self.n_symbols = n_symbols
+        self.lookback = lookback
+        ts_bytes = n_symbols * lookback * 8
+        values_bytes = n_symbols * len(BAR_FIELDS) * lookback * 8
+        size = ts_bytes + values_bytes + n_symbols * 8
+        self._owner = name is None
+        self.shm = SharedMemory(name=name, create=self._owner, size=size if self._owner else 0)
+        buf = self.shm.buf
+        self.timestamps = np.ndarray((n_symbols, lookback), dtype=np.int64, buffer=buf)
+        self.values = np.ndarray(
+            (n_symbols, len(BAR_FIELDS), lookback), dtype=np.float64, buffer=buf, offset=ts_bytes
+        )
+        self.counts = np.ndarray(
+            (n_symbols,), dtype=np.int64, buffer=buf, offset=ts_bytes + values_bytes
+        )
+        if self._owner:
+            self.counts[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def publish(self, sid: int, bars: Sequence[BarRecord]) -> None:
+        bars = bars[-self.lookback :]
+        count = len(bars)
+        start = self.lookback - count
+        self.timestamps[sid, start:] = [to_epoch_ns(bar.timestamp) for bar in bars]
+        self.values[sid, :, start:] = [[getattr(bar, name) for bar in bars] for name in BAR_FIELDS]
+        self.counts[sid] = count
+
+    def columns(
+        self, sid: int, lookback: int | None = None
+    ) -> tuple[datetime | None, dict[str, np.ndarray]]:
+        """The newest bar's timestamp and read-only OHLCV views into the shared block."""
+        count = self._count(sid, lookback)
+        start = self.lookback - count
+        columns = {}
+        for idx, name in enumerate(BAR_FIELDS):
+            view = self.values[sid, idx, start:]
+            view.flags.writeable = False
+            columns[name] = view
+        return (from_epoch_ns(int(self.timestamps[sid, -1])) if count else None), columns
+
+    def bars(self, sid: int, symbol: str, lookback: int | None = None) -> list[BarRecord]:
+        start = self.lookback - self._count(sid, lookback)
+        timestamps = self.timestamps[sid, start:].tolist()
+        columns = self.values[sid, :, start:].tolist()
+        return [
+            BarRecord(from_epoch_ns(ts), symbol, open_, high, low, close, volume)
+            for ts, open_, high, low, close, volume in zip(timestamps, *columns, strict=True)
+        ]
+
+    def _count(self, sid: int, lookback: int | None) -> int:
+        count = int(self.counts[sid])
+        return count if lookback is None else min(count, lookback)
+
+    def close(self) -> None:
+        # Drop the views before releasing the mapping.
+        del self.timestamps, self.values, self.counts
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+@dataclass
+class SharedBarProvider(MarketDataProvider):
+    """Worker-side provider that serves bars published by the coordinator."""
+
+    buffer: SharedBarBuffer
+    symbol_ids: dict[str, int]
+
+    def get_bars(self, symbol: str, lookback: int) -> list[BarRecord]:
+        return self.buffer.bars(self.symbol_ids[symbol], symbol, lookback)
+
+    def get_columns(
+        self, symbol: str, lookback: int
+    ) -> tuple[datetime | None, dict[str, np.ndarray]]:
+        # Views stay valid for the step: the coordinator only republishes once every shard reports.
+        return self.buffer.columns(self.symbol_ids[symbol], lookback)
+
+
+def _worker_main(  # pragma: no cover - subprocess
+    shard: int,
+    symbols: list[str],
+    symbol_ids: dict[str, int],
+    shm_name: str,
+    n_symbols: int,
+    lookback: int,
+    news_seed: int,
+    inbox,
+    outbox,
+) -> None:
+    from app.runner import build_orchestrator
+
+    buffer = SharedBarBuffer(n_symbols, lookback, name=shm_name)
+    # Only the agents run here; risk checks and fills happen in the coordinator.
+    orchestrator = build_orchestrator(event_bus=False)
+    orchestrator.factual_agent.provider = SharedBarProvider(buffer, symbol_ids)
+    orchestrator.subjective_agent.provider = MockNewsProvider(seed=news_seed)
+    try:
+        while (tick := inbox.get()) is not None:
+            proposals, error = [], None
+            for symbol in symbols:
+                try:
+                    proposals.append(orchestrator.propose(symbol=symbol))
+                except Exception as exc:  # reported to the coordinator
+                    error = f"{symbol}: {exc!r}"
+            outbox.put((shard, tick, proposals, error))
+    finally:
+        buffer.close()
+
+
+class ShardedLiveEngine:
+    """Coordinator that fans each tick out to worker processes over shared memory.
+
+    Shard ``i`` draws its mock news from ``news_seed + i`` so shards don't replay
+    one another's headlines. ``orchestrator`` settles every shard's proposals: its
+    risk manager and broker share ``ledger`` and it records to ``telemetry``.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        workers: int,
+        lookback: int = 120,
+        provider: MarketDataProvider | None = None,
+        telemetry: TelemetryStore | None = None,
+        news_seed: int = MockNewsProvider.seed,
+    ):
+        from app.runner import build_orchestrator
+
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.index = SymbolIndex(symbols)
+        self.lookback = lookback
+        self.provider = provider or MockMarketDataProvider()
+        self.telemetry = telemetry or default_telemetry
+        self.ledger = PortfolioLedger(self.index.symbols)
+        self.orchestrator = build_orchestrator(event_bus=False)
+        self.orchestrator.broker.ledger = self.ledger
+        self.orchestrator.telemetry = self.telemetry
+        self.buffer = SharedBarBuffer(len(self.index), lookback)
+        self.shards = [
+            shard for shard in (self.index.symbols[i::workers] for i in range(workers)) if shard
+        ]
+        self._tick = 0
+
+        ctx = mp.get_context("spawn")
+        symbol_ids = {symbol: self.index.id(symbol) for symbol in self.index.symbols}
+        self._outbox = ctx.Queue()
+        self._inboxes = [ctx.Queue() for _ in self.shards]
+        self._processes = [
+            ctx.Process(
+                target=_worker_main,
+                args=(
+                    shard_id,
+                    shard,
+                    symbol_ids,
+                    self.buffer.name,
+                    len(self.index),
+                    lookback,
+                    news_seed + shard_id,
+                    inbox,
+                    self._outbox,
+                ),
+                name=f"market-mind-shard-{shard_id}",
+                daemon=True,
+            )
+            for shard_id, (shard, inbox) in enumerate(zip(self.shards, self._inboxes, strict=True))
+        ]
+        for process in self._processes:
+            process.start()
+
+    def publish(self) -> None:
+        for sid, symbol in enumerate(self.index.symbols):
+            self.buffer.publish(sid, self.provider.get_bars(symbol=symbol, lookback=self.lookback))
+
+    def tick(self) -> list[tuple[DecisionRecord, FillRecord | None]]:
+        """Publish one tick of bars, run every shard and settle the proposals in symbol order."""
+        self._tick += 1
+        self.publish()
+        for inbox in self._inboxes:
+            inbox.put(self._tick)
+
+        proposals: dict[str, tuple[DecisionRecord, datetime, float | None]] = {}
+        errors = []
+        for _ in self._inboxes:
+            _, tick, shard_proposals, error = self._outbox.get()
+            if tick != self._tick:  # pragma: no cover - defensive
+                raise RuntimeError(
+                    f"Out-of-order shard result for tick {tick} (expected {self._tick})"
+                )
+            if error:
+                errors.append(error)
+            proposals.update((proposal[0].symbol, proposal) for proposal in shard_proposals)
+        if errors:
+            raise RuntimeError("Shard step failed: " + "; ".join(errors))
+
+        # Settling in order lets each risk check see the fills booked before it this tick.
+        results = [
+            self.orchestrator.settle(*proposals[symbol])
+            for symbol in self.index.symbols
+            if symbol in proposals
+        ]
+        self.ledger.mark(self._last_closes())
+        return results
+
+    def checkpoint_components(self) -> dict[str, Checkpointable]:
+        """The coordinator's warm state, keyed by checkpoint component name.
+
+        The shared bar buffer is republished from ``provider`` on every tick, so
+        it is covered by the provider's bar windows when the provider can export
+        them. Workers keep nothing beyond their feature caches.
+        """
+        components: dict[str, Checkpointable] = {
+            "ledger": self.ledger,
+            "telemetry": self.telemetry,
+        }
+        if hasattr(self.provider, "export_state"):
+            components["bars"] = self.provider
+        if self.orchestrator.risk_manager.portfolio is not None:
+            components["portfolio_risk"] = self.orchestrator.risk_manager.portfolio
+        return components
+
+    def _last_closes(self) -> np.ndarray:
+        closes = self.buffer.values[:, BAR_FIELDS.index("close"), -1].copy()
+        closes[self.buffer.counts == 0] = np.nan
+        return closes
+
+    def close(self) -> None:
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():  # pragma: no cover - defensive
+                process.terminate()
+        self.buffer.close()
+
+    def __enter__(self) -> ShardedLiveEngine:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,92 @@
+"""Guardrail and ledger replay shared by the walk-forward and Monte Carlo simulators.
+
+``simulate_paths`` steps ``[paths, bars]`` decisions through time once,
+vectorized across paths: each path is one row of a ``PortfolioLedger`` and
+trades are checked with ``RiskManager.evaluate``'s per-symbol guardrails, then
+filled at the slipped mark like ``PaperBroker.execute``. Portfolio limits depend
+on the whole live book and have no per-path equivalent, so risk managers that
+carry one are rejected.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.config import settings
+from app.records import ACTION_CODES
+from services.portfolio import PortfolioLedger
+from services.risk import RiskManager
+
+GUARDRAILS = ("market_closed", "max_position_exceeded", "max_daily_loss")
+
+_HOLD, _BUY = ACTION_CODES["HOLD"], ACTION_CODES["BUY"]
+
+
+def risk_limits(risk_manager: RiskManager) -> tuple[float, float]:
+    """``(max_position, max_daily_loss)`` of a risk manager the simulators can replay."""
+    if risk_manager.portfolio is not None:
+        raise ValueError("Simulations cannot apply portfolio risk; pass a RiskManager without one")
+    return risk_manager.max_position, risk_manager.max_daily_loss
+
+
+@dataclass
+class PathOutcome:
+    equity: np.ndarray
+    trades: np.ndarray
+    attempts: np.ndarray
+    guardrails: dict[str, np.ndarray]
+
+    @property
+    def blocked(self) -> np.ndarray:
+        return self.attempts - self.trades
+
+
+def simulate_paths(
+    close: np.ndarray,
+    action: np.ndarray,
+    size: np.ndarray,
+    tradable: np.ndarray,
+    max_position: float = settings.max_position,
+    max_daily_loss: float = settings.max_daily_loss,
+    slippage_bps: float = settings.slippage_bps,
+) -> PathOutcome:
+    """Replay ``[paths, bars]`` decisions through the guardrails and a fresh ledger per path.
+
+    ``tradable[bars]`` is shared by all paths. Besides the cumulative PnL and the
+    fill counts, returns how often each guardrail fired per path.
+    """
+    n_paths, n_bars = close.shape
+    slip = slippage_bps / 1e4
+    loss_limit = -abs(max_daily_loss)
+    ledger = PortfolioLedger(map(str, range(n_paths)), capacity=n_paths)
+    position = ledger.position[:n_paths]
+    equity = np.empty((n_paths, n_bars))
+    trades = np.zeros(n_paths, dtype=np.int64)
+    attempts = np.zeros(n_paths, dtype=np.int64)
+    guardrails = {name: np.zeros(n_paths, dtype=np.int64) for name in GUARDRAILS}
+
+    wants = (action != _HOLD) & (size > 0)
+    signed_sizes = np.where(action == _BUY, size, -size)
+    for step in range(n_bars):
+        price = close[:, step]
+        ledger.mark(price)
+        want = wants[:, step]
+        if want.any():
+            signed = signed_sizes[:, step]
+            pnl = ledger.realized_pnl[:n_paths] + ledger.unrealized_pnl[:n_paths]
+            closed = want if not tradable[step] else np.zeros(n_paths, dtype=bool)
+            too_big = want & (np.abs(position + signed) > max_position)
+            losing = want & (pnl < loss_limit)
+            ok = want & ~(closed | too_big | losing)
+            attempts += want
+            trades += ok
+            guardrails["market_closed"] += closed
+            guardrails["max_position_exceeded"] += too_big
+            guardrails["max_daily_loss"] += losing
+            if ok.any():
+                qty = np.where(ok, signed, 0.0)
+                ledger.apply_fills(qty, price * np.where(qty > 0, 1 + slip, 1 - slip))
+        np.add(ledger.realized_pnl[:n_paths], ledger.unrealized_pnl[:n_paths], out=equity[:, step])
+    return PathOutcome(equity, trades, attempts, guardrails)
@@ -0,0 +1,302 @@
+"""Rolling walk-forward validation over a feature panel computed once.
+
+``build_panel`` evaluates factual features and subjective signals (including the
+sentiment score) for every bar of the full span exactly once. Folds then slice
+that panel: each fold calibrates the judge's entry threshold on its train window
+with ``JudgeAgent.decide_batch``, replaying every candidate threshold as one path
+of ``simulate_paths``, and evaluates the chosen threshold on the test window that
+follows. Folds are independent and run in parallel worker processes.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+
+from agents.judge_agent import FACTUAL_COLUMNS, JudgeAgent
+from agents.subjective_agent import SubjectiveAgent
+from app.config import settings
+from app.records import BarRecord
+from app.utils.time_windows import is_regular_trading_hours
+from pipelines.simulation import risk_limits, simulate_paths
+from services.feature_store import FeatureStore
+from services.market_data import bars_to_columns
+from services.risk import RiskManager
+
+DEFAULT_TAU_GRID = (0.1, 0.2, 0.3, 0.4, 0.5)
+JUDGE_PARAMS = ("weights", "bias", "k", "vol_target", "min_size", "max_size")
+
+
+@dataclass
+class FeaturePanel:
+    """Per-bar judge inputs for one symbol; rows follow ``timestamps``."""
+
+    symbol: str
+    timestamps: list[datetime]
+    close: np.ndarray
+    features: np.ndarray
+    signals: np.ndarray
+    sizing_vol: np.ndarray
+    tradable: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def slice(self, rows: slice) -> FeaturePanel:
+        return FeaturePanel(
+            symbol=self.symbol,
+            timestamps=self.timestamps[rows],
+            close=self.close[rows],
+            features=self.features[rows],
+            signals=self.signals[rows],
+            sizing_vol=self.sizing_vol[rows],
+            tradable=self.tradable[rows],
+        )
+
+
+def build_panel(
+    symbol: str,
+    bars: Sequence[BarRecord],
+    subjective_agent: SubjectiveAgent,
+    feature_store: FeatureStore | None = None,
+    judge_agent: JudgeAgent | None = None,
+) -> FeaturePanel:
+    """Compute features and scored signals once per bar, skipping the warm-up prefix."""
+    feature_store = feature_store or FeatureStore()
+    judge_agent = judge_agent or JudgeAgent()
+    wanted = FACTUAL_COLUMNS + ("last_close",)
+    history = feature_store.min_history(wanted)
+    _, columns = bars_to_columns(bars)
+
+    factuals, subjectives = [], []
+    for end in range(history, len(bars) + 1):
+        window = {name: values[end - history : end] for name, values in columns.items()}
+        factuals.append(
+            feature_store.build_features_from_columns(
+                symbol, bars[end - 1].timestamp, window, features=wanted
+            )
+        )
+        subjectives.append(subjective_agent.run(symbol=symbol))
+
+    features, signals, sizing_vol = judge_agent.stack_inputs(factuals, subjectives)
+    timestamps = [record.timestamp for record in factuals]
+    return FeaturePanel(
+        symbol=symbol,
+        timestamps=timestamps,
+        close=np.array([record.features["last_close"] for record in factuals], dtype=float),
+        features=features,
+        signals=signals,
+        sizing_vol=sizing_vol,
+        tradable=np.array([is_regular_trading_hours(ts) for ts in timestamps], dtype=bool),
+    )
+
+
+@dataclass(frozen=True)
+class Fold:
+    index: int
+    train: slice
+    test: slice
+
+
+def make_folds(
+    n_rows: int, train_bars: int, test_bars: int, step_bars: int | None = None
+) -> list[Fold]:
+    """Rolling train/test windows; consecutive test windows never overlap."""
+    step_bars = step_bars or test_bars
+    if min(train_bars, test_bars) < 1:
+        raise ValueError("train_bars and test_bars must be >= 1")
+    if step_bars < test_bars:
+        raise ValueError("step_bars must be >= test_bars so test windows do not overlap")
+    folds = []
+    start = 0
+    while start + train_bars + test_bars <= n_rows:
+        split = start + train_bars
+        folds.append(Fold(len(folds), slice(start, split), slice(split, split + test_bars)))
+        start += step_bars
+    return folds
+
+
+def simulate(
+    panel: FeaturePanel,
+    action: np.ndarray,
+    size: np.ndarray,
+    max_position: float = settings.max_position,
+    max_daily_loss: float = settings.max_daily_loss,
+    slippage_bps: float = settings.slippage_bps,
+) -> tuple[np.ndarray, int, int]:
+    """Replay one panel's decisions through the guardrails and a fresh ledger.
+
+    A single-path ``simulate_paths``. Returns the per-bar cumulative PnL, the
+    number of fills and the number of trades blocked by a guardrail.
+    """
+    outcome = simulate_paths(
+        panel.close[None],
+        action[None],
+        size[None],
+        panel.tradable,
+        max_position,
+        max_daily_loss,
+        slippage_bps,
+    )
+    return outcome.equity[0], int(outcome.trades[0]), int(outcome.blocked[0])
+
+
+def equity_metrics(equity: np.ndarray, trades: int = 0, blocked: int = 0) -> dict[str, float]:
+    """PnL, Sharpe and drawdown with the same conventions as ``TelemetryStore``."""
+    metrics = {
+        "pnl": 0.0,
+        "sharpe": 0.0,
+        "max_drawdown": 0.0,
+        "trades": float(trades),
+        "blocked": float(blocked),
+    }
+    if equity.size:
+        metrics["pnl"] = float(equity[-1])
+        metrics["max_drawdown"] = float((equity - np.maximum.accumulate(equity)).min())
+    if equity.size >= 5:
+        returns = np.diff(equity)
+        if returns.std() > 0:
+            metrics["sharpe"] = float(np.sqrt(252) * returns.mean() / returns.std())
+    return metrics
+
+
+@dataclass
+class FoldResult:
+    index: int
+    train_start: datetime
+    train_end: datetime
+    test_start: datetime
+    test_end: datetime
+    tau: float
+    train: dict[str, float]
+    test: dict[str, float]
+    test_equity: np.ndarray = field(repr=False)
+
+
+@dataclass
+class WalkForwardResult:
+    folds: list[FoldResult]
+    aggregate: dict[str, float]
+
+
+@dataclass
+class _FoldTask:
+    fold: Fold
+    panel: FeaturePanel
+    judge_params: dict
+    tau_grid: tuple[float, ...]
+    max_position: float
+    max_daily_loss: float
+    slippage_bps: float
+
+
+def _evaluate(
+    task: _FoldTask, panel: FeaturePanel, taus: Sequence[float]
+) -> list[tuple[dict[str, float], np.ndarray]]:
+    """Metrics and equity per threshold; the thresholds share one vectorized replay."""
+    batches = [
+        JudgeAgent(**task.judge_params, tau_buy=tau, tau_sell=-tau).decide_batch(
+            panel.features, panel.signals, panel.sizing_vol
+        )
+        for tau in taus
+    ]
+    outcome = simulate_paths(
+        np.broadcast_to(panel.close, (len(taus), len(panel))),
+        np.stack([batch.action for batch in batches]),
+        np.stack([batch.size for batch in batches]),
+        panel.tradable,
+        task.max_position,
+        task.max_daily_loss,
+        task.slippage_bps,
+    )
+    return [
+        (equity_metrics(equity, trades, blocked), equity)
+        for equity, trades, blocked in zip(
+            outcome.equity, outcome.trades.tolist(), outcome.blocked.tolist(), strict=True
+        )
+    ]
+
+
+def _run_fold(task: _FoldTask) -> FoldResult:
+    fold = task.fold
+    train = task.panel.slice(fold.train)
+    test = task.panel.slice(fold.test)
+    # Highest train Sharpe wins; ties go to the earlier (lower) threshold.
+    best_tau, best_train = task.tau_grid[0], None
+    for tau, (metrics, _) in zip(task.tau_grid, _evaluate(task, train, task.tau_grid), strict=True):
+        if best_train is None or metrics["sharpe"] > best_train["sharpe"]:
+            best_tau, best_train = tau, metrics
+    [(test_metrics, test_equity)] = _evaluate(task, test, (best_tau,))
+    return FoldResult(
+        index=fold.index,
+        train_start=train.timestamps[0],
+        train_end=train.timestamps[-1],
+        test_start=test.timestamps[0],
+        test_end=test.timestamps[-1],
+        tau=best_tau,
+        train=best_train,
+        test=test_metrics,
+        test_equity=test_equity,
+    )
+
+
+def run_walk_forward(
+    panel: FeaturePanel,
+    folds: Sequence[Fold],
+    judge_agent: JudgeAgent | None = None,
+    risk_manager: RiskManager | None = None,
+    tau_grid: Sequence[float] = DEFAULT_TAU_GRID,
+    slippage_bps: float = settings.slippage_bps,
+    workers: int = 1,
+) -> WalkForwardResult:
+    """Calibrate and evaluate every fold; ``workers > 1`` runs folds in parallel processes.
+
+    Raises ``ValueError`` if ``risk_manager`` carries portfolio limits.
+    """
+    judge_agent = judge_agent or JudgeAgent()
+    max_position, max_daily_loss = risk_limits(risk_manager or RiskManager())
+    judge_params = {name: getattr(judge_agent, name) for name in JUDGE_PARAMS}
+    tasks = [
+        _FoldTask(
+            # Ship each worker only the rows its fold reads.
+            fold=Fold(
+                fold.index,
+                slice(0, fold.train.stop - fold.train.start),
+                slice(fold.test.start - fold.train.start, fold.test.stop - fold.train.start),
+            ),
+            panel=panel.slice(slice(fold.train.start, fold.test.stop)),
+            judge_params=judge_params,
+            tau_grid=tuple(tau_grid),
+            max_position=max_position,
+            max_daily_loss=max_daily_loss,
+            slippage_bps=slippage_bps,
+        )
+        for fold in folds
+    ]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+            results = list(pool.map(_run_fold, tasks))
+    else:
+        results = [_run_fold(task) for task in tasks]
+    return WalkForwardResult(folds=results, aggregate=_aggregate(results))
+
+
+def _aggregate(results: Sequence[FoldResult]) -> dict[str, float]:
+    """Metrics of the stitched out-of-sample equity curve plus per-fold averages."""
+    if not results:
+        return equity_metrics(np.empty(0))
+    increments = np.concatenate([np.diff(result.test_equity, prepend=0.0) for result in results])
+    aggregate = equity_metrics(
+        np.cumsum(increments),
+        trades=int(sum(result.test["trades"] for result in results)),
+        blocked=int(sum(result.test["blocked"] for result in results)),
+    )
+    aggregate["folds"] = float(len(results))
+    aggregate["mean_fold_sharpe"] = float(np.mean([result.test["sharpe"] for result in results]))
+    aggregate["mean_tau"] = float(np.mean([result.tau for result in results]))
+    return aggregate
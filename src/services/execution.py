@@ -2,41 +2,60 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import UTC, datetime
+
+import numpy as np
 
 from app.config import settings
-from app.schemas import ExecutionFill, JudgeDecision
+from app.records import DecisionRecord, FillRecord
+from services.portfolio import PortfolioLedger
 
 
 @dataclass
 class PaperBroker:
     slippage_bps: float = settings.slippage_bps
     latency_ms: float = 50.0
-    positions: dict[str, float] = field(default_factory=dict)
-    last_prices: dict[str, float] = field(default_factory=dict)
-    pnl: float = 0.0
+    ledger: PortfolioLedger = field(default_factory=PortfolioLedger)
+    seed: int | None = None
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def pnl(self) -> float:
+        return self.ledger.total_pnl
+
+    def position(self, symbol: str) -> float:
+        return self.ledger.position_of(symbol)
+
+    def mark(self, symbol: str, price: float) -> None:
+        self.ledger.update_price(symbol, price)
+
+    def mark_to_market(self, prices: np.ndarray) -> None:
+        """Re-mark every position from a price vector aligned to ``ledger.index``."""
+        self.ledger.mark(prices)
 
-    def execute(self, decision: JudgeDecision, mark_price: float) -> tuple[ExecutionFill | None, float]:
+    def execute(
+        self, decision: DecisionRecord, mark_price: float
+    ) -> tuple[FillRecord | None, float]:
         if decision.action == "HOLD" or decision.size <= 0:
             return None, 0.0
 
         side = decision.action
-        notional = decision.size * mark_price
         signed_qty = decision.size if side == "BUY" else -decision.size
-        self.positions[decision.symbol] = self.positions.get(decision.symbol, 0.0) + signed_qty
 
         slip_multiplier = 1 + (self.slippage_bps / 1e4) * (1 if side == "BUY" else -1)
         fill_price = mark_price * slip_multiplier
-        latency = self.latency_ms + random.uniform(-5, 5)
+        latency = self.latency_ms + self._rng.uniform(-5, 5)
 
-        pnl_delta = 0.0
-        if decision.symbol in self.last_prices:
-            pnl_delta = (mark_price - self.last_prices[decision.symbol]) * self.positions[decision.symbol]
-            self.pnl += pnl_delta
+        self.ledger.update_price(decision.symbol, mark_price)
+        self.ledger.apply_fill(decision.symbol, signed_qty, fill_price)
+        # Everything since the last fill, including marks made by steps that did not trade.
+        pnl_delta = self.ledger.pnl_since_report()
 
-        self.last_prices[decision.symbol] = mark_price
-        fill = ExecutionFill(
-            timestamp=datetime.now(tz=timezone.utc),
+        fill = FillRecord(
+            timestamp=datetime.now(tz=UTC),
             symbol=decision.symbol,
             action=side,
             price=fill_price,
@@ -0,0 +1,177 @@
+"""Declarative feature graph evaluated lazily over OHLCV column arrays.
+
+Every node declares the nodes it reads and how many trailing rows of each input
+it needs (``window``). ``FeatureRegistry.plan`` resolves a request into a
+topologically ordered list containing each dependency exactly once, so shared
+intermediates such as close-to-close deltas or rolling volume statistics are
+computed once per call and features nobody asked for are never computed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from app.tracing import tracer
+
+SOURCES = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class FeatureNode:
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    window: int = 1
+    intermediate: bool = False
+
+
+class FeatureRegistry:
+    def __init__(self) -> None:
+        self._nodes: dict[str, FeatureNode] = {}
+        self._plans: dict[tuple[str, ...], list[FeatureNode]] = {}
+
+    def register(
+        self, name: str, inputs: Sequence[str] = (), window: int = 1, intermediate: bool = False
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.add(FeatureNode(name, func, tuple(inputs), window, intermediate))
+            return func
+
+        return decorator
+
+    def add(self, node: FeatureNode) -> None:
+        if node.name in self._nodes or node.name in SOURCES:
+            raise ValueError(f"Feature {node.name!r} is already registered")
+        missing = [name for name in node.inputs if name not in self._nodes and name not in SOURCES]
+        if missing:
+            raise ValueError(
+                f"Feature {node.name!r} depends on unknown input(s): {', '.join(missing)}"
+            )
+        self._nodes[node.name] = node
+        self._plans.clear()
+
+    @property
+    def features(self) -> tuple[str, ...]:
+        return tuple(name for name, node in self._nodes.items() if not node.intermediate)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._nodes
+
+    def plan(self, features: Iterable[str]) -> list[FeatureNode]:
+        key = tuple(features)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = []
+            seen: set[str] = set()
+
+            def visit(name: str) -> None:
+                if name in seen or name in SOURCES:
+                    return
+                node = self._nodes.get(name)
+                if node is None:
+                    raise KeyError(f"Unknown feature {name!r}")
+                for dependency in node.inputs:
+                    visit(dependency)
+                seen.add(name)
+                plan.append(node)
+
+            for name in key:
+                visit(name)
+            self._plans[key] = plan
+        return plan
+
+    def required_history(self, features: Iterable[str]) -> int:
+        """Minimum number of bars needed to produce every requested feature."""
+        history: dict[str, int] = {}
+        for node in self.plan(features):
+            base = max((history.get(name, 1) for name in node.inputs), default=1)
+            history[node.name] = base + node.window - 1
+        return max(history.values(), default=1)
+
+    def evaluate(
+        self, columns: Mapping[str, np.ndarray], features: Sequence[str]
+    ) -> dict[str, float]:
+        values: dict[str, Any] = dict(columns)
+        for node in self.plan(features):
+            with tracer.span(f"feature.{node.name}"):
+                values[node.name] = node.func(*(values[name] for name in node.inputs))
+        return {name: float(values[name]) for name in features}
+
+
+registry = FeatureRegistry()
+
+
+@registry.register("close_delta", inputs=("close",), window=2, intermediate=True)
+def close_delta(close: np.ndarray) -> np.ndarray:
+    return np.diff(close)
+
+
+@registry.register("close_returns", inputs=("close",), window=2, intermediate=True)
+def close_returns(close: np.ndarray) -> np.ndarray:
+    return close[1:] / close[:-1] - 1
+
+
+@registry.register("true_range", inputs=("high", "low", "close"), window=2, intermediate=True)
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = close[:-1]
+    high, low = high[1:], low[1:]
+    return np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+@registry.register("volume_mean_20", inputs=("volume",), window=20, intermediate=True)
+def volume_mean_20(volume: np.ndarray) -> float:
+    return float(volume[-20:].mean())
+
+
+@registry.register("volume_std_20", inputs=("volume",), window=20, intermediate=True)
+def volume_std_20(volume: np.ndarray) -> float:
+    return float(volume[-20:].std(ddof=1))
+
+
+@registry.register("rsi_14", inputs=("close_delta",), window=14)
+def rsi_14(delta: np.ndarray) -> float:
+    window = delta[-14:]
+    gain = np.clip(window, 0, None).mean()
+    loss = -np.clip(window, None, 0).mean()
+    if loss == 0:
+        return float("nan")
+    return float(100 - 100 / (1 + gain / loss))
+
+
+@registry.register("atr_14", inputs=("true_range",), window=14)
+def atr_14(tr: np.ndarray) -> float:
+    return float(tr[-14:].mean())
+
+
+@registry.register("mom_20d", inputs=("close",), window=21)
+def mom_20d(close: np.ndarray) -> float:
+    return float(close[-1] / close[-21] - 1)
+
+
+@registry.register("rolling_vol_20d", inputs=("close_returns",), window=20)
+def rolling_vol_20d(returns: np.ndarray) -> float:
+    return float(returns[-20:].std(ddof=1))
+
+
+@registry.register("book_imbalance")
+def book_imbalance() -> float:
+    # Placeholder implementation; real system would inspect L2 order book.
+    return 0.0
+
+
+@registry.register(
+    "volume_zscore_20d", inputs=("volume", "volume_mean_20", "volume_std_20"), window=1
+)
+def volume_zscore_20d(volume: np.ndarray, mean: float, std: float) -> float:
+    if std == 0:
+        return float("nan")
+    return float((volume[-1] - mean) / std)
+
+
+@registry.register("last_close", inputs=("close",))
+def last_close(close: np.ndarray) -> float:
+    return float(close[-1])
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+
 import numpy as np
 import pandas as pd
 
-from app.schemas import FactualFeatures, MarketBar
-from services.market_data import bars_to_dataframe
+from app.records import BarRecord, FeaturesRecord
+from services.feature_registry import FeatureRegistry
+from services.feature_registry import registry as default_registry
+from services.market_data import bars_to_columns
+from services.resampler import StreamingResampler
 
 
 def compute_rsi(series: pd.Series, period: int = 14) -> float:
@@ -46,23 +52,62 @@ def compute_book_imbalance(_: pd.Series) -> float:
 
 
 class FeatureStore:
-    """Derives deterministic features for the factual agent."""
-
-    def __init__(self) -> None:
-        self.required_history = 120
-
-    def build_features(self, symbol: str, bars: list[MarketBar]) -> FactualFeatures:
-        frame = bars_to_dataframe(bars)
-        if len(frame) < self.required_history:
+    """Derives deterministic features for the factual agent.
+
+    Features come from a ``FeatureRegistry`` graph; only the requested features and
+    their shared intermediates are evaluated. ``required_history`` overrides the
+    minimum bar count, which otherwise follows from the requested features' windows.
+    """
+
+    def __init__(
+        self, registry: FeatureRegistry | None = None, required_history: int | None = None
+    ) -> None:
+        self.registry = registry or default_registry
+        self.required_history = required_history
+
+    def min_history(self, features: Sequence[str] | None = None) -> int:
+        if self.required_history is not None:
+            return self.required_history
+        return self.registry.required_history(features or self.registry.features)
+
+    def build_features(
+        self, symbol: str, bars: list[BarRecord], features: Sequence[str] | None = None
+    ) -> FeaturesRecord:
+        timestamp, columns = bars_to_columns(bars)
+        return self.build_features_from_columns(symbol, timestamp, columns, features=features)
+
+    def build_features_from_columns(
+        self,
+        symbol: str,
+        timestamp: datetime | None,
+        columns: Mapping[str, np.ndarray],
+        features: Sequence[str] | None = None,
+    ) -> FeaturesRecord:
+        """Compute features from chronological OHLCV column arrays (e.g. shared-memory views)."""
+        features = tuple(features) if features is not None else self.registry.features
+        if len(columns["close"]) < self.min_history(features):
             raise ValueError("Insufficient history for feature calculation")
-
-        features = {
-            "rsi_14": compute_rsi(frame["close"], period=14),
-            "atr_14": compute_atr(frame, period=14),
-            "mom_20d": compute_momentum(frame["close"], window=20),
-            "rolling_vol_20d": compute_volatility(frame["close"], window=20),
-            "book_imbalance": compute_book_imbalance(frame["close"]),
-            "volume_zscore_20d": compute_volume_zscore(frame["volume"], window=20),
-            "last_close": float(frame["close"].iloc[-1]),
-        }
-        return FactualFeatures(timestamp=frame.index[-1], symbol=symbol, features=features)
+        values = self.registry.evaluate(columns, features)
+        return FeaturesRecord(timestamp=timestamp, symbol=symbol, features=values)
+
+    def build_timeframe_features(
+        self,
+        symbol: str,
+        resampler: StreamingResampler,
+        timeframes: Sequence[str],
+        features: Sequence[str] | None = None,
+    ) -> dict[str, float]:
+        """Features per resampled timeframe, keyed ``<feature>_<timeframe>``.
+
+        Timeframes without enough completed history yet are skipped.
+        """
+        features = tuple(features) if features is not None else self.registry.features
+        min_history = self.min_history(features)
+        values: dict[str, float] = {}
+        for timeframe in timeframes:
+            _, columns = resampler.columns(symbol, timeframe)
+            if len(columns["close"]) < min_history:
+                continue
+            for name, value in self.registry.evaluate(columns, features).items():
+                values[f"{name}_{timeframe}"] = value
+        return values
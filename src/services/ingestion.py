@@ -0,0 +1,283 @@
+"""Tick-to-bar ingestion from a local line stream (file, pipe or socket).
+
+Wire format, one event per line::
+
+    T,<ts_ns>,<symbol>,<price>,<size>                        trade
+    Q,<ts_ns>,<symbol>,<bid>,<ask>,<bid_size>,<ask_size>     quote
+
+Trades are aggregated into fixed-interval bars per symbol. The stream may be
+out of order by up to ``allowed_lateness_seconds``: a bucket is only finalized
+once the watermark (newest timestamp seen minus the allowed lateness) passes its
+end. Ticks for already-finalized buckets follow the late policy: ``"drop"``
+counts and discards them, ``"revise"`` amends a recently emitted bar and
+re-emits it with ``revised=True``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import socket
+import sys
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Protocol, TextIO
+
+import numpy as np
+
+from app.checkpoint import arrays_to_bars, bars_to_arrays
+from app.records import BarRecord
+from app.utils.time_windows import from_epoch_ns
+from services.market_data import MarketDataProvider
+
+LATE_POLICIES = ("drop", "revise")
+
+# Bucket state layout: first_ts, last_ts, open, high, low, close, volume
+_FIRST, _LAST, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME = range(7)
+
+
+class BarSink(Protocol):
+    def on_bar(self, bar: BarRecord, revised: bool = False) -> None: ...
+
+
+@dataclass(slots=True)
+class Quote:
+    ts_ns: int
+    bid: float
+    ask: float
+    bid_size: float
+    ask_size: float
+
+    @property
+    def imbalance(self) -> float:
+        depth = self.bid_size + self.ask_size
+        return (self.bid_size - self.ask_size) / depth if depth else 0.0
+
+
+class BarBuilder:
+    """Incrementally builds per-symbol bars from trade ticks with a lateness watermark."""
+
+    def __init__(
+        self,
+        sink: BarSink,
+        interval_seconds: int = 60,
+        allowed_lateness_seconds: float = 2.0,
+        late_policy: str = "drop",
+        revision_window: int = 16,
+    ):
+        if late_policy not in LATE_POLICIES:
+            raise ValueError(f"late_policy must be one of {LATE_POLICIES}, got {late_policy!r}")
+        self.sink = sink
+        self.interval_ns = int(interval_seconds * 1_000_000_000)
+        self.lateness_ns = int(allowed_lateness_seconds * 1_000_000_000)
+        self.late_policy = late_policy
+        self.revision_window = revision_window
+        self.watermark_ns = -(1 << 63)
+        self._open: dict[str, dict[int, list]] = {}
+        self._closing: list[tuple[int, str, int]] = []
+        self._recent: dict[str, OrderedDict[int, list]] = {}
+        self.ticks = 0
+        self.bars_emitted = 0
+        self.late_ticks = 0
+        self.revisions = 0
+
+    def add_trade(self, ts_ns: int, symbol: str, price: float, size: float) -> None:
+        self.ticks += 1
+        start = ts_ns - ts_ns % self.interval_ns
+        buckets = self._open.get(symbol)
+        if buckets is None:
+            buckets = self._open[symbol] = {}
+        state = buckets.get(start)
+        if state is not None:
+            if ts_ns < state[_FIRST]:
+                state[_FIRST] = ts_ns
+                state[_OPEN] = price
+            if ts_ns >= state[_LAST]:
+                state[_LAST] = ts_ns
+                state[_CLOSE] = price
+            if price > state[_HIGH]:
+                state[_HIGH] = price
+            elif price < state[_LOW]:
+                state[_LOW] = price
+            state[_VOLUME] += size
+        elif start + self.interval_ns <= self.watermark_ns:
+            self._late(ts_ns, symbol, start, price, size)
+            return
+        else:
+            buckets[start] = [ts_ns, ts_ns, price, price, price, price, size]
+            heapq.heappush(self._closing, (start + self.interval_ns, symbol, start))
+
+        watermark = ts_ns - self.lateness_ns
+        if watermark > self.watermark_ns:
+            self.watermark_ns = watermark
+            closing = self._closing
+            while closing and closing[0][0] <= watermark:
+                _, closed_symbol, closed_start = heapq.heappop(closing)
+                self._finalize(closed_symbol, closed_start)
+
+    def _late(self, ts_ns: int, symbol: str, start: int, price: float, size: float) -> None:
+        state = self._recent.get(symbol, {}).get(start) if self.late_policy == "revise" else None
+        if state is None:
+            self.late_ticks += 1
+            return
+        if ts_ns < state[_FIRST]:
+            state[_FIRST] = ts_ns
+            state[_OPEN] = price
+        if ts_ns >= state[_LAST]:
+            state[_LAST] = ts_ns
+            state[_CLOSE] = price
+        state[_HIGH] = max(state[_HIGH], price)
+        state[_LOW] = min(state[_LOW], price)
+        state[_VOLUME] += size
+        self.revisions += 1
+        self.sink.on_bar(self._record(symbol, start, state), revised=True)
+
+    def _record(self, symbol: str, start: int, state: list) -> BarRecord:
+        return BarRecord(
+            from_epoch_ns(start),
+            symbol,
+            state[_OPEN],
+            state[_HIGH],
+            state[_LOW],
+            state[_CLOSE],
+            state[_VOLUME],
+        )
+
+    def _finalize(self, symbol: str, start: int) -> None:
+        state = self._open[symbol].pop(start)
+        if self.late_policy == "revise":
+            recent = self._recent.get(symbol)
+            if recent is None:
+                recent = self._recent[symbol] = OrderedDict()
+            recent[start] = state
+            if len(recent) > self.revision_window:
+                recent.popitem(last=False)
+        self.bars_emitted += 1
+        self.sink.on_bar(self._record(symbol, start, state))
+
+    def advance(self, now_ns: int) -> None:
+        """Move the watermark forward on wall-clock time so idle symbols still close bars."""
+        watermark = now_ns - self.lateness_ns
+        if watermark > self.watermark_ns:
+            self.watermark_ns = watermark
+        while self._closing and self._closing[0][0] <= self.watermark_ns:
+            _, symbol, start = heapq.heappop(self._closing)
+            self._finalize(symbol, start)
+
+    def flush(self) -> None:
+        """Finalize every open bucket, e.g. at end of stream."""
+        while self._closing:
+            _, symbol, start = heapq.heappop(self._closing)
+            self._finalize(symbol, start)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "ticks": float(self.ticks),
+            "bars_emitted": float(self.bars_emitted),
+            "late_ticks": float(self.late_ticks),
+            "revisions": float(self.revisions),
+            "open_buckets": float(len(self._closing)),
+        }
+
+
+@dataclass
+class StreamingMarketDataProvider(MarketDataProvider):
+    """Market-data provider fed by the ingestion pipeline; keeps a bounded bar window per symbol."""
+
+    window: int = 240
+    _bars: dict[str, deque[BarRecord]] = field(default_factory=dict, init=False, repr=False)
+    _revisions: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def on_bar(self, bar: BarRecord, revised: bool = False) -> None:
+        bars = self._bars.get(bar.symbol)
+        if bars is None:
+            bars = self._bars[bar.symbol] = deque(maxlen=self.window)
+        if revised:
+            for idx in range(len(bars) - 1, -1, -1):
+                if bars[idx].timestamp == bar.timestamp:
+                    bars[idx] = bar
+                    self._revisions[bar.symbol] = self.revision(bar.symbol) + 1
+                    return
+            return
+        bars.append(bar)
+
+    def get_bars(self, symbol: str, lookback: int) -> list[BarRecord]:
+        bars = self._bars.get(symbol, ())
+        return list(bars)[-lookback:]
+
+    def revision(self, symbol: str) -> int:
+        """Bumped each time one of ``symbol``'s bars is revised in place (same timestamp)."""
+        return self._revisions.get(symbol, 0)
+
+    def export_state(self) -> dict[str, np.ndarray]:
+        bars = [bar for window in self._bars.values() for bar in window]
+        return {"symbol": np.array([bar.symbol for bar in bars], dtype=str), **bars_to_arrays(bars)}
+
+    def restore_state(self, state: Mapping[str, np.ndarray]) -> None:
+        """Reload bar windows so ``get_bars`` can serve full lookbacks right after a restart."""
+        self._bars.clear()
+        for bar in arrays_to_bars(state, state["symbol"].tolist()):
+            self.on_bar(bar)
+
+
+class TickIngestor:
+    """Parses tick lines into a ``BarBuilder`` and tracks the latest quote per symbol."""
+
+    def __init__(self, builder: BarBuilder):
+        self.builder = builder
+        self.quotes: dict[str, Quote] = {}
+        self.malformed = 0
+
+    def consume_lines(self, lines: Iterable[str]) -> int:
+        add_trade = self.builder.add_trade
+        quotes = self.quotes
+        consumed = 0
+        for line in lines:
+            parts = line.split(",")
+            kind = parts[0]
+            try:
+                if kind == "T":
+                    add_trade(int(parts[1]), parts[2], float(parts[3]), float(parts[4]))
+                elif kind == "Q":
+                    quotes[parts[2]] = Quote(
+                        int(parts[1]),
+                        float(parts[3]),
+                        float(parts[4]),
+                        float(parts[5]),
+                        float(parts[6]),
+                    )
+                elif kind.strip() and not kind.startswith("#"):
+                    self.malformed += 1
+                    continue
+                else:
+                    continue
+            except (IndexError, ValueError):
+                self.malformed += 1
+                continue
+            consumed += 1
+        return consumed
+
+    def consume(self, source: str) -> int:
+        with open_stream(source) as stream:
+            return self.consume_lines(stream)
+
+
+@contextmanager
+def open_stream(source: str) -> Iterator[TextIO]:
+    """Open ``-`` (stdin), ``tcp://host:port``, ``unix:///path`` or a file/FIFO as a line stream."""
+    if source == "-":
+        yield sys.stdin
+        return
+    if source.startswith(("tcp://", "unix://")):
+        if source.startswith("tcp://"):
+            host, _, port = source[len("tcp://") :].rpartition(":")
+            conn = socket.create_connection((host, int(port)))
+        else:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.connect(source[len("unix://") :])
+        with conn, conn.makefile("r", encoding="ascii", newline="\n") as stream:
+            yield stream
+        return
+    with open(source, encoding="ascii", newline="\n") as stream:
+        yield stream
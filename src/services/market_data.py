@@ -1,60 +1,100 @@
 from __future__ import annotations
 
-import math
-import random
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Iterable, Protocol
+from collections import deque
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from itertools import islice
+from typing import Protocol
 
+import numpy as np
 import pandas as pd
 
-from app.schemas import MarketBar
+from app.records import BarRecord
+from app.utils.time_windows import floor_to_interval, from_epoch_ns
+from services.synthetic import SyntheticMarket
+
+BAR_COLUMNS = ("timestamp", "symbol", "open", "high", "low", "close", "volume")
 
 
 class MarketDataProvider(Protocol):
-    def get_bars(self, symbol: str, lookback: int) -> list[MarketBar]:
+    def get_bars(self, symbol: str, lookback: int) -> list[BarRecord]:
         ...
 
 
 @dataclass
 class MockMarketDataProvider(MarketDataProvider):
+    """Serves bars from a ``SyntheticMarket`` whose clock follows wall time.
+
+    Setting ``as_of`` pins the clock instead (backtests step it bar by bar); no bar
+    after ``as_of`` is served. The market starts ``history`` bars before the first
+    clock reading, so each symbol's path is continuous across calls and a lookback
+    of up to ``history`` bars is available immediately; at most ``history`` bars
+    are kept per symbol.
+    """
+
     seed: int = 42
+    history: int = 2_048
+    market: SyntheticMarket | None = None
+    as_of: datetime | None = None
+    _windows: dict[str, deque[tuple]] = field(default_factory=dict, init=False, repr=False)
 
-    def __post_init__(self) -> None:
-        random.seed(self.seed)
-
-    def get_bars(self, symbol: str, lookback: int) -> list[MarketBar]:
-        end = datetime.now(tz=timezone.utc)
-        start_price = 100.0 + random.random() * 5
-        prices = [start_price]
-        volumes = [1_000_000.0]
-        for _ in range(lookback - 1):
-            change = random.gauss(0, 1)
-            price = max(1.0, prices[-1] * (1 + change / 100))
-            prices.append(price)
-            volumes.append(max(100_000.0, volumes[-1] * (1 + random.gauss(0, 0.01))))
-
-        timestamps = [
-            end - timedelta(minutes=i) for i in reversed(range(lookback))
-        ]  # 1-minute spacing for mock
-        bars: list[MarketBar] = []
-        for ts, price, vol in zip(timestamps, prices, volumes, strict=False):
-            high = price * (1 + abs(random.gauss(0, 0.003)))
-            low = price * (1 - abs(random.gauss(0, 0.003)))
-            bar = MarketBar(
-                timestamp=ts,
-                symbol=symbol,
-                open=price * (1 - random.uniform(-0.001, 0.001)),
-                high=high,
-                low=low,
-                close=price,
-                volume=vol,
+    def now(self) -> datetime:
+        return self.as_of or datetime.now(tz=UTC)
+
+    def get_bars(self, symbol: str, lookback: int) -> list[BarRecord]:
+        now = self.now()
+        if self.market is None:
+            start = floor_to_interval(now, 60) - timedelta(minutes=self.history - 1)
+            self.market = SyntheticMarket(seed=self.seed, start=start)
+        stop = self.market.index_at(now) + 1
+        if stop < 1:
+            raise ValueError(f"{now} is before the start of the mock market")
+        self.market.add_symbol(symbol)
+        window = self._windows.get(symbol)
+        if window is None:
+            window = self._windows[symbol] = deque(maxlen=self.history)
+            # Only the tail that can still be served is materialised on first use.
+            if stop - self.market.cursor(symbol) > self.history:
+                self.market.advance_symbol(symbol, stop - self.history)
+        if self.market.cursor(symbol) < stop:
+            block = self.market.advance_symbol(symbol, stop)
+            window.extend(
+                zip(
+                    [from_epoch_ns(ts) for ts in block.timestamps.tolist()],
+                    block.open[0].tolist(),
+                    block.high[0].tolist(),
+                    block.low[0].tolist(),
+                    block.close[0].tolist(),
+                    block.volume[0].tolist(),
+                    strict=True,
+                )
             )
-            bars.append(bar)
-        return bars
+        # A clock moved backwards must not see bars generated for a later time.
+        end = max(len(window) - (self.market.cursor(symbol) - stop), 0)
+        rows = islice(window, max(end - lookback, 0), end)
+        return [
+            BarRecord(ts, symbol, open_, high, low, close, volume)
+            for ts, open_, high, low, close, volume in rows
+        ]
+
+
+def bars_to_columns(bars: Sequence[BarRecord]) -> tuple[datetime | None, dict[str, np.ndarray]]:
+    """Chronological OHLCV column arrays plus the newest bar's timestamp."""
+    if any(prev.timestamp > cur.timestamp for prev, cur in zip(bars, bars[1:], strict=False)):
+        bars = sorted(bars, key=lambda bar: bar.timestamp)
+    count = len(bars)
+    columns = {
+        column: np.fromiter((getattr(bar, column) for bar in bars), dtype=float, count=count)
+        for column in BAR_COLUMNS[2:]
+    }
+    return (bars[-1].timestamp if bars else None), columns
 
 
-def bars_to_dataframe(bars: Iterable[MarketBar]) -> pd.DataFrame:
-    frame = pd.DataFrame([bar.model_dump() for bar in bars])
+def bars_to_dataframe(bars: Iterable[BarRecord]) -> pd.DataFrame:
+    bars = list(bars)
+    frame = pd.DataFrame(
+        {column: [getattr(bar, column) for bar in bars] for column in BAR_COLUMNS},
+    )
     frame.set_index("timestamp", inplace=True)
     return frame.sort_index()
@@ -1,35 +1,36 @@
 from __future__ import annotations
 
 import random
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from typing import Protocol
 
-from app.schemas import SubjectiveSignals
+from app.records import SignalsRecord
 
 
 class NewsProvider(Protocol):
-    def fetch_signals(self, symbol: str) -> SubjectiveSignals:
+    def fetch_signals(self, symbol: str) -> SignalsRecord:
         ...
 
 
 @dataclass
 class MockNewsProvider(NewsProvider):
     seed: int = 123
+    _rng: random.Random = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
-        random.seed(self.seed)
+        self._rng = random.Random(self.seed)
 
-    def fetch_signals(self, symbol: str) -> SubjectiveSignals:
-        score = random.uniform(-1.0, 1.0)
+    def fetch_signals(self, symbol: str) -> SignalsRecord:
+        score = self._rng.uniform(-1.0, 1.0)
         notes = [f"Mock headline sentiment {score:.2f} for {symbol}"]
         signals = {
             "news_sentiment": score,
-            "social_velocity_z": random.uniform(-1.5, 1.5),
-            "search_trend_z": random.uniform(-1.0, 1.0),
+            "social_velocity_z": self._rng.uniform(-1.5, 1.5),
+            "search_trend_z": self._rng.uniform(-1.0, 1.0),
         }
-        return SubjectiveSignals(
-            timestamp=datetime.now(tz=timezone.utc),
+        return SignalsRecord(
+            timestamp=datetime.now(tz=UTC),
             symbol=symbol,
             signals=signals,
             notes=notes,
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+_LEDGER_COLUMNS = ("position", "avg_cost", "last_price", "realized_pnl", "unrealized_pnl")
+
+
+class SymbolIndex:
+    """Stable symbol -> integer ID mapping shared by array-backed services."""
+
+    def __init__(self, symbols: Iterable[str] = ()) -> None:
+        self._ids: dict[str, int] = {}
+        self.symbols: list[str] = []
+        for symbol in symbols:
+            self.id(symbol)
+
+    def id(self, symbol: str) -> int:
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self._ids[symbol] = sid
+            self.symbols.append(symbol)
+        return sid
+
+    def get(self, symbol: str) -> int | None:
+        return self._ids.get(symbol)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._ids
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+@dataclass(frozen=True)
+class PositionSnapshot:
+    symbol: str
+    position: float
+    avg_cost: float
+    last_price: float
+    realized_pnl: float
+    unrealized_pnl: float
+    total_realized_pnl: float
+    total_unrealized_pnl: float
+
+    @property
+    def total_pnl(self) -> float:
+        return self.total_realized_pnl + self.total_unrealized_pnl
+
+
+class PortfolioLedger:
+    """Universe-wide position and PnL ledger stored in NumPy arrays indexed by symbol ID."""
+
+    def __init__(self, symbols: Iterable[str] = (), capacity: int = 64) -> None:
+        self.index = SymbolIndex()
+        self._capacity = max(int(capacity), 1)
+        self.position = np.zeros(self._capacity)
+        self.avg_cost = np.zeros(self._capacity)
+        self.last_price = np.zeros(self._capacity)
+        self.realized_pnl = np.zeros(self._capacity)
+        self.unrealized_pnl = np.zeros(self._capacity)
+        self.total_realized_pnl = 0.0
+        self.total_unrealized_pnl = 0.0
+        self.reported_pnl = 0.0
+        for symbol in symbols:
+            self.symbol_id(symbol)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def total_pnl(self) -> float:
+        return self.total_realized_pnl + self.total_unrealized_pnl
+
+    def pnl_since_report(self) -> float:
+        """PnL booked or marked since the previous call, so reported deltas sum to ``total_pnl``."""
+        total = self.total_pnl
+        delta, self.reported_pnl = total - self.reported_pnl, total
+        return delta
+
+    def symbol_id(self, symbol: str) -> int:
+        sid = self.index.id(symbol)
+        if sid >= self._capacity:
+            self._grow(max(self._capacity * 2, sid + 1))
+        return sid
+
+    def _grow(self, capacity: int) -> None:
+        for name in _LEDGER_COLUMNS:
+            current = getattr(self, name)
+            grown = np.zeros(capacity)
+            grown[: self._capacity] = current
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    def position_of(self, symbol: str) -> float:
+        sid = self.index.get(symbol)
+        return 0.0 if sid is None else float(self.position[sid])
+
+    def update_price(self, symbol: str, price: float) -> None:
+        """Mark a single symbol in O(1), keeping the universe totals in sync."""
+        sid = self.symbol_id(symbol)
+        self.last_price[sid] = price
+        self._remark(sid)
+
+    def mark(self, prices: np.ndarray) -> None:
+        """Re-mark the whole universe from a price vector aligned to symbol IDs.
+
+        NaN entries keep the previous price, so partial vectors are safe.
+        """
+        n = len(self.index)
+        prices = np.asarray(prices, dtype=float)
+        if prices.shape != (n,):
+            raise ValueError(f"Expected {n} prices, got shape {prices.shape}")
+        last = self.last_price[:n]
+        np.copyto(last, prices, where=~np.isnan(prices))
+        unrealized = self.unrealized_pnl[:n]
+        np.multiply(last - self.avg_cost[:n], self.position[:n], out=unrealized)
+        self.total_unrealized_pnl = float(unrealized.sum())
+
+    def apply_fill(self, symbol: str, signed_qty: float, price: float) -> float:
+        """Book a fill at ``price`` and return the realized PnL it produced."""
+        sid = self.symbol_id(symbol)
+        position = self.position[sid]
+        avg_cost = self.avg_cost[sid]
+        new_position = position + signed_qty
+
+        realized = 0.0
+        if position == 0 or (position > 0) == (signed_qty > 0):
+            avg_cost = (
+                (position * avg_cost + signed_qty * price) / new_position if new_position else 0.0
+            )
+        else:
+            closed = min(abs(signed_qty), abs(position))
+            realized = (price - avg_cost) * closed * (1.0 if position > 0 else -1.0)
+            if new_position == 0:
+                avg_cost = 0.0
+            elif (new_position > 0) != (position > 0):
+                avg_cost = price
+
+        self.position[sid] = new_position
+        self.avg_cost[sid] = avg_cost
+        self.realized_pnl[sid] += realized
+        self.total_realized_pnl += realized
+        self._remark(sid)
+        return realized
+
+    def apply_fills(self, signed_qty: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """Book one fill per symbol from vectors aligned to symbol IDs; zero quantity skips.
+
+        Same accounting as ``apply_fill``; returns the realized PnL per symbol.
+        """
+        n = len(self.index)
+        qty = np.asarray(signed_qty, dtype=float)
+        prices = np.asarray(prices, dtype=float)
+        if qty.shape != (n,) or prices.shape != (n,):
+            raise ValueError(f"Expected {n} quantities and prices")
+        position = self.position[:n]
+        avg_cost = self.avg_cost[:n]
+        new_position = position + qty
+        filled = qty != 0
+        adding = (position == 0) | ((position > 0) == (qty > 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            blended = np.where(
+                new_position != 0, (position * avg_cost + qty * prices) / new_position, 0.0
+            )
+        flipped = np.where((new_position > 0) != (position > 0), prices, avg_cost)
+        reduced = np.where(new_position == 0, 0.0, flipped)
+        closed = np.minimum(np.abs(qty), np.abs(position))
+        realized = np.where(filled & ~adding, (prices - avg_cost) * closed * np.sign(position), 0.0)
+        np.copyto(avg_cost, np.where(adding, blended, reduced), where=filled)
+        position += qty
+        self.realized_pnl[:n] += realized
+        self.total_realized_pnl += float(realized.sum())
+        unrealized = self.unrealized_pnl[:n]
+        np.multiply(self.last_price[:n] - avg_cost, position, out=unrealized)
+        self.total_unrealized_pnl = float(unrealized.sum())
+        return realized
+
+    def _remark(self, sid: int) -> None:
+        unrealized = (self.last_price[sid] - self.avg_cost[sid]) * self.position[sid]
+        self.total_unrealized_pnl += unrealized - self.unrealized_pnl[sid]
+        self.unrealized_pnl[sid] = unrealized
+
+    def export_state(self) -> dict[str, np.ndarray]:
+        n = len(self.index)
+        state = {name: getattr(self, name)[:n].copy() for name in _LEDGER_COLUMNS}
+        state["symbols"] = np.array(self.index.symbols, dtype=str)
+        state["totals"] = np.array(
+            [self.total_realized_pnl, self.total_unrealized_pnl, self.reported_pnl]
+        )
+        return state
+
+    def restore_state(self, state: Mapping[str, np.ndarray]) -> None:
+        """Replace positions and PnL with an ``export_state`` snapshot.
+
+        Saved rows are mapped onto this ledger's symbol IDs (unknown symbols are
+        appended), so arrays aligned to an existing index stay aligned.
+        """
+        sids = np.array(
+            [self.symbol_id(symbol) for symbol in state["symbols"].tolist()], dtype=np.int64
+        )
+        for name in _LEDGER_COLUMNS:
+            column = getattr(self, name)
+            column[:] = 0.0
+            column[sids] = state[name]
+        totals = [float(value) for value in state["totals"]]
+        self.total_realized_pnl, self.total_unrealized_pnl = totals[:2]
+        # Checkpoints written before ``reported_pnl`` existed had reported everything.
+        self.reported_pnl = totals[2] if len(totals) > 2 else self.total_pnl
+
+    def snapshot(self, symbol: str) -> PositionSnapshot:
+        sid = self.index.get(symbol)
+        if sid is None:
+            position = avg_cost = last_price = realized = unrealized = 0.0
+        else:
+            position = float(self.position[sid])
+            avg_cost = float(self.avg_cost[sid])
+            last_price = float(self.last_price[sid])
+            realized = float(self.realized_pnl[sid])
+            unrealized = float(self.unrealized_pnl[sid])
+        return PositionSnapshot(
+            symbol=symbol,
+            position=position,
+            avg_cost=avg_cost,
+            last_price=last_price,
+            realized_pnl=realized,
+            unrealized_pnl=unrealized,
+            total_realized_pnl=self.total_realized_pnl,
+            total_unrealized_pnl=self.total_unrealized_pnl,
+        )
@@ -0,0 +1,301 @@
+"""Portfolio-level exposure and volatility limits across the whole universe.
+
+Dollar exposures ``w`` (position x mark) live in arrays indexed by symbol ID.
+The return covariance is an EWMA (RiskMetrics style, zero mean) folded in once
+per bar as a single in-place BLAS rank-1 update; the decay is carried in a
+scalar so the matrix is never rescaled. The engine keeps ``C @ w`` and
+``w' C w`` alongside it. A fill
+moves one entry of ``w``, so gross/net/sector exposure update in O(1) and the
+cached products in O(n); a pre-trade check needs only entry ``i`` of each and
+is O(1) however large the universe is.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+
+import numpy as np
+from scipy.linalg.blas import dger
+
+from app.config import settings
+from services.portfolio import SymbolIndex
+
+PERIODS_PER_YEAR = 252 * 390
+
+
+class PortfolioRisk:
+    """Incremental EWMA covariance plus gross/net/sector/concentration/volatility limits.
+
+    Limits are fractions of ``capital``; volatility is annualised dollar volatility
+    from per-bar returns. A check only flags a limit the trade would breach *and*
+    worsen, so risk-reducing trades always pass.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = (),
+        sectors: Mapping[str, str] | None = None,
+        capital: float = settings.portfolio_capital,
+        decay: float = settings.risk_ewma_decay,
+        max_gross_leverage: float = settings.max_gross_leverage,
+        max_net_leverage: float = settings.max_net_leverage,
+        max_sector_weight: float = settings.max_sector_weight,
+        max_symbol_weight: float = settings.max_symbol_weight,
+        max_portfolio_vol: float = settings.max_portfolio_vol,
+        periods_per_year: int = PERIODS_PER_YEAR,
+        capacity: int = 64,
+    ) -> None:
+        if not 0.0 < decay < 1.0:
+            raise ValueError("decay must be in (0, 1)")
+        self.capital = capital
+        self.decay = decay
+        self.max_gross = max_gross_leverage * capital
+        self.max_net = max_net_leverage * capital
+        self.max_sector = max_sector_weight * capital
+        self.max_symbol = max_symbol_weight * capital
+        self.max_variance = (max_portfolio_vol * capital) ** 2 / periods_per_year
+        self.periods_per_year = periods_per_year
+
+        self.index = SymbolIndex()
+        self.sector_index = SymbolIndex()
+        self._allocate(max(int(capacity), 1))
+        self.sector_exposure = np.zeros(0)
+        self.gross = 0.0
+        self.net = 0.0
+        self.variance = 0.0
+        self.bars = 0
+        self._bar_time: datetime | None = None
+        self._staged: np.ndarray | None = None
+
+        for symbol in symbols:
+            self.symbol_id(symbol)
+        for symbol, sector in (sectors or {}).items():
+            self.set_sector(symbol, sector)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def symbol_id(self, symbol: str) -> int:
+        sid = self.index.id(symbol)
+        if sid >= self._capacity:
+            self._grow(max(self._capacity * 2, sid + 1))
+        return sid
+
+    def _allocate(self, capacity: int) -> None:
+        self._capacity = capacity
+        self.position = np.zeros(capacity)
+        self.last_price = np.zeros(capacity)
+        self._bar_close = np.zeros(capacity)
+        self.exposure = np.zeros(capacity)
+        self.sector_id = np.full(capacity, -1, dtype=np.int64)
+        # Covariance is ``_cov_scale * _cov_raw``; column-major so fills read a contiguous column.
+        self._cov_raw = np.zeros((capacity, capacity), order="F")
+        self._cov_scale = 1.0
+        self._cov_w = np.zeros(capacity)
+
+    def _grow(self, capacity: int) -> None:
+        old = self._capacity
+        for name in ("position", "last_price", "_bar_close", "exposure", "_cov_w"):
+            grown = np.zeros(capacity)
+            grown[:old] = getattr(self, name)
+            setattr(self, name, grown)
+        sector_id = np.full(capacity, -1, dtype=np.int64)
+        sector_id[:old] = self.sector_id
+        self.sector_id = sector_id
+        cov = np.zeros((capacity, capacity), order="F")
+        cov[:old, :old] = self._cov_raw
+        self._cov_raw = cov
+        if self._staged is not None:
+            staged = np.full(capacity, np.nan)
+            staged[:old] = self._staged
+            self._staged = staged
+        self._capacity = capacity
+
+    def set_sector(self, symbol: str, sector: str) -> None:
+        sid = self.symbol_id(symbol)
+        previous = self.sector_id[sid]
+        if previous >= 0:
+            self.sector_exposure[previous] -= self.exposure[sid]
+        new = self.sector_index.id(sector)
+        if new >= len(self.sector_exposure):
+            padding = np.zeros(new + 1 - len(self.sector_exposure))
+            self.sector_exposure = np.concatenate([self.sector_exposure, padding])
+        self.sector_id[sid] = new
+        self.sector_exposure[new] += self.exposure[sid]
+
+    # -- market data -------------------------------------------------------
+
+    def update_prices(self, prices: np.ndarray) -> None:
+        """Close one bar for the universe from a price vector aligned to ``index``.
+
+        Folds the returns since the previous bar into the covariance (NaN or
+        unseen prices count as a zero return), re-marks every exposure and
+        refreshes the cached products.
+        """
+        n = len(self.index)
+        prices = np.asarray(prices, dtype=float)
+        if prices.shape != (n,):
+            raise ValueError(f"Expected {n} prices, got shape {prices.shape}")
+        close = self._bar_close[:n]
+        valid = np.isfinite(prices) & (prices > 0)
+        returns = np.zeros(self._capacity)
+        seen = valid & (close > 0)
+        np.divide(prices, close, out=returns[:n], where=seen)
+        returns[:n][seen] -= 1.0
+        self._cov_scale *= self.decay
+        alpha = (1.0 - self.decay) / self._cov_scale
+        self._cov_raw = dger(alpha, returns, returns, a=self._cov_raw, overwrite_a=True)
+        if self._cov_scale < 1e-100:
+            self._cov_raw *= self._cov_scale
+            self._cov_scale = 1.0
+        np.copyto(close, prices, where=valid)
+        np.copyto(self.last_price[:n], prices, where=valid)
+        self.bars += 1
+        self.recompute()
+
+    def observe(self, symbol: str, timestamp: datetime, price: float) -> None:
+        """Stage one symbol's bar close; the bar is folded in once a later timestamp arrives.
+
+        Lets per-symbol loops (e.g. the orchestrator) drive ``update_prices``
+        without assembling the price vector themselves.
+        """
+        sid = self.symbol_id(symbol)
+        if self._bar_time is not None and timestamp > self._bar_time:
+            self.update_prices(self._staged[: len(self.index)])
+            self._staged = None
+        if self._staged is None:
+            self._staged = np.full(self._capacity, np.nan)
+        if self._bar_time is None or timestamp >= self._bar_time:
+            self._bar_time = timestamp
+            self._staged[sid] = price
+        self.mark(symbol, price)
+
+    def mark(self, symbol: str, price: float) -> None:
+        """Re-mark one symbol's exposure in O(n) without touching the covariance."""
+        sid = self.symbol_id(symbol)
+        self.last_price[sid] = price
+        self._shift(sid, self.position[sid] * price - self.exposure[sid])
+
+    def recompute(self) -> None:
+        """Rebuild exposures and cached products from positions and marks."""
+        n = len(self.index)
+        exposure = self.exposure[:n]
+        np.multiply(self.position[:n], self.last_price[:n], out=exposure)
+        self.gross = float(np.abs(exposure).sum())
+        self.net = float(exposure.sum())
+        sectors = self.sector_id[:n]
+        assigned = sectors >= 0
+        self.sector_exposure = np.bincount(
+            sectors[assigned], weights=exposure[assigned], minlength=len(self.sector_index)
+        ).astype(float)
+        np.dot(self._cov_raw, self.exposure, out=self._cov_w)
+        self._cov_w *= self._cov_scale
+        self.variance = float(exposure @ self._cov_w[:n])
+
+    @property
+    def cov(self) -> np.ndarray:
+        """Current covariance of per-bar returns (a copy, aligned to ``index``)."""
+        n = len(self.index)
+        return self._cov_scale * self._cov_raw[:n, :n]
+
+    def export_state(self) -> dict[str, np.ndarray]:
+        """Positions, marks, sectors and covariance; exposures are rebuilt on restore."""
+        n = len(self.index)
+        return {
+            "symbols": np.array(self.index.symbols, dtype=str),
+            "sectors": np.array(self.sector_index.symbols, dtype=str),
+            "sector_id": self.sector_id[:n].copy(),
+            "position": self.position[:n].copy(),
+            "last_price": self.last_price[:n].copy(),
+            "bar_close": self._bar_close[:n].copy(),
+            "cov": self.cov,
+            "bars": np.array([self.bars], dtype=np.int64),
+        }
+
+    def restore_state(self, state: Mapping[str, np.ndarray]) -> None:
+        symbols = state["symbols"].tolist()
+        n = len(symbols)
+        self.index = SymbolIndex(symbols)
+        self.sector_index = SymbolIndex(state["sectors"].tolist())
+        self._allocate(max(n, 1))
+        self.sector_id[:n] = state["sector_id"]
+        self.position[:n] = state["position"]
+        self.last_price[:n] = state["last_price"]
+        self._bar_close[:n] = state["bar_close"]
+        self._cov_raw[:n, :n] = state["cov"]
+        self.bars = int(state["bars"][0])
+        self._bar_time = None
+        self._staged = None
+        self.recompute()
+
+    # -- positions ---------------------------------------------------------
+
+    def apply_fill(self, symbol: str, signed_qty: float, price: float | None = None) -> None:
+        """Book a fill; exposure is valued at ``price`` if given, else the last mark."""
+        sid = self.symbol_id(symbol)
+        if price is not None:
+            self.last_price[sid] = price
+        self.position[sid] += signed_qty
+        self._shift(sid, self.position[sid] * self.last_price[sid] - self.exposure[sid])
+
+    def _shift(self, sid: int, delta: float) -> None:
+        if delta == 0.0:
+            return
+        n = len(self.index)
+        before = self.exposure[sid]
+        after = before + delta
+        self.gross += abs(after) - abs(before)
+        self.net += delta
+        sector = self.sector_id[sid]
+        if sector >= 0:
+            self.sector_exposure[sector] += delta
+        column = self._cov_raw[:n, sid]
+        scaled = delta * self._cov_scale
+        self.variance += 2.0 * delta * self._cov_w[sid] + scaled * delta * column[sid]
+        self._cov_w[:n] += scaled * column
+        self.exposure[sid] = after
+
+    # -- checks ------------------------------------------------------------
+
+    def check(self, symbol: str, signed_qty: float, price: float | None = None) -> list[str]:
+        """Guardrails a trade of ``signed_qty`` would trip, in O(1)."""
+        sid = self.symbol_id(symbol)
+        mark = price if price else self.last_price[sid]
+        before = self.exposure[sid]
+        delta = (self.position[sid] + signed_qty) * mark - before
+        after = before + delta
+
+        guardrails: list[str] = []
+        gross = self.gross + abs(after) - abs(before)
+        if gross > self.max_gross and gross > self.gross:
+            guardrails.append("max_gross_exposure")
+        net = self.net + delta
+        if abs(net) > self.max_net and abs(net) > abs(self.net):
+            guardrails.append("max_net_exposure")
+        sector = self.sector_id[sid]
+        if sector >= 0:
+            current = self.sector_exposure[sector]
+            if abs(current + delta) > self.max_sector and abs(current + delta) > abs(current):
+                guardrails.append("max_sector_exposure")
+        if abs(after) > self.max_symbol and abs(after) > abs(before):
+            guardrails.append("max_concentration")
+        own_variance = self._cov_scale * self._cov_raw[sid, sid]
+        variance = self.variance + delta * (2.0 * self._cov_w[sid] + delta * own_variance)
+        if variance > self.max_variance and variance > self.variance:
+            guardrails.append("max_portfolio_vol")
+        return guardrails
+
+    @property
+    def volatility(self) -> float:
+        """Annualised dollar volatility of the current book."""
+        return float(np.sqrt(max(self.variance, 0.0) * self.periods_per_year))
+
+    def summary(self) -> dict[str, float]:
+        sectors = np.abs(self.sector_exposure)
+        return {
+            "gross_exposure": self.gross,
+            "net_exposure": self.net,
+            "portfolio_vol": self.volatility,
+            "max_sector_exposure": float(sectors.max()) if len(sectors) else 0.0,
+        }
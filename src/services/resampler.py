@@ -0,0 +1,183 @@
+"""Streaming roll-up of base bars into higher-timeframe OHLCV bars."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.checkpoint import arrays_to_bars, bars_to_arrays
+from app.records import BarRecord
+from app.utils.time_windows import floor_to_interval, from_epoch_ns, to_epoch_ns
+
+TIMEFRAME_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "1d": 86400}
+
+
+def parse_timeframe(timeframe: str) -> int:
+    if timeframe in TIMEFRAME_SECONDS:
+        return TIMEFRAME_SECONDS[timeframe]
+    unit = {"s": 1, "m": 60, "h": 3600, "d": 86400}.get(timeframe[-1:])
+    if unit is None or not timeframe[:-1].isdigit():
+        raise ValueError(f"Unsupported timeframe {timeframe!r}")
+    return int(timeframe[:-1]) * unit
+
+
+@dataclass(slots=True)
+class _OpenBar:
+    start: datetime
+    end: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    def to_record(self, symbol: str) -> BarRecord:
+        return BarRecord(
+            self.start, symbol, self.open, self.high, self.low, self.close, self.volume
+        )
+
+
+class StreamingResampler:
+    """Maintains per-symbol higher-timeframe bars incrementally from a base bar feed.
+
+    Buckets are aligned with ``floor_to_interval`` on the UTC epoch (so ``1d`` closes
+    at UTC midnight) and labelled by their start time. Each (symbol, timeframe) keeps
+    at most ``max_bars`` completed bars plus the bar currently forming. Base bars at
+    or before the last one seen for a symbol are ignored, so overlapping provider
+    windows can be fed repeatedly.
+    """
+
+    def __init__(self, timeframes: Sequence[str] = ("5m", "15m", "1h", "1d"), max_bars: int = 256):
+        self.timeframes = {timeframe: parse_timeframe(timeframe) for timeframe in timeframes}
+        self.max_bars = max_bars
+        self._closed: dict[tuple[str, str], deque[BarRecord]] = {}
+        self._open: dict[tuple[str, str], _OpenBar] = {}
+        self._last_seen: dict[str, datetime] = {}
+
+    def update(self, bar: BarRecord) -> list[tuple[str, BarRecord]]:
+        """Fold one base bar in; returns the (timeframe, bar) pairs it completed."""
+        symbol = bar.symbol
+        last = self._last_seen.get(symbol)
+        if last is not None and bar.timestamp <= last:
+            return []
+        self._last_seen[symbol] = bar.timestamp
+
+        completed = []
+        for timeframe, seconds in self.timeframes.items():
+            key = (symbol, timeframe)
+            current = self._open.get(key)
+            if current is not None and bar.timestamp >= current.end:
+                record = current.to_record(symbol)
+                closed = self._closed.get(key)
+                if closed is None:
+                    closed = self._closed[key] = deque(maxlen=self.max_bars)
+                closed.append(record)
+                completed.append((timeframe, record))
+                current = None
+            if current is None:
+                start = floor_to_interval(bar.timestamp, seconds)
+                end = start + timedelta(seconds=seconds)
+                self._open[key] = _OpenBar(
+                    start, end, bar.open, bar.high, bar.low, bar.close, bar.volume
+                )
+            else:
+                if bar.high > current.high:
+                    current.high = bar.high
+                if bar.low < current.low:
+                    current.low = bar.low
+                current.close = bar.close
+                current.volume += bar.volume
+        return completed
+
+    def extend(self, bars: Sequence[BarRecord]) -> list[tuple[str, BarRecord]]:
+        """Feed a chronological window, skipping the prefix that was already seen."""
+        if not bars:
+            return []
+        last = self._last_seen.get(bars[-1].symbol)
+        start = len(bars)
+        while start > 0 and (last is None or bars[start - 1].timestamp > last):
+            start -= 1
+        completed = []
+        for bar in bars[start:]:
+            completed.extend(self.update(bar))
+        return completed
+
+    def bars(self, symbol: str, timeframe: str, include_partial: bool = True) -> list[BarRecord]:
+        bars = list(self._closed.get((symbol, timeframe), ()))
+        current = self._open.get((symbol, timeframe))
+        if include_partial and current is not None:
+            bars.append(current.to_record(symbol))
+        return bars
+
+    def columns(
+        self, symbol: str, timeframe: str, include_partial: bool = True
+    ) -> tuple[datetime | None, dict[str, np.ndarray]]:
+        """Chronological OHLCV arrays for ``FeatureStore.build_features_from_columns``."""
+        bars = self.bars(symbol, timeframe, include_partial=include_partial)
+        count = len(bars)
+        columns = {
+            name: np.fromiter((getattr(bar, name) for bar in bars), dtype=float, count=count)
+            for name in ("open", "high", "low", "close", "volume")
+        }
+        return (bars[-1].timestamp if bars else None), columns
+
+    def symbols(self) -> Iterable[str]:
+        return self._last_seen.keys()
+
+    def export_state(self) -> dict[str, np.ndarray]:
+        """Completed and forming bars per (symbol, timeframe), plus the last base bar seen."""
+        keys = sorted(set(self._closed) | set(self._open))
+        codes = {key: code for code, key in enumerate(keys)}
+        closed = [(codes[key], bar) for key in keys for bar in self._closed.get(key, ())]
+        forming = [
+            (codes[key], self._open[key].to_record(key[0])) for key in keys if key in self._open
+        ]
+        state = {
+            "key_symbol": np.array([symbol for symbol, _ in keys], dtype=str),
+            "key_timeframe": np.array([timeframe for _, timeframe in keys], dtype=str),
+            "closed_key": np.array([code for code, _ in closed], dtype=np.int64),
+            "open_key": np.array([code for code, _ in forming], dtype=np.int64),
+            "seen_symbol": np.array(list(self._last_seen), dtype=str),
+            "seen_ts": np.array(
+                [to_epoch_ns(ts) for ts in self._last_seen.values()], dtype=np.int64
+            ),
+        }
+        state.update(bars_to_arrays([bar for _, bar in closed], prefix="closed_"))
+        state.update(bars_to_arrays([bar for _, bar in forming], prefix="open_"))
+        return state
+
+    def restore_state(self, state: Mapping[str, np.ndarray]) -> None:
+        """Load an ``export_state`` snapshot, skipping timeframes this resampler doesn't track."""
+        keys = list(zip(state["key_symbol"].tolist(), state["key_timeframe"].tolist(), strict=True))
+        self._closed.clear()
+        self._open.clear()
+        codes = state["closed_key"].tolist()
+        for code, bar in zip(
+            codes,
+            arrays_to_bars(state, [keys[code][0] for code in codes], prefix="closed_"),
+            strict=True,
+        ):
+            if keys[code][1] in self.timeframes:
+                self._closed.setdefault(keys[code], deque(maxlen=self.max_bars)).append(bar)
+        codes = state["open_key"].tolist()
+        for code, bar in zip(
+            codes,
+            arrays_to_bars(state, [keys[code][0] for code in codes], prefix="open_"),
+            strict=True,
+        ):
+            seconds = self.timeframes.get(keys[code][1])
+            if seconds is not None:
+                end = bar.timestamp + timedelta(seconds=seconds)
+                self._open[keys[code]] = _OpenBar(
+                    bar.timestamp, end, bar.open, bar.high, bar.low, bar.close, bar.volume
+                )
+        self._last_seen = {
+            symbol: from_epoch_ns(ts)
+            for symbol, ts in zip(
+                state["seen_symbol"].tolist(), state["seen_ts"].tolist(), strict=True
+            )
+        }
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from app.config import settings
-from app.schemas import JudgeDecision
+from app.records import DecisionRecord
 from app.utils.time_windows import is_regular_trading_hours
 
+if TYPE_CHECKING:  # pragma: no cover
+    from services.portfolio_risk import PortfolioRisk
+
 
 @dataclass
 class RiskContext:
@@ -14,16 +18,27 @@ class RiskContext:
     symbol: str
     current_position: float
     cumulative_pnl: float
+    mark_price: float | None = None
 
 
 class RiskManager:
-    """Implements guardrails for trading decisions."""
+    """Implements guardrails for trading decisions.
+
+    With a ``portfolio`` attached, trades are also checked against its
+    universe-wide exposure and volatility limits.
+    """
 
-    def __init__(self, max_position: float = settings.max_position, max_daily_loss: float = settings.max_daily_loss):
+    def __init__(
+        self,
+        max_position: float = settings.max_position,
+        max_daily_loss: float = settings.max_daily_loss,
+        portfolio: PortfolioRisk | None = None,
+    ):
         self.max_position = max_position
         self.max_daily_loss = max_daily_loss
+        self.portfolio = portfolio
 
-    def evaluate(self, decision: JudgeDecision, context: RiskContext) -> JudgeDecision:
+    def evaluate(self, decision: DecisionRecord, context: RiskContext) -> DecisionRecord:
         guardrails: list[str] = []
 
         if not is_regular_trading_hours(context.timestamp):
@@ -41,8 +56,12 @@ class RiskManager:
         if context.cumulative_pnl < -abs(self.max_daily_loss):
             guardrails.append("max_daily_loss")
 
+        if self.portfolio is not None and projected_position != context.current_position:
+            signed_qty = projected_position - context.current_position
+            guardrails.extend(self.portfolio.check(context.symbol, signed_qty, context.mark_price))
+
         if guardrails:
-            return JudgeDecision(
+            return DecisionRecord(
                 timestamp=decision.timestamp,
                 symbol=decision.symbol,
                 action="HOLD",
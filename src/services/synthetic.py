@@ -0,0 +1,209 @@
+"""Vectorized, time-continuous synthetic market for load and scale testing.
+
+Log returns follow a GBM with a market-wide two-state volatility regime, a
+single-factor correlation structure and Poisson jumps::
+
+    r[i, t] = mu - var[t]/2 + sigma * vol[t] * (beta * f[t] + sqrt(1 - beta^2) * e[i, t]) + J[i, t]
+
+with ``beta = sqrt(correlation)`` so any two symbols have return correlation
+``correlation`` (before jumps). Every symbol draws from its own streams derived
+from ``(seed, crc32(symbol))``, so a symbol's path is the same whatever else is
+in the universe. Each stream draws one kind of variate, so paths do not depend
+(beyond floating-point rounding) on how generation is split into calls. Each bar
+opens at the previous close.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import numpy as np
+
+from app.records import BarRecord
+from app.utils.time_windows import floor_to_interval, from_epoch_ns, to_epoch_ns
+
+_SHOCKS = 5  # idiosyncratic return, high wick, low wick, volume, jump size
+
+
+@dataclass
+class SyntheticBars:
+    """A generated block: ``timestamps[steps]`` (epoch ns) and ``[symbols, steps]`` OHLCV arrays."""
+
+    symbols: list[str]
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return self.close.size
+
+    def records(self, symbol: str) -> list[BarRecord]:
+        row = self.symbols.index(symbol)
+        timestamps = [from_epoch_ns(ts) for ts in self.timestamps.tolist()]
+        return [
+            BarRecord(ts, symbol, open_, high, low, close, volume)
+            for ts, open_, high, low, close, volume in zip(
+                timestamps,
+                self.open[row].tolist(),
+                self.high[row].tolist(),
+                self.low[row].tolist(),
+                self.close[row].tolist(),
+                self.volume[row].tolist(),
+                strict=True,
+            )
+        ]
+
+
+class _SymbolState:
+    __slots__ = ("shocks", "arrivals", "close", "cursor")
+
+    def __init__(self, seed: int, symbol: str, start_price: float) -> None:
+        spawn_key = (zlib.crc32(symbol.encode()),)
+        shocks, arrivals, init = np.random.SeedSequence(seed, spawn_key=spawn_key).spawn(3)
+        self.shocks = np.random.default_rng(shocks)
+        self.arrivals = np.random.default_rng(arrivals)
+        self.close = start_price * float(np.exp(np.random.default_rng(init).normal(0.0, 0.5)))
+        self.cursor = 0
+
+
+class SyntheticMarket:
+    """Stateful generator; each symbol advances along one continuous path from ``start``."""
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = (),
+        seed: int = 42,
+        start: datetime | None = None,
+        interval_seconds: int = 60,
+        mu: float = 0.0,
+        sigma: float = 0.001,
+        correlation: float = 0.3,
+        regime_vol: tuple[float, float] = (1.0, 2.5),
+        regime_switch: float = 0.002,
+        jump_intensity: float = 0.0005,
+        jump_scale: float = 0.01,
+        start_price: float = 100.0,
+        base_volume: float = 1_000_000.0,
+    ) -> None:
+        if not 0.0 <= correlation <= 1.0:
+            raise ValueError("correlation must be within [0, 1]")
+        start = start or datetime(2024, 1, 2, 14, 30, tzinfo=UTC)
+        self.start_ns = to_epoch_ns(floor_to_interval(start, interval_seconds))
+        self.interval_ns = interval_seconds * 1_000_000_000
+        self.seed = seed
+        self.mu = mu
+        self.sigma = sigma
+        self.beta = float(np.sqrt(correlation))
+        self.idio = float(np.sqrt(1.0 - correlation))
+        self.regime_vol = np.asarray(regime_vol, dtype=float)
+        self.regime_switch = regime_switch
+        self.jump_intensity = jump_intensity
+        self.jump_scale = jump_scale
+        self.start_price = start_price
+        self.base_volume = base_volume
+
+        factor, regime = np.random.SeedSequence(seed).spawn(2)
+        self._factor_rng = np.random.default_rng(factor)
+        self._regime_rng = np.random.default_rng(regime)
+        self._factor = np.empty(0)
+        self._vol = np.empty(0)
+        self._regime = 0
+        self._states: dict[str, _SymbolState] = {}
+        for symbol in symbols:
+            self.add_symbol(symbol)
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._states)
+
+    def add_symbol(self, symbol: str) -> None:
+        if symbol not in self._states:
+            self._states[symbol] = _SymbolState(self.seed, symbol, self.start_price)
+
+    def cursor(self, symbol: str) -> int:
+        """Number of bars generated so far for ``symbol``."""
+        return self._states[symbol].cursor
+
+    def index_at(self, timestamp: datetime) -> int:
+        """Index of the bar that covers ``timestamp``."""
+        return (to_epoch_ns(timestamp) - self.start_ns) // self.interval_ns
+
+    def _extend_factor(self, stop: int) -> None:
+        have = self._factor.size
+        if stop <= have:
+            return
+        count = max(stop - have, 1024)
+        flips = self._regime_rng.random(count) < self.regime_switch
+        regime = (self._regime + np.cumsum(flips)) % 2
+        self._regime = int(regime[-1])
+        self._factor = np.concatenate([self._factor, self._factor_rng.standard_normal(count)])
+        self._vol = np.concatenate([self._vol, self.regime_vol[regime]])
+
+    def _generate(self, state: _SymbolState, stop: int) -> tuple[np.ndarray, ...]:
+        begin = state.cursor
+        steps = stop - begin
+        self._extend_factor(stop)
+        shocks = state.shocks.standard_normal((steps, _SHOCKS))
+        jumps = state.arrivals.random(steps) < self.jump_intensity
+        scale = self.sigma * self._vol[begin:stop]
+        returns = (
+            self.mu
+            - 0.5 * scale**2
+            + scale * (self.beta * self._factor[begin:stop] + self.idio * shocks[:, 0])
+            + np.where(jumps, self.jump_scale * shocks[:, 4], 0.0)
+        )
+        close = state.close * np.exp(np.cumsum(returns))
+        open_ = np.empty(steps)
+        open_[0] = state.close
+        open_[1:] = close[:-1]
+        high = np.maximum(open_, close) * np.exp(0.5 * scale * np.abs(shocks[:, 1]))
+        low = np.minimum(open_, close) * np.exp(-0.5 * scale * np.abs(shocks[:, 2]))
+        volume = (
+            self.base_volume * np.exp(0.25 * shocks[:, 3]) * (1.0 + np.abs(returns) / self.sigma)
+        )
+        state.close = float(close[-1])
+        state.cursor = stop
+        return open_, high, low, close, volume
+
+    def advance_symbol(self, symbol: str, stop: int) -> SyntheticBars:
+        """Generate ``symbol`` up to (excluding) bar index ``stop``."""
+        self.add_symbol(symbol)
+        state = self._states[symbol]
+        begin = state.cursor
+        if stop <= begin:
+            empty = np.empty((1, 0))
+            return SyntheticBars(
+                [symbol], np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty
+            )
+        columns = self._generate(state, stop)
+        return SyntheticBars(
+            [symbol], self._timestamps(begin, stop), *(column[None, :] for column in columns)
+        )
+
+    def advance(self, steps: int, symbols: Sequence[str] | None = None) -> SyntheticBars:
+        """Generate the next ``steps`` bars for every (or the given) symbol in lockstep."""
+        if steps < 1:
+            raise ValueError("steps must be >= 1")
+        symbols = list(symbols) if symbols is not None else self.symbols
+        for symbol in symbols:
+            self.add_symbol(symbol)
+        begin = self._states[symbols[0]].cursor if symbols else 0
+        if any(self._states[symbol].cursor != begin for symbol in symbols):
+            raise ValueError(
+                "advance() needs symbols at the same cursor; use advance_symbol() to catch up"
+            )
+        stop = begin + steps
+        columns = np.empty((5, len(symbols), steps))
+        for row, symbol in enumerate(symbols):
+            for idx, column in enumerate(self._generate(self._states[symbol], stop)):
+                columns[idx, row] = column
+        return SyntheticBars(symbols, self._timestamps(begin, stop), *columns)
+
+    def _timestamps(self, begin: int, stop: int) -> np.ndarray:
+        return self.start_ns + np.arange(begin, stop, dtype=np.int64) * self.interval_ns
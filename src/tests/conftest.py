@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+
+
+def pytest_configure(config):
+    # app.telemetry and app.main open their SQLite stores at import time; keep those
+    # out of the working tree. Tests that read them use the fixtures below.
+    scratch = tempfile.mkdtemp(prefix="market-mind-tests-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch}/paper_trades.db"
+    os.environ["STATE_URL"] = f"sqlite:///{scratch}/api_state.db"
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch) -> str:
+    url = f"sqlite:///{tmp_path}/paper_trades.db"
+    monkeypatch.setenv("DATABASE_URL", url)
+    return url
+
+
+@pytest.fixture
+def state_url(tmp_path, monkeypatch) -> str:
+    url = f"sqlite:///{tmp_path}/api_state.db"
+    monkeypatch.setenv("STATE_URL", url)
+    return url
+
+
+@pytest.fixture
+def api(database_url, state_url, monkeypatch):
+    """``TestClient`` for the API with its state store and fill log under ``tmp_path``."""
+    from fastapi.testclient import TestClient
+
+    from app import main
+    from app.state import SharedStateStore
+    from app.telemetry import TelemetryStore
+
+    main.orchestrator.events.flush()
+    monkeypatch.setattr(main, "state", SharedStateStore(database_url=state_url))
+    monkeypatch.setattr(main.telemetry, "database_url", TelemetryStore(database_url).database_url)
+    yield TestClient(main.app)
+    main.orchestrator.events.flush()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.records import DecisionRecord, FillRecord
+from app.runner import build_orchestrator
+from app.telemetry import TelemetryStore
+from pipelines.backtest import BacktestResult, run_backtest
+from services.portfolio import PortfolioLedger
+
+T0 = datetime(2024, 1, 2, 14, 30, tzinfo=UTC)
+
+
+def sample_records(count: int) -> tuple[list[DecisionRecord], list[FillRecord]]:
+    decisions, fills = [], []
+    for idx in range(count):
+        ts = T0 + timedelta(minutes=idx)
+        action = ("HOLD", "BUY", "SELL")[idx % 3]
+        guardrails = ["market_closed"] if idx % 5 == 0 else []
+        rationale = [
+            f"factual_score={idx % 7 / 10:.2f}",
+            "subjective_score=0.10",
+            f"intent={idx % 11 / 10:.2f}",
+        ]
+        symbol = ("AAPL", "MSFT")[idx % 2]
+        decisions.append(DecisionRecord(ts, symbol, action, idx / 100, 0.5, rationale, guardrails))
+        if action != "HOLD":
+            fills.append(
+                FillRecord(ts, "AAPL", action, 100.0 + idx, idx / 100, 5.0, 50.0 + idx % 3)
+            )
+    return decisions, fills
+
+
+def test_round_trip_across_spilled_chunks(tmp_path):
+    decisions, fills = sample_records(250)
+    result = BacktestResult(chunk_size=64, spill_dir=tmp_path / "spill")
+    for decision in decisions:
+        result.add_decision(decision)
+    for fill in fills:
+        result.add_fill(fill)
+
+    assert len(list((tmp_path / "spill").glob("decisions-*/*.npz"))) == 3
+    assert result.decisions == decisions
+    assert result.fills == fills
+    assert result.trades == len(fills)
+    # Rationale/guardrail strings are interned: far fewer distinct strings than occurrences.
+    assert len(result.pool) < 40
+    result.close()
+    assert not any((tmp_path / "spill").iterdir())
+
+
+def test_results_sharing_a_spill_dir_keep_their_own_chunks(tmp_path):
+    decisions, _ = sample_records(8)
+    first = BacktestResult(chunk_size=2, spill_dir=tmp_path)
+    second = BacktestResult(chunk_size=2, spill_dir=tmp_path)
+    for decision in decisions:
+        first.add_decision(decision)
+    for decision in reversed(decisions):
+        second.add_decision(decision)
+
+    assert first.decisions == decisions
+    assert second.decisions == decisions[::-1]
+    del second
+    assert len(list(tmp_path.glob("decisions-*/*.npz"))) == 4
+
+
+def test_list_columns_hold_more_than_255_items(tmp_path):
+    decisions, _ = sample_records(4)
+    decisions[1].rationale = [f"note={idx}" for idx in range(300)]
+    result = BacktestResult(chunk_size=2, spill_dir=tmp_path / "spill")
+    for decision in decisions:
+        result.add_decision(decision)
+    assert result.decisions == decisions
+
+
+def test_compact_footprint_and_exports(tmp_path):
+    decisions, fills = sample_records(3_000)
+    result = BacktestResult()
+    for decision in decisions:
+        result.add_decision(decision)
+    for fill in fills:
+        result.add_fill(fill)
+    assert result.nbytes() / len(result) < 100
+
+    frame = result.to_frame()
+    assert list(frame["action"][:3]) == ["HOLD", "BUY", "SELL"]
+    assert frame["timestamp"].iloc[1] == T0 + timedelta(minutes=1)
+    assert frame["guardrails"].iloc[0] == "market_closed"
+
+    result.to_npz(tmp_path / "result.npz")
+    with np.load(tmp_path / "result.npz") as stored:
+        np.testing.assert_array_equal(stored["decisions.size"], [d.size for d in decisions])
+        assert stored["fills.price"].size == len(fills)
+        assert list(stored["actions"]) == ["HOLD", "BUY", "SELL"]
+
+
+def test_backtest_steps_the_provider_clock():
+    orchestrator = build_orchestrator()
+    result = run_backtest(orchestrator, symbol="AAPL", start=T0, end=T0 + timedelta(minutes=59))
+    expected = [T0 + timedelta(minutes=i) for i in range(60)]
+    assert [decision.timestamp for decision in result.decisions] == expected
+    assert orchestrator.factual_agent.cache.stats()["hits"] == 0
+    assert orchestrator.factual_agent.provider.as_of is None
+
+
+def test_telemetry_pnl_includes_price_moves_between_fills(database_url):
+    orchestrator = build_orchestrator()
+    orchestrator.telemetry = TelemetryStore(database_url)
+    start = datetime(2024, 1, 2, 15, tzinfo=UTC)
+    result = run_backtest(orchestrator, symbol="AAPL", start=start, end=start + timedelta(hours=4))
+    fills = result.fills
+    assert len(fills) > 1
+
+    # Rebuild the ledger from the fills and mark it at the last fill's pre-slippage price.
+    ledger = PortfolioLedger()
+    for fill in fills:
+        signed_qty = fill.size if fill.action == "BUY" else -fill.size
+        ledger.apply_fill(fill.symbol, signed_qty, fill.price)
+    last = fills[-1]
+    slip = last.slippage_bps / 1e4
+    ledger.update_price(last.symbol, last.price / (1 + slip if last.action == "BUY" else 1 - slip))
+    assert orchestrator.telemetry.pnl_history[-1] == pytest.approx(ledger.total_pnl)
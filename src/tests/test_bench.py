@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import structlog
+
+from app.bench import BenchResult, compare, results_to_json, run_suite
+from app.runner import _report_and_gate
+
+
+def make_result(name: str, value: float, higher_is_better: bool = False) -> BenchResult:
+    return BenchResult(
+        name=name,
+        metric="bars_per_sec" if higher_is_better else "p50_us",
+        value=value,
+        higher_is_better=higher_is_better,
+        iterations=10,
+        p50_us=value,
+        p99_us=value,
+    )
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = results_to_json([make_result("step", 100.0), make_result("backtest", 200.0, True)])
+    baseline["results"]["step"]["tolerance"] = 0.5
+
+    within = [make_result("step", 140.0), make_result("backtest", 180.0, True)]
+    assert compare(within, baseline, 0.2) == []
+
+    regressions = compare(
+        [make_result("step", 160.0), make_result("backtest", 100.0, True)], baseline, 0.2
+    )
+    assert [reg.name for reg in regressions] == ["step", "backtest"]
+    assert regressions[1].change == -0.5
+
+
+def test_run_suite_emits_selected_cases():
+    results = run_suite(["sentiment"], scale=0.001)
+    assert [result.name for result in results] == ["sentiment"]
+    assert results[0].value > 0
+
+
+def test_run_suite_restores_logging_config():
+    before = structlog.get_config()
+    run_suite(["sentiment"], scale=0.001)
+    assert structlog.get_config() == before
+
+
+def test_saved_baseline_and_output_end_with_a_newline(tmp_path):
+    results = [make_result("step", 100.0)]
+    baseline, output = tmp_path / "bench" / "baseline.json", tmp_path / "results.json"
+    _report_and_gate(results, results_to_json(results), output, baseline, 0.2, save_baseline=True)
+    assert baseline.read_text().endswith("}\n")
+    assert output.read_text() == baseline.read_text()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.checkpoint import (
+    CHECKPOINT_VERSION,
+    Checkpointer,
+    read_checkpoint,
+    restore_checkpoint,
+    write_checkpoint,
+)
+from app.records import BarRecord, FillRecord
+from app.telemetry import TelemetryStore
+from services.ingestion import StreamingMarketDataProvider
+from services.portfolio import PortfolioLedger
+from services.portfolio_risk import PortfolioRisk
+from services.resampler import StreamingResampler
+
+T0 = datetime(2024, 1, 2, 14, 30, tzinfo=UTC)
+
+
+def _components(tmp_path, name: str) -> dict:
+    return {
+        "ledger": PortfolioLedger(),
+        "telemetry": TelemetryStore(database_url=f"sqlite:///{tmp_path}/{name}.db"),
+        "resampler": StreamingResampler(("5m", "1h")),
+        "bars": StreamingMarketDataProvider(window=50),
+        "portfolio_risk": PortfolioRisk(sectors={"AAA": "tech"}),
+    }
+
+
+def test_round_trip_restores_warm_state(tmp_path):
+    warm = _components(tmp_path, "warm")
+    rng = np.random.default_rng(5)
+    for symbol in ("AAA", "BBB", "CCC"):
+        for minute in range(90):
+            price = 100 + rng.normal()
+            bar = BarRecord(
+                T0 + timedelta(minutes=minute), symbol, price, price + 1, price - 1, price, 1_000.0
+            )
+            warm["bars"].on_bar(bar)
+            warm["resampler"].update(bar)
+            warm["portfolio_risk"].observe(symbol, bar.timestamp, price)
+        warm["ledger"].apply_fill(symbol, 10, 100.0)
+        warm["ledger"].update_price(symbol, 101.0)
+        warm["portfolio_risk"].apply_fill(symbol, 10)
+        fill = FillRecord(T0 + timedelta(minutes=90), symbol, "BUY", 100.0, 10, 5.0, 50.0)
+        warm["telemetry"].record_fill(fill, pnl_delta=1.5)
+
+    path = write_checkpoint(tmp_path / "state" / "checkpoint.npz", warm)
+    assert [item.name for item in path.parent.iterdir()] == ["checkpoint.npz"]
+
+    cold = _components(tmp_path, "cold")
+    cold["ledger"].symbol_id("ZZZ")
+    header = restore_checkpoint(path, cold)
+    assert header["components"] == sorted(warm)
+
+    assert cold["bars"].get_bars("BBB", 120) == warm["bars"].get_bars("BBB", 120)
+    assert cold["resampler"].bars("CCC", "5m") == warm["resampler"].bars("CCC", "5m")
+    assert cold["resampler"].update(BarRecord(T0, "CCC", 1, 1, 1, 1, 1)) == []
+    assert cold["ledger"].snapshot("AAA") == warm["ledger"].snapshot("AAA")
+    assert cold["ledger"].position_of("ZZZ") == 0.0
+    assert list(cold["telemetry"].pnl_history) == pytest.approx([1.5, 3.0, 4.5])
+    start, end = T0, T0 + timedelta(hours=2)
+    cold_series, warm_series = cold["telemetry"].series, warm["telemetry"].series
+    assert cold_series.query(start, end, 60) == warm_series.query(start, end, 60)
+    risk, restored = warm["portfolio_risk"], cold["portfolio_risk"]
+    np.testing.assert_allclose(restored.cov, risk.cov)
+    assert restored.variance == pytest.approx(risk.variance)
+    assert restored.check("AAA", 5_000) == risk.check("AAA", 5_000)
+
+
+def test_version_mismatch_and_missing_file(tmp_path):
+    ledger = PortfolioLedger(["AAA"])
+    assert restore_checkpoint(tmp_path / "missing.npz", {"ledger": ledger}) is None
+
+    stale = tmp_path / "stale.npz"
+    header = json.dumps({"version": CHECKPOINT_VERSION + 1}).encode()
+    np.savez(stale, __header__=np.frombuffer(header, dtype=np.uint8))
+    with pytest.raises(ValueError, match="Unsupported checkpoint version"):
+        read_checkpoint(stale)
+
+    checkpointer = Checkpointer(
+        tmp_path / "periodic.npz", {"ledger": ledger}, interval_seconds=3600
+    )
+    assert not checkpointer.maybe_write()
+    checkpointer.write()
+    assert set(read_checkpoint(checkpointer.path)[1]) == {"ledger"}
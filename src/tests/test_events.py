@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import UTC, datetime
+
+from app.events import DecisionEvent, EventBus, FillEvent, StepEvent, sink_handler
+from app.records import DecisionRecord, FillRecord
+from app.runner import build_orchestrator
+
+T0 = datetime(2024, 1, 2, 15, tzinfo=UTC)
+
+
+def _decision(idx: int) -> DecisionEvent:
+    return DecisionEvent(DecisionRecord(T0, f"S{idx}", "HOLD", 0.0, 0.0, []))
+
+
+def test_slow_subscribers_do_not_block_publishers():
+    bus = EventBus()
+    gate = threading.Event()
+    seen: list[str] = []
+
+    def slow(event):
+        gate.wait()
+        seen.append(event.decision.symbol)
+
+    def failing(event):
+        raise RuntimeError("boom")
+
+    bus.subscribe("slow", slow)
+    broken = bus.subscribe("broken", failing, events=(DecisionEvent,))
+    fills = bus.subscribe("fills", lambda event: None, events=(FillEvent,))
+
+    began = time.perf_counter()
+    for idx in range(200):
+        bus.publish(_decision(idx))
+    assert time.perf_counter() - began < 0.5
+    assert not bus.flush(timeout=0.05)
+
+    gate.set()
+    assert bus.flush(timeout=5)
+    assert seen == [f"S{idx}" for idx in range(200)]
+    assert broken.errors == 200
+    assert fills.delivered == 0
+    assert bus.stats()["events_slow_delivered"] == 200
+    bus.close()
+
+
+def test_overflow_policies():
+    bus = EventBus()
+    gate = threading.Event()
+    received: dict[str, list[str]] = {"oldest": [], "newest": []}
+    started = threading.Barrier(3)
+
+    def handler(name):
+        def handle(event):
+            if event.decision.symbol == "S0":
+                started.wait()
+                gate.wait()
+            received[name].append(event.decision.symbol)
+
+        return handle
+
+    oldest = bus.subscribe("oldest", handler("oldest"), maxsize=3, overflow="drop_oldest")
+    newest = bus.subscribe("newest", handler("newest"), maxsize=3, overflow="drop_newest")
+    bus.publish(_decision(0))
+    started.wait()  # both workers are now busy with S0
+    for idx in range(1, 8):
+        bus.publish(_decision(idx))
+    gate.set()
+    bus.flush(timeout=5)
+
+    assert received["oldest"] == ["S0", "S5", "S6", "S7"]
+    assert received["newest"] == ["S0", "S1", "S2", "S3"]
+    assert oldest.dropped == newest.dropped == 4
+    assert oldest.high_water == newest.high_water == 3
+    bus.close()
+
+
+def test_orchestrator_publishes_to_subscribers():
+    orchestrator = build_orchestrator(event_bus=True)
+    recorded = _Sink()
+    orchestrator.events.subscribe(
+        "recorder", sink_handler(recorded), events=(DecisionEvent, FillEvent, StepEvent)
+    )
+    steps: list[StepEvent] = []
+    orchestrator.events.subscribe("steps", steps.append, events=(StepEvent,))
+    results = [orchestrator.step(symbol="AAPL") for _ in range(3)]
+    orchestrator.events.flush()
+
+    assert recorded.decisions == [decision for decision, _ in results]
+    assert [(step.decision, step.fill) for step in steps] == results
+    assert [fill for fill, _ in recorded.fills] == [fill for _, fill in results if fill is not None]
+    orchestrator.events.close()
+
+
+class _Sink:
+    def __init__(self) -> None:
+        self.decisions: list[DecisionRecord] = []
+        self.fills: list[tuple[FillRecord, float]] = []
+
+    def record_decision(self, decision: DecisionRecord) -> None:
+        self.decisions.append(decision)
+
+    def record_fill(self, fill: FillRecord, pnl_delta: float) -> None:
+        self.fills.append((fill, pnl_delta))
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 
+import numpy as np
 import pytest
 
+from agents.factual_agent import FactualAgent
 from app.schemas import MarketBar
-from services.feature_store import FeatureStore, compute_atr, compute_momentum, compute_rsi
+from services.feature_registry import FeatureRegistry
+from services.feature_store import (
+    FeatureStore,
+    compute_atr,
+    compute_momentum,
+    compute_rsi,
+    compute_volatility,
+    compute_volume_zscore,
+)
 from services.market_data import bars_to_dataframe
 
 
 def generate_bars(count: int = 60) -> list[MarketBar]:
-    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    start = datetime(2024, 1, 1, tzinfo=UTC)
     bars = []
     price = 100.0
     for idx in range(count):
@@ -49,3 +61,104 @@ def test_individual_feature_computations():
     assert 0 <= rsi <= 100
     assert atr > 0
     assert momentum != 0
+
+
+class CountingFeatureStore(FeatureStore):
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__()
+        self.calls = 0
+        self.delay = delay
+
+    def build_features(self, symbol, bars, features=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return super().build_features(symbol=symbol, bars=bars, features=features)
+
+
+class StaticProvider:
+    def __init__(self, bars):
+        self.bars = bars
+
+    def get_bars(self, symbol, lookback):
+        return self.bars
+
+
+def test_factual_agent_memoizes_per_latest_bar():
+    bars = generate_bars(count=121)
+    provider = StaticProvider(bars[:-1])
+    store = CountingFeatureStore()
+    agent = FactualAgent(provider=provider, feature_store=store, cache_size=1)
+
+    first = agent.run(symbol="AAPL")
+    assert agent.run(symbol="AAPL") is first
+    assert store.calls == 1
+
+    provider.bars = bars[1:]
+    assert agent.run(symbol="AAPL").timestamp == bars[-1].timestamp
+    assert store.calls == 2
+    assert agent.cache.stats() == {
+        "hits": 1.0,
+        "misses": 2.0,
+        "evictions": 1.0,
+        "size": 1.0,
+        "hit_rate": 1 / 3,
+    }
+
+
+def test_concurrent_calls_within_a_bar_compute_once():
+    store = CountingFeatureStore(delay=0.05)
+    agent = FactualAgent(provider=StaticProvider(generate_bars(count=120)), feature_store=store)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: agent.run(symbol="AAPL"), range(8)))
+    assert store.calls == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_registry_matches_reference_computations():
+    bars = generate_bars(count=120)
+    frame = bars_to_dataframe(bars)
+    features = FeatureStore().build_features(symbol="AAPL", bars=bars).features
+    assert features["rsi_14"] == pytest.approx(compute_rsi(frame["close"]), rel=1e-9)
+    assert features["atr_14"] == pytest.approx(compute_atr(frame), rel=1e-9)
+    assert features["mom_20d"] == pytest.approx(compute_momentum(frame["close"]), rel=1e-9)
+    assert features["rolling_vol_20d"] == pytest.approx(
+        compute_volatility(frame["close"]), rel=1e-9
+    )
+    assert features["volume_zscore_20d"] == pytest.approx(
+        compute_volume_zscore(frame["volume"]), rel=1e-9
+    )
+
+
+def test_store_evaluates_only_requested_features_and_shared_inputs_once():
+    registry = FeatureRegistry()
+    calls: list[str] = []
+
+    @registry.register("delta", inputs=("close",), window=2, intermediate=True)
+    def delta(close):
+        calls.append("delta")
+        return np.diff(close)
+
+    @registry.register("up_moves", inputs=("delta",), window=5)
+    def up_moves(values):
+        calls.append("up_moves")
+        return (values[-5:] > 0).sum()
+
+    @registry.register("down_moves", inputs=("delta",), window=5)
+    def down_moves(values):
+        calls.append("down_moves")
+        return (values[-5:] < 0).sum()
+
+    @registry.register("expensive", inputs=("close",), window=100)
+    def expensive(close):
+        calls.append("expensive")
+        return close.mean()
+
+    store = FeatureStore(registry=registry)
+    result = store.build_features(
+        symbol="AAPL", bars=generate_bars(count=10), features=["up_moves", "down_moves"]
+    )
+    assert set(result.features) == {"up_moves", "down_moves"}
+    assert calls == ["delta", "up_moves", "down_moves"]
+    assert store.min_history(["up_moves"]) == 6
+    with pytest.raises(ValueError):
+        store.build_features(symbol="AAPL", bars=generate_bars(count=10), features=["expensive"])
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from agents.factual_agent import FactualAgent
+from services.feature_store import FeatureStore
+from services.ingestion import BarBuilder, StreamingMarketDataProvider, TickIngestor
+
+T0 = 1_704_205_800_000_000_000  # 2024-01-02 14:30 UTC
+SECOND = 1_000_000_000
+
+
+def trade(offset_s: float, price: float, size: float = 1.0, symbol: str = "AAPL") -> str:
+    return f"T,{T0 + int(offset_s * SECOND)},{symbol},{price},{size}\n"
+
+
+def test_out_of_order_ticks_within_lateness_land_in_their_bar():
+    provider = StreamingMarketDataProvider()
+    ingestor = TickIngestor(BarBuilder(provider, interval_seconds=60, allowed_lateness_seconds=2))
+    lines = [
+        trade(1, 100.0),
+        trade(30, 102.0, 2),
+        trade(61, 103.0),
+        trade(59, 99.0, 3),  # late, but within the 2s allowance
+        f"Q,{T0 + 62 * SECOND},AAPL,102.9,103.1,500,300\n",
+        trade(63, 104.0),
+    ]
+    assert ingestor.consume_lines(lines) == len(lines)
+
+    [bar] = provider.get_bars("AAPL", lookback=10)
+    assert bar.timestamp == datetime(2024, 1, 2, 14, 30, tzinfo=UTC)
+    assert (bar.open, bar.high, bar.low, bar.close, bar.volume) == (100.0, 102.0, 99.0, 99.0, 6.0)
+    assert ingestor.quotes["AAPL"].imbalance == 0.25
+
+    ingestor.builder.flush()
+    bars = provider.get_bars("AAPL", lookback=10)
+    assert [b.close for b in bars] == [99.0, 104.0]
+    assert ingestor.builder.late_ticks == 0
+
+
+def test_late_policies_drop_or_revise():
+    # The last tick is 40s behind the watermark.
+    lines = [trade(1, 100.0), trade(70, 101.0), trade(30, 90.0, 5)]
+
+    dropped = StreamingMarketDataProvider()
+    builder = BarBuilder(dropped, allowed_lateness_seconds=2, late_policy="drop")
+    TickIngestor(builder).consume_lines(lines)
+    assert builder.late_ticks == 1
+    assert dropped.get_bars("AAPL", 1)[0].low == 100.0
+
+    revised = StreamingMarketDataProvider()
+    builder = BarBuilder(revised, allowed_lateness_seconds=2, late_policy="revise")
+    TickIngestor(builder).consume_lines(lines)
+    assert (builder.late_ticks, builder.revisions) == (0, 1)
+    [bar] = revised.get_bars("AAPL", 5)
+    assert (bar.low, bar.close, bar.volume) == (90.0, 90.0, 6.0)
+
+
+def test_revised_bar_invalidates_cached_features():
+    provider = StreamingMarketDataProvider()
+    ingestor = TickIngestor(BarBuilder(provider, allowed_lateness_seconds=2, late_policy="revise"))
+    agent = FactualAgent(provider, FeatureStore(), features=("last_close",))
+    ingestor.consume_lines([trade(1, 100.0), trade(70, 101.0)])
+    assert agent.run(symbol="AAPL").features["last_close"] == 100.0
+
+    # Revises the 14:30 bar in place: same timestamp, new close.
+    ingestor.consume_lines([trade(30, 90.0)])
+    assert provider.revision("AAPL") == 1
+    assert agent.run(symbol="AAPL").features["last_close"] == 90.0
+
+
+def test_provider_window_is_bounded_and_malformed_lines_are_counted():
+    provider = StreamingMarketDataProvider(window=5)
+    ingestor = TickIngestor(BarBuilder(provider, interval_seconds=1, allowed_lateness_seconds=0))
+    lines = [trade(idx, 100.0 + idx) for idx in range(20)]
+    lines += ["garbage\n", "T,notanint,AAPL,1,1\n", "# comment\n"]
+    ingestor.consume_lines(lines)
+    ingestor.builder.flush()
+    closes = [bar.close for bar in provider.get_bars("AAPL", lookback=10)]
+    assert closes == [115.0, 116.0, 117.0, 118.0, 119.0]
+    assert ingestor.malformed == 2
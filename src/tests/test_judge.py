@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import UTC, datetime
+
+import numpy as np
 
-from app.schemas import FactualFeatures, SubjectiveSignals
 from agents.judge_agent import JudgeAgent
+from app.records import FeaturesRecord, SignalsRecord
+from app.schemas import FactualFeatures, SubjectiveSignals
 
 
 def make_factual(rsi: float, momentum: float, vol: float) -> FactualFeatures:
     return FactualFeatures(
-        timestamp=datetime.now(tz=timezone.utc),
+        timestamp=datetime.now(tz=UTC),
         symbol="AAPL",
         features={
             "rsi_14": rsi,
@@ -22,7 +25,7 @@ def make_factual(rsi: float, momentum: float, vol: float) -> FactualFeatures:
 
 def make_subjective(sentiment: float) -> SubjectiveSignals:
     return SubjectiveSignals(
-        timestamp=datetime.now(tz=timezone.utc),
+        timestamp=datetime.now(tz=UTC),
         symbol="AAPL",
         signals={"news_sentiment": sentiment, "social_velocity_z": sentiment},
     )
@@ -43,3 +46,49 @@ def test_judge_agent_sell_signal():
     subjective = make_subjective(sentiment=-0.8)
     decision = judge.run(factual=factual, subjective=subjective)
     assert decision.action == "SELL"
+
+
+def test_decide_batch_matches_scalar_path_bit_for_bit():
+    rng = np.random.default_rng(11)
+    judge = JudgeAgent(bias=0.01, vol_target=0.015)
+    ts = datetime(2024, 1, 2, 15, tzinfo=UTC)
+    factuals, subjectives = [], []
+    for idx in range(500):
+        features = {
+            "rsi_14": rng.uniform(-10, 110),
+            "mom_20d": rng.normal(0, 0.3),
+            "rolling_vol_20d": rng.choice([0.0, 1e-9, rng.uniform(0, 0.1)]),
+            "volume_zscore_20d": rng.normal(0, 5),
+        }
+        if idx % 7 == 0:
+            del features["rolling_vol_20d"]
+        signals = {
+            "news_sentiment": rng.uniform(-1, 1),
+            "social_velocity_z": rng.normal(0, 4),
+            "search_trend_z": rng.normal(0, 4),
+        }
+        if idx % 3 == 0:
+            signals["headline_sentiment"] = rng.uniform(-1, 1)
+        factuals.append(FeaturesRecord(ts, f"S{idx}", features))
+        subjectives.append(SignalsRecord(ts, f"S{idx}", signals))
+
+    features, signals, sizing_vol = judge.stack_inputs(factuals, subjectives)
+    batch = judge.decide_batch(features, signals, sizing_vol=sizing_vol, with_rationale=True)
+    scalar = [
+        judge.run(factual=f, subjective=s) for f, s in zip(factuals, subjectives, strict=True)
+    ]
+
+    assert batch.to_records([ts] * len(factuals), [f.symbol for f in factuals]) == scalar
+    assert batch.size.tolist() == [decision.size for decision in scalar]
+    assert batch.rationale == [decision.rationale for decision in scalar]
+    assert {"BUY", "SELL", "HOLD"} <= set(batch.actions)
+
+
+def test_decide_batch_accepts_symbol_by_bar_matrices():
+    judge = JudgeAgent()
+    features = np.tile([30.0, 0.05, 0.01, 1.0], (3, 4, 1))
+    signals = np.tile([0.8, 0.8, 0.0, 0.0], (3, 4, 1))
+    batch = judge.decide_batch(features, signals)
+    assert batch.action.shape == (3, 4)
+    assert batch.rationale is None
+    assert set(batch.actions) == {"BUY"}
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.bench import compare, results_to_json
+from app.loadtest import LoadResult, find_knee, parse_mix, run_load, to_bench_results
+
+
+def step(rate: float, throughput: float, p99_ms: float, errors: int = 0) -> LoadResult:
+    return LoadResult(rate, 1.0, int(rate), errors, throughput, p99_ms / 2, p99_ms, p99_ms * 1.5)
+
+
+def test_parse_mix_normalises_and_rejects_unknown_endpoints():
+    assert parse_mix("decide=1,latest=3") == {"decide": 0.25, "latest": 0.75}
+    with pytest.raises(ValueError):
+        parse_mix("decide=1,bogus=1")
+
+
+def test_knee_is_last_sustained_step():
+    steps = [step(50, 50, 5.0), step(100, 99, 7.0), step(200, 198, 16.0), step(400, 250, 90.0)]
+    assert find_knee(steps) == 100  # 200/s held throughput but p99 grew past 3x the lightest step
+    assert find_knee(steps, latency_factor=5.0) == 200
+    assert find_knee([step(50, 50, 5.0, errors=5)]) == 0.0
+
+    baseline = results_to_json(to_bench_results(steps[1], knee=200))
+    regressions = compare(to_bench_results(steps[1], knee=100), baseline, tolerance=0.25)
+    assert [reg.name for reg in regressions] == ["load_knee"]
+
+
+def test_harness_serves_mix_without_errors(api):
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    mix = parse_mix("decide=1,latest=1,metrics=1")
+    result = asyncio.run(
+        run_load("http://testserver", rate=40, duration=0.5, mix=mix, transport=transport)
+    )
+    assert result.requests == 20
+    assert result.errors == 0
+    assert sum(stats.requests for stats in result.endpoints.values()) == 20
+    assert result.p999_ms >= result.p99_ms >= result.p50_ms > 0
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from agents.judge_agent import FACTUAL_COLUMNS, JudgeAgent
+from pipelines.monte_carlo import (
+    GUARDRAILS,
+    generate_paths,
+    path_seed,
+    run_monte_carlo,
+    simulate_paths,
+    warmup_bars,
+)
+from pipelines.walk_forward import FeaturePanel, simulate
+from services.feature_store import FeatureStore
+from services.portfolio_risk import PortfolioRisk
+from services.risk import RiskManager
+from services.synthetic import SyntheticMarket
+
+
+def test_vectorized_paths_match_feature_store_and_simulate():
+    bars, history = 300, warmup_bars()
+    inputs = generate_paths(range(3), bars, seed=1)
+
+    block = SyntheticMarket(["MC"], seed=path_seed(1, 2)).advance(bars + history - 1)
+    columns = {name: getattr(block, name)[0] for name in ("open", "high", "low", "close", "volume")}
+    store = FeatureStore()
+    expected = []
+    for end in range(history, bars + history):
+        window = {name: values[end - history : end] for name, values in columns.items()}
+        row = store.build_features_from_columns("MC", None, window, FACTUAL_COLUMNS).features
+        expected.append([row[name] for name in FACTUAL_COLUMNS])
+    np.testing.assert_allclose(inputs.features[2], expected)
+    np.testing.assert_array_equal(inputs.close[2], columns["close"][history - 1 :])
+
+    judge = JudgeAgent(tau_buy=0.1, tau_sell=-0.1)
+    batch = judge.decide_batch(inputs.features, inputs.signals, inputs.sizing_vol)
+    tradable = np.ones(bars, dtype=bool)
+    tradable[100:120] = False
+    outcome = simulate_paths(inputs.close, batch.action, batch.size, tradable, 3.0, 5.0, 5.0)
+    for path in range(3):
+        panel = FeaturePanel(
+            "MC",
+            [None] * bars,
+            inputs.close[path],
+            inputs.features[path],
+            inputs.signals[path],
+            inputs.sizing_vol[path],
+            tradable,
+        )
+        action, size = batch.action[path], batch.size[path]
+        equity, trades, blocked = simulate(panel, action, size, 3.0, 5.0, 5.0)
+        np.testing.assert_allclose(outcome.equity[path], equity)
+        assert (outcome.trades[path], outcome.blocked[path]) == (trades, blocked)
+    assert outcome.guardrails["market_closed"].sum() > 0
+    assert outcome.guardrails["max_position_exceeded"].sum() > 0
+
+
+def test_results_are_seeded_and_independent_of_chunking():
+    serial = run_monte_carlo(6, bars=400, seed=3, chunk_size=6)
+    parallel = run_monte_carlo(6, bars=400, seed=3, chunk_size=2, workers=2)
+    assert len(serial) == 6
+    for name, values in serial.paths.items():
+        np.testing.assert_array_equal(values, parallel.paths[name])
+    assert len(set(serial.paths["pnl"].tolist())) == 6
+    reseeded = run_monte_carlo(6, bars=400, seed=4)
+    assert not np.array_equal(reseeded.paths["pnl"], serial.paths["pnl"])
+
+
+def test_summary_reports_distributions_and_guardrail_rates():
+    judge = JudgeAgent(tau_buy=0.05, tau_sell=-0.05)
+    result = run_monte_carlo(8, bars=500, judge_agent=judge, risk_manager=RiskManager(2.0, 1_000.0))
+    summary = result.summary()
+    assert summary["pnl"]["p5"] <= summary["pnl"]["p50"] <= summary["pnl"]["p95"]
+    assert 0.0 <= summary["pnl"]["prob_loss"] <= 1.0
+    assert (result.paths["max_drawdown"] <= 0).all()
+    rates = result.guardrail_rates()
+    assert set(rates) == set(GUARDRAILS)
+    assert summary["max_position_exceeded_rate"]["mean"] > 0
+    blocked = sum(result.paths[name] for name in GUARDRAILS)
+    assert (blocked >= result.paths["blocked"]).all()
+    assert summary["trades"]["mean"] == pytest.approx(result.paths["trades"].mean())
+
+
+def test_portfolio_risk_is_rejected():
+    with pytest.raises(ValueError, match="portfolio risk"):
+        run_monte_carlo(2, bars=100, risk_manager=RiskManager(portfolio=PortfolioRisk()))
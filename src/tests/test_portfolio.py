@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+
+from app.records import FeaturesRecord
+from app.runner import build_orchestrator
+from services.portfolio import PortfolioLedger
+
+
+def test_ledger_tracks_average_cost_and_realized_pnl():
+    ledger = PortfolioLedger()
+    ledger.apply_fill("AAPL", 10, 100.0)
+    ledger.apply_fill("AAPL", 10, 110.0)
+    assert ledger.snapshot("AAPL").avg_cost == pytest.approx(105.0)
+
+    realized = ledger.apply_fill("AAPL", -25, 120.0)
+    snapshot = ledger.snapshot("AAPL")
+    assert realized == pytest.approx(300.0)
+    assert snapshot.position == pytest.approx(-5.0)
+    assert snapshot.avg_cost == pytest.approx(120.0)
+
+    ledger.update_price("AAPL", 118.0)
+    snapshot = ledger.snapshot("AAPL")
+    assert snapshot.unrealized_pnl == pytest.approx(10.0)
+    assert snapshot.total_pnl == pytest.approx(310.0)
+
+
+def test_vectorized_mark_matches_per_symbol_marks():
+    rng = np.random.default_rng(7)
+    symbols = [f"SYM{i}" for i in range(1_500)]
+    vectorized = PortfolioLedger(symbols)
+    scalar = PortfolioLedger(symbols)
+    for symbol, qty, price in zip(
+        symbols, rng.normal(0, 50, 1_500), rng.uniform(10, 200, 1_500), strict=True
+    ):
+        vectorized.apply_fill(symbol, qty, price)
+        scalar.apply_fill(symbol, qty, price)
+
+    prices = rng.uniform(10, 200, len(symbols))
+    prices[::7] = np.nan
+    vectorized.mark(prices)
+    for symbol, price in zip(symbols, prices, strict=True):
+        if not np.isnan(price):
+            scalar.update_price(symbol, price)
+
+    assert vectorized.total_pnl == pytest.approx(scalar.total_pnl)
+    expected = scalar.snapshot("SYM3").unrealized_pnl
+    assert vectorized.snapshot("SYM3").unrealized_pnl == pytest.approx(expected)
+
+
+def test_vectorized_fills_match_per_symbol_fills():
+    rng = np.random.default_rng(11)
+    symbols = [f"SYM{i}" for i in range(50)]
+    vectorized = PortfolioLedger(symbols)
+    scalar = PortfolioLedger(symbols)
+    for _ in range(40):
+        # Integer lots so positions cross and return to zero; about half the symbols trade.
+        qty = rng.integers(-3, 4, len(symbols)) * (rng.random(len(symbols)) < 0.5)
+        prices = rng.uniform(90, 110, len(symbols))
+        realized = vectorized.apply_fills(qty, prices)
+        for sid, (symbol, amount, price) in enumerate(zip(symbols, qty, prices, strict=True)):
+            booked = scalar.apply_fill(symbol, amount, price) if amount else 0.0
+            assert realized[sid] == pytest.approx(booked)
+
+    for name in ("position", "avg_cost", "realized_pnl", "unrealized_pnl"):
+        np.testing.assert_allclose(getattr(vectorized, name), getattr(scalar, name))
+    assert vectorized.total_pnl == pytest.approx(scalar.total_pnl)
+
+
+def test_step_without_a_price_neither_marks_nor_fills(monkeypatch):
+    orchestrator = build_orchestrator()
+    orchestrator.broker.ledger.apply_fill("AAPL", 10, 100.0)
+    orchestrator.broker.mark("AAPL", 105.0)
+    timestamp = datetime(2024, 1, 2, 15, tzinfo=UTC)
+    features = FeaturesRecord(timestamp, "AAPL", {"return_1": 0.01})
+    monkeypatch.setattr(orchestrator.factual_agent, "run", lambda symbol: features)
+    monkeypatch.setattr(orchestrator.judge_agent, "bias", 2.0)
+    monkeypatch.setattr(orchestrator.risk_manager, "evaluate", lambda decision, context: decision)
+    monkeypatch.setattr(orchestrator.telemetry, "record_decision", lambda decision: None)
+
+    decision, fill = orchestrator.step("AAPL")
+    assert decision.action == "BUY"
+    assert fill is None
+    snapshot = orchestrator.broker.ledger.snapshot("AAPL")
+    assert snapshot.position == 10
+    assert (snapshot.last_price, snapshot.unrealized_pnl) == (105.0, 50.0)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.records import DecisionRecord
+from app.runner import build_orchestrator
+from services.portfolio_risk import PortfolioRisk
+from services.risk import RiskContext, RiskManager
+
+T0 = datetime(2024, 1, 2, 15, tzinfo=UTC)
+
+
+def test_incremental_state_matches_full_recompute():
+    rng = np.random.default_rng(3)
+    symbols = [f"SYM{i}" for i in range(200)]
+    sectors = {symbol: f"S{i % 7}" for i, symbol in enumerate(symbols)}
+    risk = PortfolioRisk(symbols, sectors=sectors, decay=0.9)
+    prices = rng.uniform(20, 200, len(symbols))
+    expected_cov = np.zeros((len(symbols), len(symbols)))
+    previous = None
+    for _ in range(40):
+        prices = prices * (1 + rng.normal(0, 0.01, len(symbols)))
+        if previous is not None:
+            returns = prices / previous - 1
+            expected_cov = 0.9 * expected_cov + 0.1 * np.outer(returns, returns)
+        previous = prices.copy()
+        risk.update_prices(prices)
+        for sid in rng.integers(0, len(symbols), 25):
+            risk.apply_fill(symbols[sid], float(rng.normal(0, 100)))
+
+    np.testing.assert_allclose(risk.cov[:200, :200], expected_cov, atol=1e-15)
+    incremental = (risk.gross, risk.net, risk.variance, risk.sector_exposure.copy())
+    risk.recompute()
+    assert incremental[0] == pytest.approx(risk.gross)
+    assert incremental[1] == pytest.approx(risk.net)
+    assert incremental[2] == pytest.approx(risk.variance)
+    np.testing.assert_allclose(incremental[3], risk.sector_exposure)
+    exposure = risk.position[:200] * prices
+    assert risk.variance == pytest.approx(exposure @ expected_cov @ exposure)
+
+
+def test_checks_flag_only_risk_increasing_breaches():
+    risk = PortfolioRisk(
+        ["AAA", "BBB", "CCC"],
+        sectors={"AAA": "tech", "BBB": "tech", "CCC": "energy"},
+        capital=100_000,
+        max_gross_leverage=1.0,
+        max_net_leverage=0.5,
+        max_sector_weight=0.3,
+        max_symbol_weight=0.2,
+        max_portfolio_vol=10.0,
+    )
+    risk.update_prices(np.array([100.0, 100.0, 100.0]))
+    risk.apply_fill("AAA", 150)
+    risk.apply_fill("BBB", 100)
+
+    assert risk.check("CCC", 100) == []
+    assert risk.check("AAA", 100) == ["max_sector_exposure", "max_concentration"]
+    assert risk.check("CCC", 300) == ["max_net_exposure", "max_concentration"]
+    # Already over the sector limit, but selling reduces it.
+    assert risk.check("BBB", -50) == []
+
+    for step in range(1, 30):
+        risk.observe("AAA", T0 + timedelta(minutes=step), 100.0 * (1.03 if step % 2 else 1.0))
+    risk.observe("AAA", T0 + timedelta(minutes=30), 100.0)
+    risk.max_variance = risk.variance * 1.01
+    assert risk.bars == 30
+    assert "max_portfolio_vol" in risk.check("AAA", 20)
+    assert "max_portfolio_vol" not in risk.check("AAA", -20)
+
+
+def test_build_orchestrator_applies_configured_sectors(monkeypatch):
+    tech = ["AAPL", "MSFT", "NVDA", "GOOG"]
+    monkeypatch.setattr(settings, "portfolio_risk_enabled", True)
+    monkeypatch.setattr(settings, "symbol_sectors", {symbol: "tech" for symbol in tech})
+    manager = build_orchestrator().risk_manager
+    # Three tech names at the per-symbol cap fill the 30% sector budget.
+    for symbol in tech[:3]:
+        manager.portfolio.apply_fill(symbol, 1_000.0, 100.0)
+
+    decision = DecisionRecord(T0, "GOOG", "BUY", 100.0, 0.9, [], [])
+    context = RiskContext(T0, "GOOG", current_position=0.0, cumulative_pnl=0.0, mark_price=100.0)
+    guarded = manager.evaluate(decision, context=context)
+    assert guarded.guardrails_applied == ["max_sector_exposure"]
+
+
+def test_risk_manager_applies_portfolio_limits():
+    portfolio = PortfolioRisk(["AAPL"], capital=10_000, max_symbol_weight=0.1)
+    manager = RiskManager(max_position=1_000, max_daily_loss=1_000, portfolio=portfolio)
+    decision = DecisionRecord(T0, "AAPL", "BUY", 20.0, 0.9, [], [])
+    context = RiskContext(T0, "AAPL", current_position=0.0, cumulative_pnl=0.0, mark_price=100.0)
+
+    guarded = manager.evaluate(decision, context=context)
+    assert guarded.action == "HOLD"
+    assert guarded.guardrails_applied == ["max_concentration"]
+    buy = DecisionRecord(T0, "AAPL", "BUY", 5.0, 0.9, [], [])
+    assert manager.evaluate(buy, context=context).action == "BUY"
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from app.records import BarRecord, DecisionRecord, FeaturesRecord, FillRecord, SignalsRecord
+from app.runner import build_orchestrator
+from app.schemas import ExecutionFill, FactualFeatures, JudgeDecision, MarketBar, SubjectiveSignals
+
+TS = datetime(2024, 1, 2, 15, tzinfo=UTC)
+
+
+def test_records_round_trip_through_validated_models():
+    models = [
+        MarketBar(timestamp=TS, symbol="AAPL", open=1.0, high=2.0, low=0.5, close=1.5, volume=10.0),
+        FactualFeatures(timestamp=TS, symbol="AAPL", features={"rsi_14": 40.0}),
+        SubjectiveSignals(
+            timestamp=TS, symbol="AAPL", signals={"news_sentiment": 0.2}, notes=["beat"]
+        ),
+        JudgeDecision(
+            timestamp=TS,
+            symbol="AAPL",
+            action="BUY",
+            size=0.5,
+            confidence=0.4,
+            rationale=["intent=0.40"],
+        ),
+        ExecutionFill(
+            timestamp=TS,
+            symbol="AAPL",
+            action="SELL",
+            price=99.5,
+            size=1.0,
+            slippage_bps=5.0,
+            latency_ms=48.0,
+        ),
+    ]
+    record_types = [BarRecord, FeaturesRecord, SignalsRecord, DecisionRecord, FillRecord]
+    for model, record_type in zip(models, record_types, strict=True):
+        record = record_type.from_model(model)
+        assert record.to_model() == model
+        assert record_type.from_model(record.to_model()) == record
+
+
+def test_pipeline_records_validate_at_boundary():
+    orchestrator = build_orchestrator()
+    decision, _ = orchestrator.step(symbol="AAPL")
+    assert isinstance(decision, DecisionRecord)
+    model = decision.to_model()
+    assert model.model_dump() == JudgeDecision.model_validate(model.model_dump()).model_dump()
+    assert model.action == decision.action
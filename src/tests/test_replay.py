@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+
+from app.runner import build_orchestrator
+from pipelines.replay import StepRecorder, read_log, replay
+from services.portfolio_risk import PortfolioRisk
+from services.risk import RiskManager
+
+
+def test_replay_reproduces_recorded_decisions(tmp_path):
+    log_path = tmp_path / "steps.mmrl"
+    orchestrator = build_orchestrator()
+    recorder = StepRecorder(log_path).attach(orchestrator)
+    live = [orchestrator.step(symbol=symbol)[0] for symbol in ("AAPL", "MSFT") * 4]
+    recorder.close()
+
+    steps = list(read_log(log_path))
+    assert len(steps) == 8
+    assert [step.symbol for step in steps] == [decision.symbol for decision in live]
+    assert all(step.mark_price == step.bars[-1].close for step in steps)
+    assert replay(steps) == live
+
+
+def test_truncated_trailing_frame_is_ignored(tmp_path):
+    log_path = tmp_path / "steps.mmrl"
+    orchestrator = build_orchestrator()
+    recorder = StepRecorder(log_path).attach(orchestrator)
+    for _ in range(3):
+        orchestrator.step(symbol="AAPL")
+    recorder.close()
+
+    data = log_path.read_bytes()
+    log_path.write_bytes(data[:-10])
+    assert len(list(read_log(log_path))) == 2
+
+
+def test_replay_refuses_portfolio_risk(tmp_path):
+    log_path = tmp_path / "steps.mmrl"
+    orchestrator = build_orchestrator()
+    orchestrator.risk_manager.portfolio = PortfolioRisk()
+    recorder = StepRecorder(log_path).attach(orchestrator)
+    orchestrator.step(symbol="AAPL")
+    recorder.close()
+
+    steps = list(read_log(log_path))
+    assert steps[0].portfolio_risk
+    with pytest.raises(ValueError, match="portfolio risk"):
+        replay(steps)
+    steps[0].portfolio_risk = False
+    with pytest.raises(ValueError, match="portfolio risk"):
+        replay(steps, risk_manager=RiskManager(portfolio=PortfolioRisk()))
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from agents.factual_agent import FactualAgent
+from app.records import BarRecord
+from services.feature_store import FeatureStore
+from services.market_data import bars_to_dataframe
+from services.resampler import StreamingResampler, parse_timeframe
+
+
+def minute_bars(count: int, start: datetime | None = None) -> list[BarRecord]:
+    rng = np.random.default_rng(3)
+    start = start or datetime(2024, 1, 2, 14, 3, tzinfo=UTC)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    return [
+        BarRecord(
+            start + timedelta(minutes=idx),
+            "AAPL",
+            close * 0.999,
+            close * 1.002,
+            close * 0.997,
+            close,
+            1_000.0 + idx,
+        )
+        for idx, close in enumerate(closes.tolist())
+    ]
+
+
+def test_incremental_bars_match_pandas_resample():
+    bars = minute_bars(200)
+    resampler = StreamingResampler(timeframes=("5m", "1h"))
+    for offset in range(0, len(bars), 30):
+        resampler.extend(bars[max(0, offset - 60) : offset + 30])  # overlapping windows
+
+    frame = bars_to_dataframe(bars)
+    for timeframe in ("5m", "1h"):
+        expected = frame.resample(timeframe.replace("m", "min")).agg(
+            {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+        )
+        actual = resampler.bars("AAPL", timeframe)
+        assert [bar.timestamp for bar in actual] == list(expected.index)
+        np.testing.assert_allclose(
+            [[b.open, b.high, b.low, b.close, b.volume] for b in actual], expected.to_numpy()
+        )
+    assert parse_timeframe("90s") == 90
+
+
+def test_memory_is_bounded_per_timeframe():
+    resampler = StreamingResampler(timeframes=("5m",), max_bars=4)
+    resampler.extend(minute_bars(100))
+    assert len(resampler.bars("AAPL", "5m", include_partial=False)) == 4
+    assert len(resampler.bars("AAPL", "5m")) == 5
+
+
+def test_factual_agent_adds_timeframe_features():
+    bars = minute_bars(240)
+
+    class Provider:
+        def get_bars(self, symbol, lookback):
+            return bars[-lookback:]
+
+    agent = FactualAgent(
+        provider=Provider(),
+        feature_store=FeatureStore(),
+        resampler=StreamingResampler(timeframes=("5m", "1h")),
+        timeframe_features=["mom_20d", "last_close"],
+    )
+    result = agent.run(symbol="AAPL").features
+    assert result["last_close_5m"] == pytest.approx(bars[-1].close)
+    assert "mom_20d_5m" in result
+    assert "mom_20d_1h" not in result  # not enough hourly history yet
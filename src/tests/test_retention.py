@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.retention import TieredSeries
+from app.telemetry import TelemetryStore
+
+T0 = datetime(2024, 1, 2, 14, 0, tzinfo=UTC)
+
+
+def test_rollups_stay_bounded_and_keep_ohlc():
+    series = TieredSeries(
+        raw_retention=timedelta(minutes=10), rollup_retention={"1m": timedelta(hours=1)}
+    )
+    pnl = 0.0
+    for idx in range(3 * 24 * 60):  # three days, one fill every minute
+        pnl += 1.0 if idx % 2 else -0.5
+        series.add_pnl(T0 + timedelta(minutes=idx, seconds=30), pnl, latency_ms=40.0 + idx % 20)
+        series.add_decision(T0 + timedelta(minutes=idx))
+
+    assert len(series.raw) == 11
+    assert len(series.rollups("1m")) == 61
+    first_hour = series.rollups("1h")[0]
+    assert (first_hour.fills, first_hour.decisions) == (60, 60)
+    assert (first_hour.pnl_open, first_hour.pnl_low, first_hour.pnl_close) == (0.0, -0.5, 15.0)
+    assert (first_hour.latency_min, first_hour.latency_max) == (40.0, 59.0)
+    assert [bucket.fills for bucket in series.rollups("1d")] == [600, 1440, 1440, 840]
+
+
+def test_query_picks_cheapest_tier_that_still_has_the_range():
+    series = TieredSeries(
+        raw_retention=timedelta(minutes=10), rollup_retention={"1m": timedelta(hours=2)}
+    )
+    for idx in range(6 * 60):
+        series.add_pnl(T0 + timedelta(minutes=idx), float(idx), latency_ms=50.0)
+    end = T0 + timedelta(hours=6)
+
+    assert series.query(end - timedelta(minutes=5), end).tier == "raw"
+    assert series.query(end - timedelta(hours=1), end, resolution_seconds=60).tier == "1m"
+    hourly = series.query(end - timedelta(hours=1), end, resolution_seconds=3600)
+    assert hourly.tier == "1h" and len(hourly.points) == 1
+    # The 1m tier only reaches back two hours, so a 1m request over five hours falls back to 1h.
+    assert series.query(end - timedelta(hours=5), end, resolution_seconds=60).tier == "1h"
+
+    # History before the first recorded point never counts as aged out.
+    fresh = TieredSeries()
+    fresh.add_pnl(T0, 1.0, latency_ms=50.0)
+    recent = fresh.query(T0 - timedelta(days=1), T0 + timedelta(minutes=3), resolution_seconds=60)
+    assert recent.tier == "1m"
+
+
+def test_fills_are_pruned_and_series_is_served(tmp_path, monkeypatch):
+    from app import main
+    from app.records import FillRecord
+
+    store = TelemetryStore(database_url=f"sqlite:///{tmp_path}/fills.db", fill_retention_days=1)
+    now = datetime.now(tz=UTC)
+    for days_ago in (3, 2, 0):
+        fill = FillRecord(now - timedelta(days=days_ago), "AAPL", "BUY", 100.0, 1.0, 5.0, 50.0)
+        store.record_fill(fill, 1.0)
+    assert store.prune_fills() == 2
+
+    monkeypatch.setattr(main, "telemetry", store)
+    response = TestClient(main.app).get("/telemetry/pnl", params={"resolution": 60})
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["tier"] == "1m"
+    assert payload["points"][-1]["pnl_close"] == 3.0
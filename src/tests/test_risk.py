@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
 from app.schemas import JudgeDecision
 from services.risk import RiskContext, RiskManager
@@ -9,7 +9,7 @@ from services.risk import RiskContext, RiskManager
 def test_market_closed_guardrail():
     manager = RiskManager(max_position=10, max_daily_loss=1000)
     decision = JudgeDecision(
-        timestamp=datetime.now(tz=timezone.utc),
+        timestamp=datetime.now(tz=UTC),
         symbol="AAPL",
         action="BUY",
         size=5,
@@ -18,7 +18,7 @@ def test_market_closed_guardrail():
         guardrails_applied=[],
     )
     context = RiskContext(
-        timestamp=datetime(2024, 1, 6, 12, tzinfo=timezone.utc),  # Saturday
+        timestamp=datetime(2024, 1, 6, 12, tzinfo=UTC),  # Saturday
         symbol="AAPL",
         current_position=0,
         cumulative_pnl=0,
@@ -31,7 +31,7 @@ def test_market_closed_guardrail():
 def test_max_loss_guardrail():
     manager = RiskManager(max_position=10, max_daily_loss=100)
     decision = JudgeDecision(
-        timestamp=datetime.now(tz=timezone.utc),
+        timestamp=datetime.now(tz=UTC),
         symbol="AAPL",
         action="SELL",
         size=5,
@@ -40,7 +40,7 @@ def test_max_loss_guardrail():
         guardrails_applied=[],
     )
     context = RiskContext(
-        timestamp=datetime(2024, 1, 2, 15, tzinfo=timezone.utc),
+        timestamp=datetime(2024, 1, 2, 15, tzinfo=UTC),
         symbol="AAPL",
         current_position=0,
         cumulative_pnl=-150,
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+
+from agents.factual_agent import FactualAgent
+from app.checkpoint import Checkpointer
+from app.config import settings
+from app.telemetry import TelemetryStore
+from pipelines.sharded import BAR_FIELDS, ShardedLiveEngine, SharedBarBuffer, SharedBarProvider
+from services.feature_store import FeatureStore
+from services.market_data import MockMarketDataProvider
+
+
+def test_shared_bar_buffer_round_trips_between_handles():
+    bars = MockMarketDataProvider().get_bars(symbol="AAPL", lookback=50)
+    owner = SharedBarBuffer(n_symbols=2, lookback=64)
+    reader = SharedBarBuffer(n_symbols=2, lookback=64, name=owner.name)
+    try:
+        owner.publish(1, bars)
+        assert reader.bars(1, "AAPL") == bars
+        assert reader.bars(1, "AAPL", lookback=10) == bars[-10:]
+        assert reader.bars(0, "MSFT") == []
+
+        timestamp, columns = reader.columns(1, lookback=10)
+        assert timestamp == bars[-1].timestamp
+        np.testing.assert_array_equal(columns["close"], [bar.close for bar in bars[-10:]])
+        assert np.shares_memory(columns["close"], reader.values)
+        timestamp, columns = reader.columns(0)
+        assert timestamp is None
+        assert all(len(columns[name]) == 0 for name in BAR_FIELDS)
+    finally:
+        reader.close()
+        owner.close()
+
+
+def test_factual_agent_builds_features_from_shared_columns():
+    bars = MockMarketDataProvider().get_bars(symbol="AAPL", lookback=120)
+    buffer = SharedBarBuffer(n_symbols=1, lookback=120)
+    try:
+        buffer.publish(0, bars)
+        agent = FactualAgent(SharedBarProvider(buffer, {"AAPL": 0}), FeatureStore())
+        expected = FeatureStore().build_features(symbol="AAPL", bars=bars)
+        assert agent.run(symbol="AAPL") == expected
+    finally:
+        buffer.close()
+
+
+def test_engine_merges_shard_results(tmp_path):
+    telemetry = TelemetryStore(database_url=f"sqlite:///{tmp_path}/fills.db")
+    symbols = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOG"]
+    with ShardedLiveEngine(symbols, workers=2, telemetry=telemetry) as engine:
+        assert [len(shard) for shard in engine.shards] == [3, 2]
+        results = engine.tick()
+
+    assert [decision.symbol for decision, _ in results] == symbols
+    assert all(decision.action in {"BUY", "SELL", "HOLD"} for decision, _ in results)
+    assert [decision.symbol for decision in telemetry.decisions] == symbols
+    # Each shard seeds its own news feed, so the shards' first headlines differ.
+    subjective = {decision.symbol: decision.rationale[1] for decision, _ in results}
+    assert subjective["AAPL"].startswith("subjective_score=")
+    assert subjective["AAPL"] != subjective["MSFT"]
+
+
+def test_guardrails_see_the_consolidated_ledger(tmp_path):
+    telemetry = TelemetryStore(database_url=f"sqlite:///{tmp_path}/fills.db")
+    symbols = ["AAPL", "MSFT", "NVDA"]
+    with ShardedLiveEngine(symbols, workers=2, telemetry=telemetry) as engine:
+        # A losing AAPL position on shard 0 must also halt MSFT, which trades on shard 1.
+        engine.ledger.apply_fill("AAPL", 1.0, 1e6)
+        results = engine.tick()
+
+    assert engine.ledger.total_pnl < -engine.orchestrator.risk_manager.max_daily_loss
+    assert all("max_daily_loss" in decision.guardrails_applied for decision, _ in results)
+    assert all(fill is None for _, fill in results)
+
+
+def test_checkpoint_covers_portfolio_risk(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "portfolio_risk_enabled", True)
+    telemetry = TelemetryStore(database_url=f"sqlite:///{tmp_path}/fills.db")
+    with ShardedLiveEngine(["AAPL", "MSFT"], workers=2, telemetry=telemetry) as engine:
+        engine.ledger.apply_fill("MSFT", 5.0, 100.0)
+        engine.orchestrator.risk_manager.portfolio.apply_fill("MSFT", 5.0, 100.0)
+        components = engine.checkpoint_components()
+        assert set(components) == {"ledger", "telemetry", "portfolio_risk"}
+        Checkpointer(tmp_path / "engine.ckpt", components).write()
+
+    with ShardedLiveEngine(["AAPL", "MSFT"], workers=1, telemetry=telemetry) as restored:
+        Checkpointer(tmp_path / "engine.ckpt", restored.checkpoint_components()).restore()
+        assert restored.ledger.position_of("MSFT") == 5.0
+        portfolio = restored.orchestrator.risk_manager.portfolio
+        assert portfolio.position[portfolio.index.id("MSFT")] == 5.0
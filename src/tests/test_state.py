@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from app import main
+from app.schemas import JudgeDecision
+from app.state import SharedStateStore
+
+
+def make_decision(action: str) -> JudgeDecision:
+    return JudgeDecision(
+        timestamp=datetime(2024, 1, 2, 15, tzinfo=UTC),
+        symbol="AAPL",
+        action=action,
+        size=0.5,
+        confidence=0.4,
+        rationale=["intent=0.40"],
+    )
+
+
+def test_writes_are_visible_to_other_store_handles(state_url):
+    writer, reader = SharedStateStore(state_url), SharedStateStore(state_url)
+    assert reader.latest_decision("AAPL") is None
+
+    writer.publish(make_decision("BUY"), metrics={"pnl": 1.5})
+    assert reader.latest_decision("AAPL") == make_decision("BUY")
+    assert reader.metrics() == {"pnl": 1.5}
+
+    writer.publish(make_decision("SELL"), metrics={"pnl": -2.0, "sharpe_30d": 0.1})
+    assert reader.latest_decision("AAPL").action == "SELL"
+    assert reader.metrics() == {"pnl": -2.0, "sharpe_30d": 0.1}
+
+
+def test_api_serves_latest_and_telemetry_from_shared_state(api):
+    client = api
+    decision = client.post("/decide", params={"symbol": "MSFT"}).json()
+    assert client.get("/latest", params={"symbol": "MSFT"}).json() == decision
+    telem = client.get("/telem", params={"symbol": "MSFT"}).json()
+    assert telem["symbol"] == "MSFT"
+    assert telem["decision"] == decision
+    assert set(client.get("/metrics").json()) >= {"pnl", "sharpe_30d", "max_drawdown"}
+
+
+def test_telem_reflects_the_fill_of_the_same_decide(api, monkeypatch):
+    monkeypatch.setattr(main.orchestrator.judge_agent, "bias", 2.0)
+    monkeypatch.setattr(
+        main.orchestrator.risk_manager, "evaluate", lambda decision, context: decision
+    )
+    client = api
+    for _ in range(20):
+        fills = len(main.telemetry.pnl_history)
+        decision = client.post("/decide", params={"symbol": "AAPL"}).json()
+        assert decision["action"] == "BUY"
+        assert len(main.telemetry.pnl_history) == fills + 1
+        telem = client.get("/telem", params={"symbol": "AAPL"}).json()
+        assert telem["pnl"] == main.telemetry.pnl_history[-1]
+        assert telem["decision"] == decision
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
-from app.schemas import SubjectiveSignals
 from agents.subjective_agent import SubjectiveAgent
+from app.schemas import SubjectiveSignals
 from services.sentiment import RuleBasedSentiment
 
 
 class StaticNewsProvider:
     def fetch_signals(self, symbol: str) -> SubjectiveSignals:
         return SubjectiveSignals(
-            timestamp=datetime.now(tz=timezone.utc),
+            timestamp=datetime.now(tz=UTC),
             symbol=symbol,
             signals={"news_sentiment": 0.5, "social_velocity_z": 1.0},
             notes=["Growth beats expectations"],
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from services.market_data import MockMarketDataProvider
+from services.synthetic import SyntheticMarket
+
+
+def test_paths_are_per_symbol_and_independent_of_call_pattern():
+    whole = SyntheticMarket(["AAPL", "MSFT"], seed=7).advance(500)
+    stepped = SyntheticMarket(["MSFT", "NVDA", "AAPL"], seed=7)
+    blocks = [stepped.advance(50, ["AAPL", "MSFT", "NVDA"]) for _ in range(10)]
+
+    aapl = np.concatenate([block.close[0] for block in blocks])
+    np.testing.assert_allclose(aapl, whole.close[0], rtol=1e-12)
+    np.testing.assert_array_equal(np.concatenate([b.timestamps for b in blocks]), whole.timestamps)
+    # Time-continuous: every bar opens at the previous close, across block boundaries too.
+    opens = np.concatenate([block.open[0] for block in blocks])
+    np.testing.assert_allclose(opens[1:], aapl[:-1], rtol=1e-12)
+    assert (whole.high >= np.maximum(whole.open, whole.close)).all()
+    assert (whole.low <= np.minimum(whole.open, whole.close)).all()
+
+
+def test_factor_correlation_and_validation():
+    market = SyntheticMarket([f"S{idx}" for idx in range(6)], correlation=0.5, jump_intensity=0.0)
+    block = market.advance(20_000)
+    returns = np.diff(np.log(block.close), axis=1)
+    corr = np.corrcoef(returns)[np.triu_indices(6, k=1)]
+    assert corr.mean() == pytest.approx(0.5, abs=0.05)
+    with pytest.raises(ValueError):
+        SyntheticMarket(correlation=1.5)
+
+
+def test_mock_provider_serves_a_continuous_path():
+    provider = MockMarketDataProvider(history=300)
+    first = provider.get_bars("AAPL", lookback=120)
+    again = provider.get_bars("AAPL", lookback=300)
+    assert len(first) == 120 and len(again) == 300
+    by_timestamp = {bar.timestamp: bar for bar in again}
+    assert all(by_timestamp[bar.timestamp] == bar for bar in first)
+    assert all(a.timestamp < b.timestamp for a, b in zip(again, again[1:], strict=False))
+
+    pinned = MockMarketDataProvider(history=300, as_of=datetime(2024, 1, 2, 15, 0, 30, tzinfo=UTC))
+    later = pinned.get_bars("AAPL", lookback=50)
+    assert later[-1].timestamp == datetime(2024, 1, 2, 15, 0, tzinfo=UTC)
+    pinned.as_of -= timedelta(minutes=10)
+    earlier = pinned.get_bars("AAPL", lookback=50)
+    assert earlier[-1] == later[-11]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import time
+
+from app.main import orchestrator
+from app.profiling import StackSampler
+from app.tracing import tracer
+
+
+def _names(span: dict) -> set[str]:
+    names = {span["name"]}
+    for child in span["children"]:
+        names |= _names(child)
+    return names
+
+
+def test_step_records_nested_spans_and_exposes_them(api):
+    client = api
+    assert client.post("/debug/trace", params={"enabled": True}).json() == {"enabled": True}
+    orchestrator.factual_agent.cache.clear()
+    try:
+        orchestrator.step(symbol="AAPL")
+        payload = client.get("/debug/trace", params={"limit": 1}).json()
+    finally:
+        client.post("/debug/trace", params={"enabled": False})
+
+    root = payload["traces"][-1]
+    assert root["name"] == "orchestrator.step"
+    factual = next(child for child in root["children"] if child["name"] == "factual-agent")
+    expected = {"market_data.get_bars", "feature_store.build_features", "feature.rsi_14"}
+    assert expected <= _names(factual)
+    assert root["duration_ms"] >= sum(child["duration_ms"] for child in root["children"])
+    assert tracer.recent() == []
+
+
+def busy_loop(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+def test_stack_sampler_collapses_stacks():
+    with StackSampler(interval=0.001) as sampler:
+        busy_loop(0.05)
+    assert sampler.samples > 0
+    assert any("test_tracing:busy_loop" in line for line in sampler.collapsed())
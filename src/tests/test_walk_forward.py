@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+
+from agents.judge_agent import JudgeAgent
+from agents.subjective_agent import SubjectiveAgent
+from app.records import ACTIONS, DecisionRecord
+from app.utils.time_windows import trading_minutes
+from pipelines.walk_forward import build_panel, make_folds, run_walk_forward, simulate
+from services.execution import PaperBroker
+from services.market_data import MockMarketDataProvider
+from services.news_data import MockNewsProvider
+from services.portfolio_risk import PortfolioRisk
+from services.risk import RiskContext, RiskManager
+from services.sentiment import RuleBasedSentiment
+
+
+def make_panel(count: int = 400):
+    bars = MockMarketDataProvider().get_bars(symbol="AAPL", lookback=count)
+    start = datetime(2024, 1, 5, 20, 0, tzinfo=UTC)
+    for bar, ts in zip(bars, trading_minutes(start, count), strict=True):
+        bar.timestamp = ts
+    agent = SubjectiveAgent(provider=MockNewsProvider(), sentiment_model=RuleBasedSentiment())
+    return build_panel("AAPL", bars, agent)
+
+
+def test_simulate_matches_risk_manager_and_broker():
+    panel = make_panel()
+    judge = JudgeAgent(tau_buy=0.1, tau_sell=-0.1)
+    batch = judge.decide_batch(panel.features, panel.signals, panel.sizing_vol)
+    risk = RiskManager(max_position=2.0, max_daily_loss=50.0)
+    equity, trades, _ = simulate(
+        panel, batch.action, batch.size, risk.max_position, risk.max_daily_loss, 5.0
+    )
+
+    broker = PaperBroker(slippage_bps=5.0)
+    expected, fills = [], 0
+    for ts, price, code, size in zip(
+        panel.timestamps, panel.close, batch.action, batch.size, strict=True
+    ):
+        broker.mark("AAPL", price)
+        snapshot = broker.ledger.snapshot("AAPL")
+        decision = DecisionRecord(ts, "AAPL", ACTIONS[code], float(size), 0.0, [], [])
+        guarded = risk.evaluate(
+            decision, RiskContext(ts, "AAPL", snapshot.position, snapshot.total_pnl)
+        )
+        fill, _ = broker.execute(guarded, price)
+        fills += fill is not None
+        expected.append(broker.pnl)
+
+    assert trades == fills > 0
+    np.testing.assert_allclose(equity, expected)
+
+
+def test_folds_roll_and_parallel_matches_serial():
+    panel = make_panel()
+    folds = make_folds(len(panel), train_bars=150, test_bars=50)
+    bounds = [(fold.train.start, fold.test.start, fold.test.stop) for fold in folds]
+    assert bounds[:2] == [(0, 150, 200), (50, 200, 250)]
+    assert folds[-1].test.stop <= len(panel)
+
+    serial = run_walk_forward(panel, folds, workers=1)
+    parallel = run_walk_forward(panel, folds, workers=2)
+    assert [fold.test for fold in serial.folds] == [fold.test for fold in parallel.folds]
+    assert [fold.tau for fold in serial.folds] == [fold.tau for fold in parallel.folds]
+    assert serial.aggregate == parallel.aggregate
+    assert serial.aggregate["folds"] == len(folds)
+    assert serial.aggregate["pnl"] == pytest.approx(sum(fold.test["pnl"] for fold in serial.folds))
+
+
+def test_portfolio_risk_is_rejected():
+    panel = make_panel(200)
+    folds = make_folds(len(panel), train_bars=100, test_bars=50)
+    with pytest.raises(ValueError, match="portfolio risk"):
+        run_walk_forward(panel, folds, risk_manager=RiskManager(portfolio=PortfolioRisk()))